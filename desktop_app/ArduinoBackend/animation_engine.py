@@ -0,0 +1,473 @@
+import threading
+from typing import Callable, Iterator
+
+import numpy as np
+
+from ArduinoBackend.frame_cache import FrameCache, FrameCycle
+
+
+class EffectSettings:
+    """
+    Color, brightness and frame delay that an effect reads again for every
+    frame.
+    """
+
+    def __init__(
+        self, rgb=(255, 0, 0), brightness: float = 255, delay_ms: float = 300
+    ) -> None:
+        self.rgb = rgb
+        self.brightness = brightness
+        self.delay_ms = delay_ms
+
+    @property
+    def rgb(self) -> tuple[int, int, int]:
+        return self._rgb
+
+    @rgb.setter
+    def rgb(self, value) -> None:
+        self._rgb = tuple(max(0, min(255, int(c))) for c in value)
+
+    @property
+    def brightness(self) -> float:
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value: float) -> None:
+        self._brightness = max(0.0, min(255.0, float(value)))
+
+    @property
+    def delay_ms(self) -> float:
+        return self._delay_ms
+
+    @delay_ms.setter
+    def delay_ms(self, value: float) -> None:
+        self._delay_ms = max(1.0, float(value))
+
+
+# r, g, b to one integer, for formatting "#rrggbb" in one go.
+_PACK = np.array([1 << 16, 1 << 8, 1], dtype=np.uint32)
+
+
+def _blank(led_count: int) -> np.ndarray:
+    return np.zeros((led_count, 3), dtype=np.uint8)
+
+
+_RAINBOW = np.array(
+    [
+        (255, 0, 0),  # Red
+        (255, 127, 0),  # Orange
+        (255, 255, 0),  # Yellow
+        (0, 255, 0),  # Green
+        (0, 0, 255),  # Blue
+        (75, 0, 130),  # Indigo
+        (139, 0, 255),  # Violet
+    ],
+    dtype=np.float32,
+)
+
+
+def rainbow(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """The seven rainbow colors, moving one LED per frame."""
+    offsets = np.arange(led_count)
+    index = 0
+
+    while True:
+        colors = _RAINBOW * (settings.brightness / 255)
+        yield colors[(index + offsets) % len(_RAINBOW)].astype(np.uint8)
+        index = (index + 1) % len(_RAINBOW)
+
+
+def _pulse_levels(brightness: float) -> list[int]:
+    min_brightness = 50
+    step = 20
+    max_brightness = max(int(brightness), min_brightness)
+
+    up_levels = list(range(min_brightness, max_brightness, step))
+    down_levels = list(range(max_brightness, min_brightness, -step))
+
+    if not up_levels:
+        up_levels = [min_brightness]
+    if down_levels == up_levels:
+        down_levels = []
+
+    return up_levels + down_levels
+
+
+def pulse(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """The whole strip breathing between a dim level and the brightness."""
+    index = 0
+
+    while True:
+        levels = _pulse_levels(settings.brightness)
+        level = levels[index % len(levels)]
+        color = np.minimum(np.array(settings.rgb) * level // 255, 255)
+
+        frame = _blank(led_count)
+        frame[:] = color
+        yield frame
+        index = (index + 1) % len(levels)
+
+
+def chasing(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """A single LED running along the strip."""
+    position = 0
+
+    while True:
+        frame = _blank(led_count)
+        if led_count:
+            frame[position] = settings.rgb
+            position = (position + 1) % led_count
+        yield frame
+
+
+def strobe(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """The whole strip flashing on and off."""
+    on = True
+
+    while True:
+        frame = _blank(led_count)
+        if on:
+            frame[:] = settings.rgb
+        yield frame
+        on = not on
+
+
+def raindrop(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """
+    A drop on a random LED every 100 to 500 ms, replacing the one before;
+    each drop goes dark after the delay plus 200 ms.
+    """
+    # Milliseconds on the frames' own timeline, one delay per frame.
+    now = 0.0
+    next_drop = 0.0
+    drop_end = 0.0
+    drop = 0
+
+    while True:
+        while led_count and next_drop <= now:
+            drop = rng.integers(led_count)
+            drop_end = next_drop + settings.delay_ms + 200
+            next_drop += rng.integers(100, 501)
+
+        frame = _blank(led_count)
+        if led_count and drop_end > now:
+            frame[drop] = settings.rgb
+        yield frame
+
+        now += settings.delay_ms
+
+
+def _similar_colors(rgb: tuple[int, int, int], num_colors: int = 8) -> np.ndarray:
+    step = 255 // num_colors
+    shifts = np.arange(-num_colors // 2, num_colors // 2 + 1)[:, None] * step
+
+    return np.vstack(
+        [np.array(rgb)[None, :], np.clip(np.array(rgb)[None, :] + shifts, 0, 255)]
+    ).astype(np.uint8)
+
+
+def fireplace(
+    led_count: int, settings: EffectSettings, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """
+    Flickering flames: every 30 ms to 0.8 delays a third of the LEDs light up
+    in shades of the color, and each of them fades to a dim glow or goes dark
+    0.5 to 1.2 delays later.
+    """
+    frame = _blank(led_count)
+    # Milliseconds on the frames' own timeline, one delay per frame; a long
+    # delay spans several flames.
+    now = 0.0
+    next_flames = 0.0
+    fade_at = np.full(led_count, np.inf)
+
+    def fade(until: float) -> None:
+        fading = np.flatnonzero(fade_at <= until)
+        rgb = np.array(settings.rgb)
+        fade_colors = np.array([rgb // 3, (0, 0, 0)], dtype=np.uint8)
+        frame[fading] = fade_colors[rng.integers(2, size=len(fading))]
+        fade_at[fading] = np.inf
+
+    while True:
+        while led_count and next_flames <= now:
+            fade(next_flames)
+
+            colors = _similar_colors(settings.rgb)
+            lit = rng.choice(led_count, max(1, int(led_count * 0.3)), replace=False)
+            frame[lit] = colors[rng.integers(len(colors), size=len(lit))]
+
+            min_ms = max(1, int(settings.delay_ms * 0.5))
+            max_ms = max(min_ms + 1, int(settings.delay_ms * 1.2))
+            fade_at[lit] = next_flames + rng.integers(min_ms, max_ms + 1, len(lit))
+            next_flames += rng.integers(30, max(31, int(settings.delay_ms * 0.8)) + 1)
+
+        fade(now)
+        yield frame.copy()
+
+        now += settings.delay_ms
+
+
+EFFECTS: dict[str, Callable[..., Iterator[np.ndarray]]] = {
+    "rainbow": rainbow,
+    "pulse": pulse,
+    "chasing": chasing,
+    "strobe": strobe,
+    "raindrop": raindrop,
+    "fireplace": fireplace,
+}
+
+
+def period(effect: str, led_count: int, settings: EffectSettings) -> int | None:
+    """Frames until a periodic effect repeats, or None for a random one."""
+    if effect == "rainbow":
+        return len(_RAINBOW)
+    if effect == "pulse":
+        return len(_pulse_levels(settings.brightness))
+    if effect == "chasing":
+        return max(1, led_count)
+    if effect == "strobe":
+        return 2
+    return None
+
+
+def cache_key(effect: str, led_count: int, settings: EffectSettings) -> tuple:
+    """The inputs a periodic effect's frames actually depend on."""
+    if effect == "rainbow":
+        return (effect, led_count, settings.brightness)
+    if effect == "pulse":
+        return (effect, led_count, settings.rgb, settings.brightness)
+    # chasing and strobe show the plain color, the random effects are
+    # never cached
+    return (effect, led_count, settings.rgb)
+
+
+class AnimationEngine:
+    """
+    Runs one effect and hands out its frames, independent of any widget.
+
+    Every frame is a (led_count, 3) uint8 array of r, g, b. The preview draws
+    them, and the same frames can be sent to a device, e.g. as the frame
+    source of a FrameStreamer.
+
+    With a FrameCache, periodic effects are played from cached cycles; a
+    cycle is then just a lookup of the next frame. On a miss the frames are
+    rendered live as without a cache, and once the same settings have played
+    for a whole period, those frames are cached in the background, so a
+    moving slider never waits for a cycle to be built. Cached frames are
+    shared and must not be modified.
+    """
+
+    def __init__(
+        self,
+        effect: str,
+        led_count: int,
+        settings: EffectSettings | None = None,
+        delay_ms: float | None = None,
+        seed: int | None = None,
+        cache: FrameCache | None = None,
+    ) -> None:
+        """
+        Args:
+            effect (str): One of EFFECTS
+            led_count (int): Strip length
+            settings (EffectSettings, optional): Color, brightness and delay;
+                may be changed while the engine runs
+            delay_ms (float, optional): Time between two frames, instead of
+                the settings' delay
+            seed (int, optional): Seed for the random effects, for repeatable
+                frames
+            cache (FrameCache, optional): Cache for the cycles of periodic
+                effects
+        """
+        if effect not in EFFECTS:
+            raise ValueError(f"Unknown effect: {effect}")
+
+        self._effect = effect
+        self._led_count = led_count
+        self._settings = settings or EffectSettings()
+        if delay_ms is not None:
+            self._settings.delay_ms = delay_ms
+        self._seed = seed
+        self._cache = cache
+        self._cycle = None
+        self._ready = None
+        self._restart()
+
+    def _new_frames(self) -> None:
+        self._frames = EFFECTS[self._effect](
+            self._led_count, self._settings, np.random.default_rng(self._seed)
+        )
+        self._frames_step = 0
+
+    def _restart(self) -> None:
+        self._new_frames()
+        self._frame = _blank(self._led_count)
+        self._step = 0
+        self._cycle_key = None
+        self._period = None
+        self._recording = None
+
+    def _current_cycle(self) -> FrameCycle | None:
+        if self._cache is None:
+            return None
+
+        key = cache_key(self._effect, self._led_count, self._settings)
+        ready = self._ready
+        if key == self._cycle_key:
+            if self._cycle is None and ready is not None and ready[0] == key:
+                self._cycle = ready[1]
+            return self._cycle
+
+        self._cycle_key = key
+        self._cycle = None
+        self._recording = None
+
+        length = period(self._effect, self._led_count, self._settings)
+        if length is None:
+            return None
+
+        self._cycle = self._cache.lookup(key)
+
+        if self._cycle is None:
+            # Live frames have to line up with the step for the recording.
+            if self._frames_step != self._step or length != self._period:
+                self._new_frames()
+                for _ in range(self._step % length):
+                    next(self._frames)
+                self._frames_step = self._step
+
+            if FrameCycle.estimate(length, self._led_count) <= self._cache.max_bytes:
+                self._recording = []
+                self._recording_start = self._step
+
+        self._period = length
+        return self._cycle
+
+    def _record(self, frame: np.ndarray) -> None:
+        if self._recording is None:
+            return
+
+        self._recording.append(frame)
+        if len(self._recording) < self._period:
+            return
+
+        # Rotated so that frame i of the cycle belongs to every step i + k * period.
+        frames = np.roll(
+            np.stack(self._recording), self._recording_start % self._period, axis=0
+        )
+        self._recording = None
+
+        threading.Thread(
+            target=self._store_cycle,
+            args=(self._cycle_key, frames),
+            name="frame-cache",
+            daemon=True,
+        ).start()
+
+    def _store_cycle(self, key: tuple, frames: np.ndarray) -> None:
+        # Only handed over here; the playing thread picks it up if the key
+        # still matches.
+        self._ready = (key, self._cache.add(key, frames))
+
+    def next_frame(self) -> np.ndarray:
+        cycle = self._current_cycle()
+
+        if cycle is not None:
+            self._frame = cycle.frame(self._step)
+        else:
+            self._frame = next(self._frames)
+            self._frames_step = self._step + 1
+            self._record(self._frame)
+
+        self._step += 1
+        return self._frame
+
+    def next_hex_frame(self) -> list[str]:
+        """The next frame as "#rrggbb" strings, ready for the preview."""
+        cycle = self._current_cycle()
+
+        if cycle is None:
+            packed = self.next_frame().astype(np.uint32) @ _PACK
+            return [f"#{color:06x}" for color in packed.tolist()]
+
+        self._frame = cycle.frame(self._step)
+        colors = cycle.hex_frame(self._step)
+        self._step += 1
+        return colors
+
+    def skip(self, frames: int) -> None:
+        """Move past frames that are not going to be shown."""
+        if self._current_cycle() is not None:
+            self._step += frames
+            return
+
+        for _ in range(frames):
+            self.next_frame()
+
+    def frame_at(self, elapsed_ms: float) -> np.ndarray:
+        """
+        The frame shown a given time after the start.
+
+        Moving forward only computes the frames in between; asking for an
+        earlier time starts the effect over.
+        """
+        step = int(elapsed_ms // self._settings.delay_ms) + 1
+
+        if step < self._step:
+            self._restart()
+        while self._step < step:
+            self.next_frame()
+
+        return self._frame
+
+    def frame_source(self, fps: float) -> Callable[[int], bytes]:
+        """
+        Frames as FrameStreamer.run expects them.
+
+        Args:
+            fps (float): The streamer's frame rate
+
+        Returns:
+            Callable: Maps a frame number to the rgb bytes shown at that time
+        """
+        return lambda number: self.frame_at(number * 1000 / fps).tobytes()
+
+    @property
+    def effect(self) -> str:
+        return self._effect
+
+    @property
+    def led_count(self) -> int:
+        return self._led_count
+
+    @property
+    def settings(self) -> EffectSettings:
+        return self._settings
+
+    @property
+    def delay_ms(self) -> float:
+        return self._settings.delay_ms
+
+    @delay_ms.setter
+    def delay_ms(self, value: float) -> None:
+        self._settings.delay_ms = value
+
+    @property
+    def is_cached(self) -> bool:
+        """Whether the current frames come from the FrameCache."""
+        return self._cycle is not None
+
+    @property
+    def step(self) -> int:
+        """Number of frames produced so far."""
+        return self._step
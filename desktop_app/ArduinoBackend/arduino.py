@@ -1,6 +1,4 @@
-import platform
-import subprocess
-import requests
+from ArduinoBackend.liveness_checker import shared_liveness_checker
 
 
 class Arduino:
@@ -36,25 +34,7 @@ class Arduino:
         return hash(self._mac_address)
 
     def __call__(self) -> bool:
-        ping_command = (
-            "ping -n 1 -w 1" if platform.system() == "Windows" else "ping -c 1 -W 1"
-        )
-
-        response = subprocess.run(
-            f"{ping_command} {self._ip_address}",
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        url = f"http://{self._ip_address}{'/mac'}"
-        try:
-            response = requests.get(url, timeout=0.1)
-            if response.status_code == 200:
-                return True
-        except requests.RequestException:
-            pass
-        return False
+        return shared_liveness_checker().check(self)
 
     def get_short_mac(self) -> str:
         if not self.mac_address or self.mac_address == "Unknown":
@@ -63,12 +43,11 @@ class Arduino:
         return self.mac_address[-6:].upper()
 
     def to_dict(self) -> dict[str]:
-        status = self()
         return {
             "name": self._name,
             "ip_address": self._ip_address,
             "mac_address": self._mac_address,
-            "status": status,
+            "status": self._online,
             "last_command": self._last_command,
             "single_led": self._single_led,
         }
@@ -1,61 +1,182 @@
-import os
-import json
+from typing import Callable
 
 from ArduinoBackend.network_scanner import NetworkScanner
 from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.arduino_store import ArduinoStore
+from ArduinoBackend.device_info import shared_device_info_cache
+from ArduinoBackend.device_registry import DeviceRegistry
+from ArduinoBackend.liveness_checker import shared_liveness_checker
+from ArduinoBackend.status_refresher import StatusRefresher
 
 
 class ArduinoManager:
-    def __init__(self, filename: str = "arduino.json") -> None:
+    def __init__(
+        self, filename: str = "arduino.json", network: str = None, port: int = 80
+    ) -> None:
         self._filename = filename
-        self._network_scanner = NetworkScanner(timeout=0.3, max_workers=100)
-        self._data: list[Arduino] = []
-
-        if os.path.exists(filename):
-            self.load_and_upate_from_file()
-        else:
-            self._create_file()
-
-    def _create_file(self) -> None:
-        self._data = [arduino for arduino in self._network_scanner.scan_network()]
-
-        with open(self._filename, "w", encoding="utf-8") as f:
-            json.dump(
-                self._convert_data_to_dict(self._data), f, ensure_ascii=False, indent=4
+        self._network = network
+        self._port = port
+        self._network_scanner = NetworkScanner(
+            timeout=0.3, max_workers=100, discovery="udp"
+        )
+        self._liveness_checker = shared_liveness_checker()
+        self._status_refresher = None
+        self._registry = DeviceRegistry()
+        self._store = ArduinoStore(
+            filename, lambda: self._convert_data_to_dict(self._registry.devices)
+        )
+
+        # Only cached state here, so the window can open without waiting on
+        # the network; refresh_known or load_and_upate_from_file bring it
+        # up to date from a background thread.
+        if self._store.exists():
+            self._registry.merge(self._load_from_file())
+
+        # Subscribed after loading, so only changes from here on are journalled.
+        self._registry.subscribe(self._journal_change)
+
+    def _load_from_file(self) -> list[Arduino]:
+        return self._convert_data_from_dict(self._store.load())
+
+    def _journal_change(
+        self, event: str, arduino: Arduino, previous_ip: str | None
+    ) -> None:
+        # A new device goes into the journal as a full record; later field
+        # updates for it would otherwise have nothing to apply to on replay.
+        if event == DeviceRegistry.ADDED:
+            self._store.record_device(arduino.to_dict())
+        elif event == DeviceRegistry.MOVED:
+            self._store.record_update(
+                arduino.mac_address, "ip_address", arduino.ip_address
+            )
+        elif event == DeviceRegistry.REMOVED:
+            self._store.record_removed(arduino.mac_address)
+
+    def _merge(
+        self,
+        answered: set[str],
+        scanned: Arduino,
+        on_device: Callable[[Arduino], None] | None,
+    ) -> None:
+        arduino = self._registry.upsert(scanned)
+        answered.add(arduino.mac_address)
+        self._liveness_checker.record(arduino, scanned.status)
+
+        # Discovery replies carry the LED count and firmware version, so the
+        # LED tab needs no request for devices found that way.
+        info = self._network_scanner.device_info.get(arduino.mac_address.upper())
+        if info is not None and info["led_count"] is not None:
+            shared_device_info_cache().observe(
+                arduino.mac_address,
+                arduino.ip_address,
+                {
+                    "mac": arduino.mac_address,
+                    "leds": info["led_count"],
+                    "version": info["version"],
+                },
             )
 
-    def load_and_upate_from_file(self) -> list:
-        self._data = []
-
-        with open(self._filename, "r", encoding="utf-8") as f:
-            loaded_data = json.load(f)
-
-        loaded_data = self._convert_data_from_dict(loaded_data)
-        scanned_data = self._network_scanner.scan_network()
-
-        for scanned in scanned_data:
-            found = False
-            for loaded in loaded_data:
-                if scanned == loaded:
-                    loaded.status = scanned.status
-                    loaded.ip_address = scanned.ip_address
-                    self._data.append(loaded)
-                    found = True
-                    break
-            if not found:
-                self._data.append(scanned)
-
-        for loaded in loaded_data:
-            if loaded not in self._data:
-                loaded.status = False
-                self._data.append(loaded)
-
-        self._save_to_file(self._data)
-
-    def _save_to_file(self, data: list[Arduino]) -> None:
-        with open(self._filename, "w", encoding="utf-8") as f:
-            json.dump(self._convert_data_to_dict(data), f, ensure_ascii=False, indent=4)
-            self._data = data
+        if on_device is not None:
+            on_device(arduino)
+
+    def _probe_known(
+        self, answered: set[str], on_device: Callable[[Arduino], None] | None
+    ) -> None:
+        self._network_scanner.probe_addresses(
+            [arduino.ip_address for arduino in self._registry if arduino.ip_address],
+            self._port,
+            on_device=lambda scanned: self._merge(answered, scanned, on_device),
+        )
+
+    def _mark_missing(self, answered: set[str]) -> None:
+        for arduino in self._registry:
+            if arduino.mac_address not in answered:
+                arduino.status = False
+
+    def refresh_known(
+        self, on_device: Callable[[Arduino], None] | None = None
+    ) -> list[Arduino]:
+        """
+        Probe every stored device at its last known address, without a sweep.
+
+        Returns:
+            list: The stored devices that answered
+        """
+        answered = set()
+        self._probe_known(answered, on_device)
+        self._mark_missing(answered)
+
+        return [self._registry.get(mac_address) for mac_address in answered]
+
+    def load_and_upate_from_file(
+        self,
+        on_device: Callable[[Arduino], None] | None = None,
+        on_progress: Callable[[int, int, float], None] | None = None,
+        full_sweep: bool = False,
+    ) -> list:
+        answered = set()
+
+        # Phase one: stored devices usually still sit at their last address,
+        # so they are usable after a single round trip.
+        self._probe_known(answered, on_device)
+        self._mark_missing(answered)
+
+        # Phase two: the sweep only has to find new or moved devices.
+        self._network_scanner.scan_network(
+            self._network,
+            self._port,
+            on_device=lambda scanned: self._merge(answered, scanned, on_device),
+            on_progress=on_progress,
+            exclude={
+                self._registry.get(mac_address).ip_address for mac_address in answered
+            },
+            full_sweep=full_sweep,
+        )
+
+        self._mark_missing(answered)
+        self._store.schedule_snapshot()
+
+    def check_all(self, devices: list[Arduino] | None = None) -> dict:
+        return self._liveness_checker.check_all(
+            self._registry.devices if devices is None else devices
+        )
+
+    def start_status_refresher(
+        self,
+        interval: float = 5.0,
+        on_change: Callable[[list[Arduino]], None] | None = None,
+    ) -> None:
+        """
+        Keep every device's status current from a background thread.
+
+        Args:
+            interval (float, optional): Seconds between two refreshes
+            on_change (Callable, optional): Called from the refresher thread
+                with the devices whose status changed
+        """
+        if self._status_refresher is not None:
+            self._status_refresher.stop()
+
+        self._status_refresher = StatusRefresher(
+            self._liveness_checker, lambda: self._registry.devices, interval, on_change
+        )
+        self._status_refresher.start()
+
+    def stop_status_refresher(self) -> None:
+        if self._status_refresher is not None:
+            self._status_refresher.stop()
+            self._status_refresher = None
+
+    def last_seen(self, arduino: Arduino) -> float | None:
+        return self._liveness_checker.status_cache.last_seen(arduino.mac_address)
+
+    def _save_to_file(self) -> None:
+        self._store.flush()
+
+    def close(self) -> None:
+        """Stop background work and write the final snapshot."""
+        self.stop_status_refresher()
+        self._store.close()
 
     def _convert_data_to_dict(self, list_to_convert: list[Arduino]) -> list[dict]:
         return [arduino.to_dict() for arduino in list_to_convert]
@@ -83,12 +204,31 @@ class ArduinoManager:
         return arduino_list
 
     def update_arduino(self, arduino_to_update, value: str, attribut: str) -> None:
-        for arduino in self._data:
-            if arduino == arduino_to_update:
-                arduino.__setattr__(attribut, value)
+        self._registry.update(arduino_to_update.mac_address, attribut, value)
+
+        # Only the changed field hits the disk now; the debounced snapshot
+        # follows from the store's own thread.
+        self._store.record_update(
+            arduino_to_update.mac_address, attribut.lstrip("_"), value
+        )
+
+    def subscribe(self, listener: Callable[[str, Arduino, str | None], None]) -> None:
+        """Get (event, arduino, previous_ip) for added, removed and moved devices."""
+        self._registry.subscribe(listener)
 
-        self._save_to_file(self._data)
+    def get(self, mac_address: str) -> Arduino | None:
+        return self._registry.get(mac_address)
+
+    def get_by_ip(self, ip_address: str) -> Arduino | None:
+        return self._registry.get_by_ip(ip_address)
+
+    def get_by_name(self, name: str) -> list[Arduino]:
+        return self._registry.get_by_name(name)
+
+    @property
+    def registry(self) -> DeviceRegistry:
+        return self._registry
 
     @property
     def data(self) -> list[Arduino]:
-        return self._data
+        return self._registry.devices
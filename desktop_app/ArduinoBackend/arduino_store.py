@@ -0,0 +1,213 @@
+import os
+import json
+import threading
+import time
+from typing import Callable
+
+
+class ArduinoStore:
+    """
+    Persistence for arduino.json as a snapshot plus an append-only journal.
+
+    Field updates are appended to "<filename>.journal" as one JSON line each,
+    which is cheap enough for the UI thread. A background thread writes the
+    full snapshot once updates have been quiet for `debounce` seconds (or at
+    the latest after `max_delay`), atomically via write-then-rename, and then
+    compacts the journal. Loading reads the snapshot and replays the journal,
+    so nothing is lost if the app dies between two snapshots.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        snapshot_source: Callable[[], list[dict]],
+        debounce: float = 1.0,
+        max_delay: float = 10.0,
+        compact_after: int = 500,
+    ) -> None:
+        self._filename = filename
+        self._journal_filename = f"{filename}.journal"
+        self._snapshot_source = snapshot_source
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._compact_after = compact_after
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._journal = None
+        self._journal_entries = 0
+        self._first_change = None
+        self._last_change = None
+        self._closed = False
+
+        self._writer = threading.Thread(
+            target=self._run, name="arduino-store", daemon=True
+        )
+        self._writer.start()
+
+    def exists(self) -> bool:
+        return os.path.exists(self._filename) or os.path.exists(self._journal_filename)
+
+    def load(self) -> list[dict]:
+        """Read the snapshot and replay the journal on top of it."""
+        devices = {}
+
+        if os.path.exists(self._filename):
+            with open(self._filename, "r", encoding="utf-8") as f:
+                for item in json.load(f) or []:
+                    devices[item.get("mac_address")] = item
+
+        if os.path.exists(self._journal_filename):
+            with open(self._journal_filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._replay(devices, line)
+
+        return list(devices.values())
+
+    def _replay(self, devices: dict, line: str) -> None:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # A torn last line from a crash mid-append; everything before it holds.
+            return
+
+        mac_address = entry.get("mac")
+
+        # Devices added since the last snapshot are journalled as full
+        # records first, so a field update always finds its device.
+        if "device" in entry:
+            devices[mac_address] = entry["device"]
+        elif entry.get("removed"):
+            devices.pop(mac_address, None)
+        elif mac_address in devices:
+            devices[mac_address][entry["field"]] = entry["value"]
+
+    def record_update(self, mac_address: str, field: str, value) -> None:
+        self._append({"mac": mac_address, "field": field, "value": value})
+
+    def record_device(self, device: dict) -> None:
+        self._append({"mac": device["mac_address"], "device": device})
+
+    def record_removed(self, mac_address: str) -> None:
+        self._append({"mac": mac_address, "removed": True})
+
+    def _append(self, entry: dict) -> None:
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self._journal_filename, "ab")
+
+            self._journal.write(line)
+            self._journal.flush()
+            self._journal_entries += 1
+            self._mark_dirty()
+
+    def schedule_snapshot(self) -> None:
+        """Ask for a snapshot of state that changed without a journal entry."""
+        with self._lock:
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        now = time.monotonic()
+        self._last_change = now
+        if self._first_change is None:
+            self._first_change = now
+
+        self._wakeup.notify()
+
+    def _due_in(self) -> float | None:
+        if self._first_change is None:
+            return None
+
+        if self._journal_entries >= self._compact_after:
+            return 0
+
+        now = time.monotonic()
+        return max(
+            0,
+            min(
+                self._last_change + self._debounce - now,
+                self._first_change + self._max_delay - now,
+            ),
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and self._due_in() != 0:
+                    self._wakeup.wait(self._due_in())
+
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+            except Exception as e:
+                # The thread has to survive, or every later save is lost;
+                # the journal still holds the changes, and the snapshot is
+                # tried again after the next debounce.
+                print(f"Saving {self._filename} failed: {e}")
+                with self._lock:
+                    self._mark_dirty()
+
+    def flush(self) -> None:
+        """Write a snapshot now and compact the journal."""
+        with self._flush_lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        with self._lock:
+            devices = self._snapshot_source()
+            self._first_change = None
+            self._last_change = None
+            journal_offset = self._journal.tell() if self._journal else 0
+
+        temp_filename = f"{self._filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            json.dump(devices, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self._filename)
+
+        # Entries appended while the snapshot was written are not part of it
+        # and stay in the journal; replaying the rest again would be harmless.
+        with self._lock:
+            if self._journal is None:
+                # Only a journal from an earlier session, already replayed by
+                # load() and therefore contained in the snapshot.
+                if os.path.exists(self._journal_filename):
+                    os.remove(self._journal_filename)
+                return
+
+            self._journal.close()
+            self._journal = None
+            with open(self._journal_filename, "rb") as f:
+                f.seek(journal_offset)
+                tail = f.read()
+
+            # Replaced like the snapshot, so a crash leaves either the old
+            # journal or the tail, never a truncated one.
+            temp_filename = f"{self._journal_filename}.tmp"
+            with open(temp_filename, "wb") as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_filename, self._journal_filename)
+
+            self._journal = open(self._journal_filename, "ab")
+            self._journal_entries = tail.count(b"\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+
+        self._writer.join()
+        self.flush()
+
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
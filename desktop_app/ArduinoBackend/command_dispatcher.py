@@ -0,0 +1,174 @@
+import threading
+import concurrent.futures
+from typing import Callable
+import requests
+
+from ArduinoBackend.device_client import DeviceClient, shared_device_client
+from ArduinoBackend.pixel_frame import PixelFrame
+
+
+class CommandDispatcher:
+    """
+    Sends commands to the controllers off the UI thread, latest wins.
+
+    Each device has at most one request in flight and one command waiting.
+    A command that arrives while another one is still waiting replaces it, so
+    rapid clicks collapse into the newest command instead of piling up.
+    Outcomes are reported as on_result(outcome, device, command, detail) from
+    a worker thread, with outcome one of SENT, FAILED or SUPERSEDED.
+
+    Listeners added with subscribe() see every command that was actually
+    sent or failed, in the order each device received them.
+    """
+
+    SENT = "sent"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+    def __init__(
+        self, device_client: DeviceClient | None = None, max_workers: int = 8
+    ) -> None:
+        self._device_client = device_client or shared_device_client()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="commands"
+        )
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple] = {}
+        self._busy: set[str] = set()
+        self._listeners: list[Callable[[str, object, str, str], None]] = []
+        self._closed = False
+
+    def subscribe(self, listener: Callable[[str, object, str, str], None]) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, object, str, str], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def send(
+        self,
+        device,
+        command: str,
+        on_result: Callable[[str, object, str, str], None] | None = None,
+        body: bytes | None = None,
+        prepare: Callable[[], tuple[str, bytes | None]] | None = None,
+    ) -> None:
+        """
+        Queue a command for a device and return immediately.
+
+        Args:
+            device (Arduino): Target device
+            command (str): Path and query, e.g. "ledOff"
+            on_result (Callable, optional): Called with (outcome, device,
+                command, detail) once the command was sent, failed or was
+                replaced by a newer one
+            body (bytes, optional): Binary request body, e.g. an encoded
+                PixelFrame
+            prepare (Callable, optional): Called on the worker right before
+                sending and returns the (command, body) actually sent, for
+                requests that depend on what the device already received;
+                command is then only used to report a replaced request
+        """
+        key = device.mac_address
+        job = (device, command, on_result, body, prepare)
+
+        with self._lock:
+            if self._closed:
+                return
+
+            replaced = self._pending.get(key)
+            self._pending[key] = job
+
+            idle = key not in self._busy
+            self._busy.add(key)
+
+        if replaced is not None:
+            self._report(replaced, CommandDispatcher.SUPERSEDED, "replaced by newer")
+
+        if idle:
+            try:
+                self._executor.submit(self._drain, key)
+            except RuntimeError:
+                # Closed between the check above and here.
+                pass
+
+    def _drain(self, key: str) -> None:
+        while True:
+            with self._lock:
+                job = self._pending.pop(key, None)
+
+                if job is None or self._closed:
+                    self._busy.discard(key)
+                    return
+
+            self._deliver(job)
+
+    def _deliver(self, job: tuple) -> None:
+        device, command, on_result, body, prepare = job
+
+        if prepare is not None:
+            try:
+                command, body = prepare()
+            except Exception as e:
+                self._report(job, CommandDispatcher.FAILED, f"prepare failed: {e}")
+                return
+
+            job = (device, command, on_result, body, None)
+
+        kwargs = {}
+
+        if body is not None:
+            kwargs = {
+                "data": body,
+                "headers": {"Content-Type": PixelFrame.CONTENT_TYPE},
+            }
+
+        try:
+            response = self._device_client.post(device.ip_address, command, **kwargs)
+        except requests.RequestException as e:
+            self._report(job, CommandDispatcher.FAILED, f"connection failure: {e}")
+            return
+
+        if response.status_code in DeviceClient.SUCCESS_CODES:
+            self._report(job, CommandDispatcher.SENT, str(response.status_code))
+        else:
+            self._report(job, CommandDispatcher.FAILED, f"FAIL: {response.status_code}")
+
+    def _report(self, job: tuple, outcome: str, detail: str) -> None:
+        device, command, on_result, _, _ = job
+        handlers = [] if on_result is None else [on_result]
+
+        if outcome != CommandDispatcher.SUPERSEDED:
+            handlers = list(self._listeners) + handlers
+
+        for handler in handlers:
+            try:
+                handler(outcome, device, command, detail)
+            except Exception as e:
+                print(f"Command result handler failed: {e}")
+
+    def is_busy(self, device) -> bool:
+        with self._lock:
+            return device.mac_address in self._busy
+
+    def close(self) -> None:
+        """Drop waiting commands; a request already in flight still finishes."""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+
+        self._executor.shutdown(wait=False)
+
+
+_shared_dispatcher = None
+_shared_lock = threading.Lock()
+
+
+def shared_command_dispatcher() -> CommandDispatcher:
+    global _shared_dispatcher
+
+    with _shared_lock:
+        if _shared_dispatcher is None:
+            _shared_dispatcher = CommandDispatcher()
+
+        return _shared_dispatcher
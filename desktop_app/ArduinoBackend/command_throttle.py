@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Callable
+
+from ArduinoBackend.command_dispatcher import (
+    CommandDispatcher,
+    shared_command_dispatcher,
+)
+
+
+class CommandThrottle:
+    """
+    Caps how often commands go out to each device.
+
+    push() only remembers the newest command per device. A background thread
+    hands it to the dispatcher as soon as the device's interval has passed,
+    so at most `max_rate` commands per second are sent and the last command
+    pushed is always delivered, just up to one interval later.
+    """
+
+    def __init__(
+        self, max_rate: float = 30.0, dispatcher: CommandDispatcher | None = None
+    ) -> None:
+        self._interval = 1 / max_rate
+        self._dispatcher = dispatcher or shared_command_dispatcher()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: dict[str, tuple] = {}
+        self._next_send: dict[str, float] = {}
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="command-throttle", daemon=True
+        )
+        self._thread.start()
+
+    def push(
+        self,
+        device,
+        command: str,
+        on_result: Callable[[str, object, str, str], None] | None = None,
+    ) -> None:
+        """Queue the newest command for a device; never blocks on the network."""
+        with self._lock:
+            if self._closed:
+                return
+
+            self._pending[device.mac_address] = (device, command, on_result)
+            self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        return
+
+                    now = time.monotonic()
+                    due = [
+                        key
+                        for key in self._pending
+                        if self._next_send.get(key, 0) <= now
+                    ]
+                    if due:
+                        break
+
+                    self._wakeup.wait(
+                        min(self._next_send[key] for key in self._pending) - now
+                        if self._pending
+                        else None
+                    )
+
+                jobs = [self._pending.pop(key) for key in due]
+                for key in due:
+                    self._next_send[key] = now + self._interval
+
+            for device, command, on_result in jobs:
+                self._dispatcher.send(device, command, on_result)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._wakeup.notify()
+
+    @property
+    def max_rate(self) -> float:
+        return 1 / self._interval
+
+    @max_rate.setter
+    def max_rate(self, value: float) -> None:
+        with self._lock:
+            self._interval = 1 / value
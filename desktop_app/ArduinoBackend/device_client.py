@@ -0,0 +1,139 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+from ArduinoBackend.latency_stats import LatencyStats
+
+
+class DeviceClient:
+    """
+    HTTP client for all traffic to the controllers.
+
+    Connections are kept alive per device and the pool is bounded: at most
+    `max_hosts` devices keep idle connections, each at most
+    `connections_per_host` of them. A request that finds all of a device's
+    connections busy opens a short-lived extra one instead of waiting, so a
+    device whose requests hang cannot hold up callers beyond the request
+    deadlines. Every request has a connect and a read deadline, and its
+    latency is recorded overall and per device.
+    """
+
+    SUCCESS_CODES = (200, 201, 202, 203, 204)
+
+    def __init__(
+        self,
+        connect_timeout: float = 0.5,
+        read_timeout: float = 2.0,
+        max_hosts: int = 32,
+        connections_per_host: int = 4,
+        latency_window: int = 1000,
+    ) -> None:
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._latency_window = latency_window
+        self._latency = LatencyStats(latency_window)
+        self._host_latency: dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=connections_per_host,
+            # Blocking would wait for a free connection without any timeout.
+            pool_block=False,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+
+    def _stats_for(self, host: str) -> LatencyStats:
+        with self._lock:
+            stats = self._host_latency.get(host)
+            if stats is None:
+                stats = LatencyStats(self._latency_window)
+                self._host_latency[host] = stats
+
+            return stats
+
+    def request(
+        self,
+        method: str,
+        host: str,
+        path: str,
+        timeout: float | tuple | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request to a device.
+
+        Args:
+            method (str): HTTP method
+            host (str): Device address, optionally with ":port"
+            path (str): Path and query, with or without a leading slash
+            timeout (float | tuple, optional): Overrides the client deadlines,
+                either one value for both or (connect, read)
+
+        Returns:
+            requests.Response: The device's response
+
+        Raises:
+            requests.RequestException: If the device could not be reached
+        """
+        if timeout is None:
+            timeout = (self._connect_timeout, self._read_timeout)
+
+        stats = self._stats_for(host)
+        start = time.perf_counter()
+
+        try:
+            response = self._session.request(
+                method, f"http://{host}/{path.lstrip('/')}", timeout=timeout, **kwargs
+            )
+        except requests.RequestException:
+            self._latency.add_failure()
+            stats.add_failure()
+            raise
+
+        elapsed = time.perf_counter() - start
+        self._latency.add(elapsed)
+        stats.add(elapsed)
+
+        return response
+
+    def get(self, host: str, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", host, path, **kwargs)
+
+    def post(self, host: str, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", host, path, **kwargs)
+
+    def latency_for(self, host: str) -> LatencyStats:
+        return self._stats_for(host)
+
+    def close(self) -> None:
+        self._session.close()
+
+    @property
+    def latency(self) -> LatencyStats:
+        return self._latency
+
+    @property
+    def connect_timeout(self) -> float:
+        return self._connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        return self._read_timeout
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def shared_device_client() -> DeviceClient:
+    global _shared_client
+
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = DeviceClient()
+
+        return _shared_client
@@ -0,0 +1,174 @@
+import json
+import threading
+
+import requests
+
+from ArduinoBackend.device_client import DeviceClient, shared_device_client
+from ArduinoBackend.liveness_checker import shared_liveness_checker
+from ArduinoBackend.status_cache import StatusCache
+
+
+class DeviceInfoCache:
+    """
+    What every controller reported about itself, cached per MAC address.
+
+    Entries come from GET /info (MAC, LED count, firmware version, current
+    mode, color and delay in one reply) or from a discovery reply, and are
+    only dropped when the device reconnects (goes from offline to online or
+    answers at another address) or reports a different firmware version.
+    Controllers without /info fall back to GET /num.
+    """
+
+    def __init__(
+        self,
+        device_client: DeviceClient | None = None,
+        status_cache: StatusCache | None = None,
+        timeout: float = 1.0,
+    ) -> None:
+        self._device_client = device_client or shared_device_client()
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+
+        if status_cache is not None:
+            status_cache.subscribe(self._on_status)
+
+    def _on_status(
+        self, mac_address: str, ip_address: str, online: bool, previous: bool | None
+    ) -> None:
+        if online and previous is False:
+            self.invalidate(mac_address)
+
+    @staticmethod
+    def _is_valid(mac_address: str, info) -> bool:
+        """Whether a reply describes this device well enough to be cached."""
+        if not isinstance(info, dict):
+            return False
+
+        leds = info.get("leds")
+        if not isinstance(leds, int) or isinstance(leds, bool) or leds <= 0:
+            return False
+
+        mac = info.get("mac")
+        return isinstance(mac, str) and mac.upper() == mac_address.upper()
+
+    def _fetch(self, device) -> dict | None:
+        try:
+            response = self._device_client.get(
+                device.ip_address, "/info", timeout=self._timeout
+            )
+
+            if response.status_code == 404:
+                # Firmware before 1.3.0
+                response = self._device_client.get(
+                    device.ip_address, "/num", timeout=self._timeout
+                )
+                if response.status_code != 200:
+                    print(f"FAIL: {response.status_code}")
+                    return None
+
+                info = {"mac": device.mac_address, "leds": int(response.text)}
+            elif response.status_code != 200:
+                print(f"FAIL: {response.status_code}")
+                return None
+            else:
+                info = json.loads(response.text)
+
+            if not self._is_valid(device.mac_address, info):
+                print(f"Invalid device info from {device.ip_address}: {info!r}")
+                return None
+
+            return info
+        except requests.exceptions.RequestException as e:
+            print(f"Connection failure: {e}")
+        except ValueError as e:
+            print(f"Invalid device info from {device.ip_address}: {e}")
+
+        return None
+
+    def cached(self, device) -> dict | None:
+        """
+        The cached info of a device, without any network traffic.
+
+        Returns:
+            dict | None: The info, or None if it is unknown or was taken at
+            another address
+        """
+        with self._lock:
+            entry = self._entries.get(device.mac_address)
+
+        if entry is None or entry["ip_address"] != device.ip_address:
+            return None
+
+        return entry["info"]
+
+    def get(self, device, refresh: bool = False) -> dict | None:
+        """
+        The info of a device, asking the device only if it is not cached.
+
+        Args:
+            device (Arduino): Device to describe
+            refresh (bool, optional): Ask the device even if cached
+
+        Returns:
+            dict | None: "mac", "leds" and, from /info, "version", "mode",
+            "color" and "delay"; None if the device did not answer or its
+            reply did not name it and a positive LED count
+        """
+        if not refresh:
+            info = self.cached(device)
+            if info is not None:
+                return info
+
+        info = self._fetch(device)
+        if info is not None:
+            self.observe(device.mac_address, device.ip_address, info)
+
+        return info
+
+    def observe(self, mac_address: str, ip_address: str, info: dict) -> None:
+        """
+        Store info reported elsewhere, e.g. in a discovery reply.
+
+        Known fields of the same device are kept unless the firmware version
+        changed, in which case only the new info is kept. Info that does not
+        name the device or a positive LED count is ignored.
+        """
+        if not self._is_valid(mac_address, info):
+            return
+
+        with self._lock:
+            entry = self._entries.get(mac_address)
+            merged = {}
+
+            if entry is not None and entry["ip_address"] == ip_address:
+                old_version = entry["info"].get("version")
+                new_version = info.get("version")
+                if not old_version or not new_version or old_version == new_version:
+                    merged.update(entry["info"])
+
+            merged.update(info)
+            self._entries[mac_address] = {"ip_address": ip_address, "info": merged}
+
+    def invalidate(self, mac_address: str | None = None) -> None:
+        with self._lock:
+            if mac_address is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(mac_address, None)
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def shared_device_info_cache() -> DeviceInfoCache:
+    global _shared_cache
+
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DeviceInfoCache(
+                status_cache=shared_liveness_checker().status_cache
+            )
+
+        return _shared_cache
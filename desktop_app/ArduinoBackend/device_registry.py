@@ -0,0 +1,168 @@
+import threading
+from typing import Callable, Iterable
+
+from ArduinoBackend.arduino import Arduino
+
+
+class DeviceRegistry:
+    """
+    Devices keyed by MAC address, with secondary indexes by IP and by name.
+
+    Listeners are called with (event, device, previous_ip_address) where event
+    is one of ADDED, REMOVED or MOVED (the device answered at a new address).
+    """
+
+    ADDED = "added"
+    REMOVED = "removed"
+    MOVED = "moved"
+
+    def __init__(self, devices: Iterable[Arduino] = ()) -> None:
+        self._lock = threading.RLock()
+        self._by_mac: dict[str, Arduino] = {}
+        self._by_ip: dict[str, Arduino] = {}
+        self._by_name: dict[str, dict[str, Arduino]] = {}
+        self._indexed: dict[str, tuple[str, str]] = {}
+        self._listeners: list[Callable[[str, Arduino, str | None], None]] = []
+
+        for device in devices:
+            self.upsert(device)
+
+    def _index(self, device: Arduino) -> None:
+        self._unindex(device.mac_address)
+
+        self._by_ip[device.ip_address] = device
+        self._by_name.setdefault(device.name, {})[device.mac_address] = device
+        self._indexed[device.mac_address] = (device.ip_address, device.name)
+
+    def _unindex(self, mac_address: str) -> None:
+        if mac_address not in self._indexed:
+            return
+
+        ip_address, name = self._indexed.pop(mac_address)
+
+        if self._by_ip.get(ip_address) is self._by_mac.get(mac_address):
+            del self._by_ip[ip_address]
+
+        same_name = self._by_name.get(name, {})
+        same_name.pop(mac_address, None)
+        if not same_name:
+            self._by_name.pop(name, None)
+
+    def _emit(self, event: str, device: Arduino, previous_ip: str | None) -> None:
+        for listener in list(self._listeners):
+            listener(event, device, previous_ip)
+
+    def subscribe(self, listener: Callable[[str, Arduino, str | None], None]) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Arduino, str | None], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def upsert(self, device: Arduino) -> Arduino:
+        """
+        Add a device, or merge address and status into the stored record.
+
+        The stored record wins for everything the user configured (name, last
+        command, single LED settings); only the network view is taken over.
+
+        Returns:
+            Arduino: The record held by the registry
+        """
+        with self._lock:
+            stored = self._by_mac.get(device.mac_address)
+
+            if stored is None:
+                self._by_mac[device.mac_address] = device
+                self._index(device)
+                event, previous_ip, result = DeviceRegistry.ADDED, None, device
+            else:
+                previous_ip = stored.ip_address
+                stored.status = device.status
+
+                if previous_ip == device.ip_address:
+                    return stored
+
+                stored.ip_address = device.ip_address
+                self._index(stored)
+                event, result = DeviceRegistry.MOVED, stored
+
+        self._emit(event, result, previous_ip)
+        return result
+
+    def remove(self, mac_address: str) -> Arduino | None:
+        with self._lock:
+            device = self._by_mac.get(mac_address)
+            if device is None:
+                return None
+
+            self._unindex(mac_address)
+            del self._by_mac[mac_address]
+
+        self._emit(DeviceRegistry.REMOVED, device, device.ip_address)
+        return device
+
+    def update(self, mac_address: str, attribute: str, value) -> Arduino | None:
+        """Set an attribute on a stored device and keep the indexes in step."""
+        with self._lock:
+            device = self._by_mac.get(mac_address)
+            if device is None:
+                return None
+
+            setattr(device, attribute, value)
+            self._index(device)
+
+        return device
+
+    def merge(
+        self, devices: Iterable[Arduino], keep_missing: bool = True
+    ) -> list[Arduino]:
+        """
+        Merge a complete scan result in linear time.
+
+        Args:
+            devices (Iterable[Arduino]): Every device that answered
+            keep_missing (bool, optional): Keep stored devices that did not
+                answer, marked offline, instead of removing them
+
+        Returns:
+            list: The stored records of the devices that answered
+        """
+        answered = [self.upsert(device) for device in devices]
+        seen = {device.mac_address for device in answered}
+
+        for device in self.devices:
+            if device.mac_address in seen:
+                continue
+
+            if keep_missing:
+                device.status = False
+            else:
+                self.remove(device.mac_address)
+
+        return answered
+
+    def get(self, mac_address: str) -> Arduino | None:
+        return self._by_mac.get(mac_address)
+
+    def get_by_ip(self, ip_address: str) -> Arduino | None:
+        return self._by_ip.get(ip_address)
+
+    def get_by_name(self, name: str) -> list[Arduino]:
+        with self._lock:
+            return list(self._by_name.get(name, {}).values())
+
+    def __contains__(self, device) -> bool:
+        mac_address = device.mac_address if isinstance(device, Arduino) else device
+        return mac_address in self._by_mac
+
+    def __iter__(self):
+        return iter(self.devices)
+
+    def __len__(self) -> int:
+        return len(self._by_mac)
+
+    @property
+    def devices(self) -> list[Arduino]:
+        with self._lock:
+            return list(self._by_mac.values())
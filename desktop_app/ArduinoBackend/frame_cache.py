@@ -0,0 +1,168 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FrameCycle:
+    """
+    One period of a periodic effect, precomputed.
+
+    Holds the frames as a (period, LEDs, 3) uint8 array and, for the
+    preview, every frame as "#rrggbb" strings. A cycle only has a handful of
+    distinct colors, so the strings are shared and cost a pointer per LED.
+    """
+
+    def __init__(self, frames: np.ndarray) -> None:
+        self._frames = frames
+
+        # Each color packed into one integer; unique() on rows is much slower.
+        packed = frames.astype(np.uint32) @ np.array([1 << 16, 1 << 8, 1], np.uint32)
+        palette, inverse = np.unique(packed, return_inverse=True)
+        hex_palette = [f"#{color:06x}" for color in palette.tolist()]
+        indices = inverse.reshape(frames.shape[:2]).tolist()
+        self._hex_frames = [[hex_palette[i] for i in row] for row in indices]
+
+        self._nbytes = (
+            frames.nbytes
+            + sum(sys.getsizeof(row) for row in self._hex_frames)
+            + sum(sys.getsizeof(color) for color in hex_palette)
+        )
+
+    @staticmethod
+    def estimate(period: int, led_count: int) -> int:
+        """Rough size of a cycle before building it: array plus pointers."""
+        return period * (led_count * (3 + 8) + 64)
+
+    def frame(self, step: int) -> np.ndarray:
+        return self._frames[step % len(self._frames)]
+
+    def hex_frame(self, step: int) -> list[str]:
+        return self._hex_frames[step % len(self._hex_frames)]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the cycle."""
+        return self._nbytes
+
+
+class FrameCache:
+    """
+    Least recently used FrameCycles, bounded by their total memory.
+
+    Keys are the inputs an effect's frames depend on, see
+    animation_engine.cache_key. A cycle larger than the whole budget is not
+    kept.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._cycles: OrderedDict[tuple, FrameCycle] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def lookup(self, key: tuple) -> FrameCycle | None:
+        """
+        Args:
+            key (tuple): The effect's cache key
+
+        Returns:
+            FrameCycle | None: The cached cycle, or None on a miss
+        """
+        with self._lock:
+            cycle = self._cycles.get(key)
+
+            if cycle is None:
+                self._misses += 1
+                return None
+
+            self._cycles.move_to_end(key)
+            self._hits += 1
+            return cycle
+
+    def add(self, key: tuple, frames: np.ndarray) -> FrameCycle:
+        """
+        Keep one period of frames, evicting the least recently used cycles
+        beyond the budget.
+
+        Building the cycle's preview strings takes a while for long strips,
+        so callers on the Tk thread should run this in the background.
+
+        Args:
+            key (tuple): The effect's cache key
+            frames (np.ndarray): One period as a (period, LEDs, 3) uint8 array
+
+        Returns:
+            FrameCycle: The cycle
+        """
+        cycle = FrameCycle(frames)
+
+        with self._lock:
+            if cycle.nbytes > self._max_bytes or key in self._cycles:
+                return self._cycles.get(key, cycle)
+
+            self._cycles[key] = cycle
+            self._bytes += cycle.nbytes
+
+            while self._bytes > self._max_bytes:
+                _, evicted = self._cycles.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+
+        return cycle
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cycles.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: hits, misses, hit_rate, evictions, entries, bytes and
+            max_bytes
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._cycles),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def shared_frame_cache() -> FrameCache:
+    global _shared_cache
+
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FrameCache()
+
+        return _shared_cache
@@ -0,0 +1,83 @@
+import time
+from typing import Callable
+
+
+class FrameClock:
+    """
+    Master clock for animations, independent of any GUI toolkit.
+
+    Frame n is due at start + n * period of wall-clock time, so the time
+    spent drawing a frame does not push back the following ones. When the
+    caller falls behind by whole periods, the missed frames are skipped and
+    reported instead of being caught up in a burst.
+
+    The owner calls tick() and waits for the number of seconds it returns,
+    e.g. with a single Tk after() handle.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        on_frame: Callable[[int, int], None],
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Args:
+            period (float): Seconds between two frames
+            on_frame (Callable): Called with the frame number and the number
+                of frames skipped right before it
+            clock (Callable, optional): Source of the current time in seconds
+        """
+        self._period = max(0.001, period)
+        self._on_frame = on_frame
+        self._clock = clock
+        self._frames_skipped = 0
+        self.start()
+
+    def start(self) -> None:
+        """Restart at frame 0, due right away."""
+        self._origin = self._clock()
+        self._next_frame = 0
+
+    def _due(self, frame: int) -> float:
+        return self._origin + frame * self._period
+
+    def tick(self) -> float:
+        """
+        Run the next frame once its time has come.
+
+        Returns:
+            float: Seconds until the next frame is due
+        """
+        now = self._clock()
+
+        if self._due(self._next_frame) <= now:
+            # The float division can land just below a boundary that _due
+            # already counts as passed; frame numbers only ever go up.
+            frame = max(self._next_frame, int((now - self._origin) / self._period))
+            skipped = frame - self._next_frame
+            self._frames_skipped += skipped
+            self._next_frame = frame + 1
+            self._on_frame(frame, skipped)
+            now = self._clock()
+
+        return max(0.0, self._due(self._next_frame) - now)
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @period.setter
+    def period(self, value: float) -> None:
+        """Change the rate from the next frame on, without skipping any."""
+        value = max(0.001, value)
+        if value == self._period:
+            return
+
+        now = self._clock()
+        self._period = value
+        self._origin = now - (self._next_frame - 1) * value
+
+    @property
+    def frames_skipped(self) -> int:
+        return self._frames_skipped
@@ -0,0 +1,183 @@
+import socket
+import struct
+import threading
+import time
+from typing import Callable
+
+from ArduinoBackend.pixel_frame import PixelFrame
+
+
+class FrameStreamer:
+    """
+    Streams full frames to a controller over UDP in realtime mode.
+
+    Every packet carries a 10 byte header (b"LR", version, packet index,
+    packet count, reserved, sequence number) followed by pixel spans as in
+    PixelFrame. Frames larger than one datagram are split into several
+    packets with the same sequence number; the controller shows a frame when
+    its last packet arrives and drops packets of older frames. Without
+    packets for a while it falls back to its normal animation loop.
+    """
+
+    PORT = 4211
+    VERSION = 1
+    HEADER = struct.Struct("<2sBBBxI")
+    MAGIC = b"LR"
+
+    # Ethernet MTU minus IP and UDP headers, so no packet is fragmented.
+    MAX_PACKET = 1472
+
+    def __init__(
+        self,
+        ip_address: str,
+        port: int = PORT,
+        fps: float = 60.0,
+        max_packet: int = MAX_PACKET,
+    ) -> None:
+        self._address = (ip_address.split(":")[0], port)
+        self._period = 1 / fps
+        self._pixels_per_packet = (
+            max_packet - FrameStreamer.HEADER.size - PixelFrame.HEADER.size
+        ) // 3
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sequence = 0
+        self._frames_sent = 0
+        self._frames_skipped = 0
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def packets(self, rgb: bytes, sequence: int) -> list[bytes]:
+        """
+        Split a frame into datagrams.
+
+        Args:
+            rgb (bytes): Three bytes per LED, starting at LED 0
+            sequence (int): Frame sequence number
+
+        Returns:
+            list: The datagrams of the frame, in order
+        """
+        chunk = 3 * self._pixels_per_packet
+        spans = [
+            (start // 3, rgb[start : start + chunk])
+            for start in range(0, len(rgb), chunk)
+        ] or [(0, b"")]
+
+        if len(spans) > 0xFF:
+            raise ValueError("Frame needs more than 255 packets")
+
+        return [
+            FrameStreamer.HEADER.pack(
+                FrameStreamer.MAGIC,
+                FrameStreamer.VERSION,
+                index,
+                len(spans),
+                sequence & 0xFFFFFFFF,
+            )
+            + PixelFrame([span]).encode()
+            for index, span in enumerate(spans)
+        ]
+
+    def send(self, rgb: bytes) -> int:
+        """
+        Send one frame right away.
+
+        Returns:
+            int: The frame's sequence number
+        """
+        sequence = self._sequence
+        self._sequence += 1
+
+        for packet in self.packets(rgb, sequence):
+            self._socket.sendto(packet, self._address)
+
+        self._frames_sent += 1
+        return sequence
+
+    def run(
+        self,
+        frame_source: Callable[[int], bytes | None],
+        duration: float | None = None,
+    ) -> None:
+        """
+        Send frames at the configured rate until stopped.
+
+        Frames are paced against absolute deadlines, so a late frame does not
+        push back all following ones. When the sender falls behind by more
+        than a whole period, the missed frames are skipped rather than sent
+        in a burst.
+
+        Args:
+            frame_source (Callable): Called with the frame number and returns
+                the frame's rgb bytes, or None to stop streaming
+            duration (float, optional): Stop after this many seconds
+        """
+        start = time.perf_counter()
+        frame = 0
+
+        while not self._stopped.is_set():
+            deadline = start + frame * self._period
+            now = time.perf_counter()
+
+            if duration is not None and deadline - start >= duration:
+                break
+
+            if now - deadline > self._period:
+                missed = int((now - deadline) / self._period)
+                self._frames_skipped += missed
+                frame += missed
+                continue
+
+            # Sleep most of the wait and spin the last millisecond; sleep()
+            # alone overshoots by about a millisecond on most systems.
+            if deadline - now > 0.001:
+                time.sleep(deadline - now - 0.001)
+            while time.perf_counter() < deadline:
+                pass
+
+            rgb = frame_source(frame)
+            if rgb is None:
+                break
+
+            self.send(rgb)
+            frame += 1
+
+    def start(
+        self,
+        frame_source: Callable[[int], bytes | None],
+        duration: float | None = None,
+    ) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self.run,
+            args=(frame_source, duration),
+            name="frame-streamer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self._socket.close()
+
+    @property
+    def fps(self) -> float:
+        return 1 / self._period
+
+    @property
+    def frames_sent(self) -> int:
+        return self._frames_sent
+
+    @property
+    def frames_skipped(self) -> int:
+        return self._frames_skipped
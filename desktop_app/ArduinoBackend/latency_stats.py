@@ -0,0 +1,67 @@
+import math
+import threading
+from collections import deque
+
+
+class LatencyStats:
+    """Rolling window of request latencies with nearest-rank percentiles."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._failures = 0
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def add_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float | None: Latency in seconds, or None without samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+
+        return self._nearest_rank(samples, percent)
+
+    @staticmethod
+    def _nearest_rank(samples: list[float], percent: float) -> float | None:
+        if not samples:
+            return None
+
+        return samples[max(1, math.ceil(percent / 100 * len(samples))) - 1]
+
+    def summary(self) -> dict:
+        """Request and failure counts plus p50, p90, p99 and max in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, failures = self._count, self._failures
+
+        def at(percent: float) -> float | None:
+            value = self._nearest_rank(samples, percent)
+            return None if value is None else value * 1000
+
+        return {
+            "count": count,
+            "failures": failures,
+            "p50_ms": at(50),
+            "p90_ms": at(90),
+            "p99_ms": at(99),
+            "max_ms": at(100),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._count = 0
+            self._failures = 0
@@ -0,0 +1,137 @@
+import threading
+import concurrent.futures
+import requests
+
+from ArduinoBackend.device_client import DeviceClient, shared_device_client
+from ArduinoBackend.status_cache import StatusCache
+
+
+class LivenessChecker:
+    def __init__(
+        self,
+        timeout=0.3,
+        freshness=2.0,
+        max_workers=32,
+        status_cache: StatusCache | None = None,
+        device_client: DeviceClient | None = None,
+    ) -> None:
+        self._timeout = timeout
+        self._freshness = freshness
+        self._status_cache = status_cache or StatusCache()
+
+        # Repeated checks of the same controller reuse its kept-alive
+        # connection instead of a new handshake.
+        self._device_client = device_client or shared_device_client()
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="liveness"
+        )
+
+    def _probe(self, device) -> bool:
+        try:
+            response = self._device_client.get(
+                device.ip_address, "/mac", timeout=self._timeout
+            )
+        except requests.RequestException:
+            return False
+
+        if response.status_code != 200:
+            return False
+
+        # A different controller that took over the address is not this one.
+        mac = device.mac_address
+        return not mac or mac == "Unknown" or response.text.strip().upper() == mac
+
+    def _check_and_store(self, device) -> bool:
+        online = self._probe(device)
+        self.record(device, online)
+
+        return online
+
+    def record(self, device, online: bool) -> bool:
+        """
+        Store a result observed elsewhere, e.g. a device that just answered a scan.
+
+        Returns:
+            bool: True if the device's status changed
+        """
+        return self._status_cache.record(device.mac_address, device.ip_address, online)
+
+    def check(self, device, max_age: float | None = None) -> bool:
+        """
+        Check whether a single device answers, reusing a fresh cached result.
+
+        Args:
+            device (Arduino): Device to check
+            max_age (float, optional): Oldest cached result in seconds that is
+                still accepted; defaults to the checker's freshness window
+
+        Returns:
+            bool: True if the device answered /mac with its own MAC address
+        """
+        return self.check_all([device], max_age)[device.mac_address]
+
+    def check_all(self, devices: list, max_age: float | None = None) -> dict:
+        """
+        Check many devices concurrently and update their status.
+
+        Args:
+            devices (list[Arduino]): Devices to check
+            max_age (float, optional): Oldest cached result in seconds that is
+                still accepted; defaults to the checker's freshness window
+
+        Returns:
+            dict: Liveness per MAC address
+        """
+        if max_age is None:
+            max_age = self._freshness
+
+        results = {}
+        pending = {}
+
+        for device in devices:
+            online = self._status_cache.fresh(
+                device.mac_address, device.ip_address, max_age
+            )
+
+            if online is None:
+                pending[self._executor.submit(self._check_and_store, device)] = device
+            else:
+                results[device.mac_address] = online
+
+        for future, device in pending.items():
+            results[device.mac_address] = future.result()
+
+        for device in devices:
+            device.status = results[device.mac_address]
+
+        return results
+
+    def invalidate(self, device=None) -> None:
+        self._status_cache.invalidate(None if device is None else device.mac_address)
+
+    @property
+    def status_cache(self) -> StatusCache:
+        return self._status_cache
+
+    @property
+    def freshness(self) -> float:
+        return self._freshness
+
+    @freshness.setter
+    def freshness(self, value: float) -> None:
+        self._freshness = value
+
+
+_shared_checker = None
+_shared_lock = threading.Lock()
+
+
+def shared_liveness_checker() -> LivenessChecker:
+    global _shared_checker
+
+    with _shared_lock:
+        if _shared_checker is None:
+            _shared_checker = LivenessChecker()
+
+        return _shared_checker
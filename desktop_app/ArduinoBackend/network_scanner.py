@@ -1,17 +1,73 @@
+import re
+import json
 import socket
+import asyncio
 import ipaddress
 import concurrent.futures
 import time
+from typing import Callable
 import requests
 
+try:
+    import resource
+except ImportError:
+    # Windows has no RLIMIT_NOFILE; its select() loop handles far more sockets.
+    resource = None
+
 from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.device_client import shared_device_client
 
 
 class NetworkScanner:
-    def __init__(self, timeout=0.5, max_workers=100) -> None:
+    ENGINES = ("asyncio", "threads")
+    DISCOVERY_MODES = ("tcp", "udp")
+
+    DISCOVERY_PORT = 4210
+    DISCOVERY_BEACON = b"LEDCTRL_DISCOVER"
+
+    HOST_ESP = "esp"
+    HOST_HTTP = "http"
+    HOST_CLOSED = "closed"
+
+    _MAC_PATTERN = re.compile(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$")
+    _MAX_RESPONSE_BYTES = 4096
+    _PROGRESS_INTERVAL = 0.05
+    # Descriptors left for the event loop, log files, the device client's
+    # pool and the rest of the app while a sweep holds the others.
+    _FD_HEADROOM = 64
+
+    def __init__(
+        self,
+        timeout=0.5,
+        max_workers=100,
+        max_concurrency=1024,
+        engine="asyncio",
+        single_connection=True,
+        read_timeout=None,
+        discovery="tcp",
+    ) -> None:
+        if engine not in NetworkScanner.ENGINES:
+            raise ValueError(f"Unknown scan engine: {engine}")
+
+        if discovery not in NetworkScanner.DISCOVERY_MODES:
+            raise ValueError(f"Unknown discovery mode: {discovery}")
+
         self._timeout = timeout
+        self._read_timeout = timeout if read_timeout is None else read_timeout
         self._max_workers = max_workers
+        self._max_concurrency = max_concurrency
+        self._engine = engine
+        self._single_connection = single_connection
+        self._discovery = discovery
         self._http_devices = []
+        self._host_classes = {}
+        self._device_info = {}
+
+        self._on_device = None
+        self._on_progress = None
+        self._total_hosts = 0
+        self._last_progress = 0.0
+        self._scan_start = 0.0
 
     def _get_network_ip(self) -> str:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -28,6 +84,63 @@ class NetworkScanner:
             # Fallback to localhost if no connection
             return "127.0.0.1/24"
 
+    def _host(self, ip, port) -> str:
+        # Devices on a non-default port keep it in their address so every
+        # f"http://{arduino.ip_address}/..." url still reaches them.
+        return str(ip) if port == 80 else f"{ip}:{port}"
+
+    def _mac_request(self, ip, port) -> bytes:
+        return (
+            f"GET /mac HTTP/1.0\r\nHost: {self._host(ip, port)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+
+    def _response_complete(self, raw: bytes) -> bool:
+        if len(raw) >= NetworkScanner._MAX_RESPONSE_BYTES:
+            return True
+
+        head, separator, body = raw.partition(b"\r\n\r\n")
+        if not separator:
+            return False
+
+        match = re.search(rb"content-length:\s*(\d+)", head, re.IGNORECASE)
+        return match is not None and len(body) >= int(match.group(1))
+
+    def _classify(self, ip, port, raw: bytes) -> tuple[str, Arduino | None]:
+        head, _, body = raw.partition(b"\r\n\r\n")
+        status_line = head.split(b"\r\n", 1)[0].split()
+
+        if len(status_line) < 2 or not status_line[1].startswith(b"2"):
+            return NetworkScanner.HOST_HTTP, None
+
+        mac = body.decode(errors="replace").strip()
+        if not NetworkScanner._MAC_PATTERN.match(mac):
+            return NetworkScanner.HOST_HTTP, None
+
+        return NetworkScanner.HOST_ESP, self._create_arduino(ip, port, mac)
+
+    def _parse_discovery_reply(self, data: bytes) -> dict | None:
+        try:
+            reply = json.loads(data)
+        except ValueError:
+            return None
+
+        if not isinstance(reply, dict):
+            return None
+
+        if not NetworkScanner._MAC_PATTERN.match(str(reply.get("mac", ""))):
+            return None
+
+        return reply
+
+    def _create_arduino(self, ip, port, mac: str) -> Arduino:
+        return Arduino(
+            name=mac,
+            ip_address=self._host(ip, port),
+            mac_address=mac.upper(),
+            status=True,
+        )
+
     def _check_port(self, ip, port) -> str | None:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(self._timeout)
@@ -43,13 +156,235 @@ class NetworkScanner:
 
         return None
 
-    def scan_network(self, network=None, port=80) -> list:
+    def _probe(self, ip, port) -> tuple[str, Arduino | None]:
+        if not self._single_connection:
+            if self._check_port(ip, port) is None:
+                return NetworkScanner.HOST_CLOSED, None
+
+            device = self._fingerprint(ip, port)
+            host_class = (
+                NetworkScanner.HOST_HTTP if device is None else NetworkScanner.HOST_ESP
+            )
+            return host_class, device
+
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        except OSError:
+            return NetworkScanner.HOST_CLOSED, None
+
+        sock.settimeout(self._timeout)
+
+        try:
+            if sock.connect_ex((str(ip), port)) != 0:
+                return NetworkScanner.HOST_CLOSED, None
+
+            deadline = time.monotonic() + self._read_timeout
+            raw = b""
+
+            sock.sendall(self._mac_request(ip, port))
+
+            while not self._response_complete(raw):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                sock.settimeout(remaining)
+                chunk = sock.recv(1024)
+                if not chunk:
+                    break
+                raw += chunk
+        except OSError:
+            return NetworkScanner.HOST_HTTP, None
+        finally:
+            sock.close()
+
+        return self._classify(ip, port, raw)
+
+    async def _probe_async(self, ip, port, semaphore) -> tuple[str, Arduino | None]:
+        loop = asyncio.get_running_loop()
+
+        async with semaphore:
+            sock = None
+
+            try:
+                # Inside the try: running out of descriptors (EMFILE) costs
+                # this host, not the whole scan.
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                await asyncio.wait_for(
+                    loop.sock_connect(sock, (str(ip), port)), timeout=self._timeout
+                )
+            except (OSError, asyncio.TimeoutError):
+                if sock is not None:
+                    sock.close()
+                return NetworkScanner.HOST_CLOSED, None
+
+            if not self._single_connection:
+                sock.close()
+                device = await asyncio.to_thread(self._fingerprint, ip, port)
+                host_class = (
+                    NetworkScanner.HOST_HTTP
+                    if device is None
+                    else NetworkScanner.HOST_ESP
+                )
+                return host_class, device
+
+            # Ask for /mac on the connection that just passed the port check,
+            # so every host costs exactly one handshake.
+            raw = b""
+
+            async def read_response() -> None:
+                nonlocal raw
+                await loop.sock_sendall(sock, self._mac_request(ip, port))
+
+                while not self._response_complete(raw):
+                    chunk = await loop.sock_recv(sock, 1024)
+                    if not chunk:
+                        break
+                    raw += chunk
+
+            try:
+                await asyncio.wait_for(read_response(), timeout=self._read_timeout)
+            except asyncio.TimeoutError:
+                pass
+            except OSError:
+                return NetworkScanner.HOST_HTTP, None
+            finally:
+                sock.close()
+
+            return self._classify(ip, port, raw)
+
+    def _record(self, ip, port, host_class: str, device: Arduino | None) -> None:
+        self._host_classes[self._host(ip, port)] = host_class
+
+        if device is not None:
+            self._http_devices.append(device)
+
+            if self._on_device is not None:
+                self._on_device(device)
+
+        self._report_progress()
+
+    def _report_progress(self, force: bool = False) -> None:
+        if self._on_progress is None:
+            return
+
+        now = time.monotonic()
+        probed = len(self._host_classes)
+
+        # Callers usually marshal this onto the Tk thread, so a /20 sweep must
+        # not flood it with one event per host.
+        if not force and probed < self._total_hosts:
+            if now - self._last_progress < NetworkScanner._PROGRESS_INTERVAL:
+                return
+
+        self._last_progress = now
+        elapsed = max(now - self._scan_start, 1e-9)
+        self._on_progress(probed, self._total_hosts, probed / elapsed)
+
+    def _concurrency_limit(self) -> int:
+        if resource is None:
+            return self._max_concurrency
+
+        try:
+            soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        except (OSError, ValueError):
+            return self._max_concurrency
+
+        if soft_limit == resource.RLIM_INFINITY:
+            return self._max_concurrency
+
+        return max(
+            1, min(self._max_concurrency, soft_limit - NetworkScanner._FD_HEADROOM)
+        )
+
+    async def _scan_hosts_async(self, targets) -> None:
+        # A single event loop keeps every probe in flight on this thread; the
+        # semaphore only guards against running out of file descriptors.
+        semaphore = asyncio.Semaphore(self._concurrency_limit())
+
+        async def probe(ip, port) -> tuple:
+            return ip, port, *await self._probe_async(ip, port, semaphore)
+
+        for completed in asyncio.as_completed([probe(*t) for t in targets]):
+            self._record(*await completed)
+
+    def _scan_hosts_threads(self, targets) -> None:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as executor:
+            future_to_target = {
+                executor.submit(self._probe, *target): target for target in targets
+            }
+
+            for future in concurrent.futures.as_completed(future_to_target):
+                self._record(*future_to_target[future], *future.result())
+
+    def _run(self, targets, on_device, on_progress) -> list:
+        self._http_devices = []
+        self._host_classes = {}
+
+        self._on_device = on_device
+        self._on_progress = on_progress
+        self._total_hosts = len(targets)
+        self._scan_start = self._last_progress = time.monotonic()
+
+        try:
+            if self._engine == "asyncio":
+                asyncio.run(self._scan_hosts_async(targets))
+            else:
+                self._scan_hosts_threads(targets)
+
+            self._report_progress(force=True)
+        finally:
+            self._on_device = None
+            self._on_progress = None
+
+        return self._http_devices
+
+    def _fingerprint(self, ip, port) -> Arduino | None:
+        try:
+            response = shared_device_client().get(
+                self._host(ip, port), "/mac", timeout=self._timeout
+            )
+        except requests.RequestException:
+            return None
+
+        if (
+            response.status_code not in (200, 201, 202, 203, 204)
+            or "html" in response.text
+        ):
+            return None
+
+        return self._create_arduino(ip, port, response.text)
+
+    def scan_network(
+        self,
+        network=None,
+        port=80,
+        on_device: Callable[[Arduino], None] | None = None,
+        on_progress: Callable[[int, int, float], None] | None = None,
+        exclude: set[str] | None = None,
+        full_sweep: bool = False,
+    ) -> list:
         """
         Scan the network for devices with the specified port open.
 
+        With UDP discovery the TCP sweep only runs when no device replied,
+        unless full_sweep asks for it; it then also finds devices without
+        the responder or whose reply was lost.
+
         Args:
             network (str, optional): Network in CIDR notation (e.g., '192.168.1.0/24')
             port (int, optional): Port to scan for
+            on_device (Callable, optional): Called with each Arduino as soon as
+                it is identified, from the scanning thread
+            on_progress (Callable, optional): Called with (hosts probed,
+                total hosts, hosts/sec) while the scan runs and once at the end
+            exclude (set, optional): Addresses ("ip" or "ip:port") to skip,
+                e.g. devices already confirmed by probe_addresses
+            full_sweep (bool, optional): Also sweep the hosts that did not
+                answer discovery
 
         Returns:
             list: List of dictionaries containing device information
@@ -59,51 +394,154 @@ class NetworkScanner:
         if network is None:
             network = self._get_network_ip()
 
-        # Clear previous results
-        self._http_devices = []
+        discovered, discovered_classes = [], {}
+        exclude = set(exclude or ())
+        sweep = True
 
-        ip_network = ipaddress.IPv4Network(network, strict=False)
-        total_hosts = ip_network.num_addresses - 2
+        if self._discovery == "udp":
+            discovered = self.discover(network, on_device=on_device, exclude=exclude)
+            discovered_classes = dict(self._host_classes)
+            print(f"Discovery found {len(discovered)} new devices on {network}")
 
-        print(f"Scanning {total_hosts} hosts on {network} for port {port}...")
+            # One round trip is the point of discovery; without any reply the
+            # fleet probably runs an older firmware, so fall back to the sweep.
+            # A full sweep skips the hosts that replied.
+            sweep = full_sweep or not discovered_classes
+            exclude |= set(discovered_classes)
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self._max_workers
-        ) as executor:
-            ip_list = list(ip_network.hosts())
-            future_to_ip = {
-                executor.submit(self._check_port, ip, port): ip for ip in ip_list
-            }
+        if sweep:
+            ip_network = ipaddress.IPv4Network(network, strict=False)
+            targets = [
+                (str(ip), port)
+                for ip in ip_network.hosts()
+                if self._host(ip, port) not in exclude
+            ]
 
-            for future in concurrent.futures.as_completed(future_to_ip):
-                ip = future.result()
+            print(
+                f"Scanning {len(targets)} hosts on {network} for port {port} "
+                f"({self._engine})..."
+            )
 
-                if ip:
-                    response = requests.get(f"http://{ip}/mac")
+            self._run(targets, on_device, on_progress)
+            self._http_devices = discovered + self._http_devices
+            self._host_classes.update(discovered_classes)
 
-                    if (
-                        response.status_code not in (200, 201, 202, 203, 204)
-                        or "html" in response.text
-                    ):
-                        continue
+        scan_time = time.time() - start_time
+        print(f"Scan completed in {scan_time:.2f} seconds")
+        print(f"Found {len(self._http_devices)} devices with port {port} open")
 
-                    mac = response.text
+        return self._http_devices
 
-                    a = Arduino(
-                        name=mac,
-                        ip_address=str(ip),
-                        mac_address=mac.upper(),
-                        status=True,
-                    )
+    def discover(
+        self,
+        network=None,
+        discovery_port=DISCOVERY_PORT,
+        on_device: Callable[[Arduino], None] | None = None,
+        exclude: set[str] | None = None,
+    ) -> list:
+        """
+        Find devices with a single UDP broadcast beacon.
 
-                    self._http_devices.append(a)
+        Every firmware that runs the discovery responder answers with its MAC,
+        LED count and firmware version, so the whole subnet is covered in one
+        round trip. Replies are collected until the scanner timeout expires.
 
-        scan_time = time.time() - start_time
-        print(f"Scan completed in {scan_time:.2f} seconds")
-        print(f"Found {len(self._http_devices)} devices with port {port} open")
+        Args:
+            network (str, optional): Network in CIDR notation whose broadcast
+                address receives the beacon
+            discovery_port (int, optional): UDP port the responders listen on
+            on_device (Callable, optional): Called with each Arduino as soon as
+                its reply arrives
+            exclude (set, optional): Addresses ("ip" or "ip:port") to ignore
+
+        Returns:
+            list: Arduinos that answered the beacon
+        """
+        if network is None:
+            network = self._get_network_ip()
+
+        broadcast_address = str(
+            ipaddress.IPv4Network(network, strict=False).broadcast_address
+        )
+        exclude = exclude or set()
+
+        self._http_devices = []
+        self._host_classes = {}
+        self._on_device = on_device
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+        try:
+            sock.sendto(
+                NetworkScanner.DISCOVERY_BEACON, (broadcast_address, discovery_port)
+            )
+            deadline = time.monotonic() + self._timeout
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                sock.settimeout(remaining)
+
+                try:
+                    data, (ip, _) = sock.recvfrom(1024)
+                except socket.timeout:
+                    break
+
+                reply = self._parse_discovery_reply(data)
+                if reply is None:
+                    continue
+
+                port = int(reply.get("port", 80))
+                if self._host(ip, port) in self._host_classes:
+                    continue
+
+                if self._host(ip, port) in exclude:
+                    self._host_classes[self._host(ip, port)] = NetworkScanner.HOST_ESP
+                    continue
+
+                self._device_info[reply["mac"].upper()] = {
+                    "led_count": reply.get("leds"),
+                    "version": reply.get("version"),
+                }
+                self._record(
+                    ip,
+                    port,
+                    NetworkScanner.HOST_ESP,
+                    self._create_arduino(ip, port, reply["mac"]),
+                )
+        except OSError as e:
+            print(f"Discovery failure: {e}")
+        finally:
+            sock.close()
+            self._on_device = None
 
         return self._http_devices
 
+    def probe_addresses(
+        self,
+        addresses: list[str],
+        port=80,
+        on_device: Callable[[Arduino], None] | None = None,
+    ) -> list:
+        """
+        Probe a fixed list of addresses instead of a whole subnet.
+
+        Args:
+            addresses (list): Addresses as "ip" or "ip:port"; the port
+                defaults to `port`
+            port (int, optional): Port for addresses without one
+            on_device (Callable, optional): Called with each Arduino as soon as
+                it answers
+
+        Returns:
+            list: Arduinos that answered /mac, at the address they answered on
+        """
+        targets = []
+        for address in dict.fromkeys(addresses):
+            ip, _, address_port = address.partition(":")
+            targets.append((ip, int(address_port) if address_port else port))
+
+        return self._run(targets, on_device, None)
+
     def __str__(self) -> None:
         string = ""
         for arduino in self._http_devices:
@@ -115,6 +553,14 @@ class NetworkScanner:
     def http_devices(self) -> list:
         return self._http_devices
 
+    @property
+    def host_classes(self) -> dict[str, str]:
+        return self._host_classes
+
+    @property
+    def device_info(self) -> dict[str, dict]:
+        return self._device_info
+
 
 # scanner = NetworkScanner(timeout=0.3, max_workers=150)
 # devices = scanner.scan_network()
@@ -0,0 +1,166 @@
+import struct
+from typing import Iterable
+
+
+class PixelFrame:
+    """
+    Binary pixel frame for POST /frame.
+
+    A frame is one or more spans, each laid out little endian as offset
+    (uint16), count (uint16), then count pixels of three bytes (r, g, b). The
+    controller writes every span to LEDs offset to offset + count - 1; with
+    "?clear=1" every LED not in a span is switched off first, which is what
+    the old singleLED endpoint did. Several spans make a sparse delta.
+    """
+
+    PATH = "frame"
+    HEADER = struct.Struct("<HH")
+    MAX_PIXELS = 0xFFFF
+    CONTENT_TYPE = "application/octet-stream"
+
+    # Unchanged pixels cost 3 bytes each, a new span header 4, so runs that
+    # are only one unchanged pixel apart are cheaper sent as one span.
+    _MAX_GAP = (HEADER.size - 1) // 3
+
+    def __init__(self, spans: list[tuple[int, bytes]] | None = None) -> None:
+        spans = spans or [(0, b"")]
+
+        for offset, rgb in spans:
+            if len(rgb) % 3:
+                raise ValueError("Pixel data must be a multiple of 3 bytes")
+
+            if offset > PixelFrame.MAX_PIXELS or len(rgb) // 3 > PixelFrame.MAX_PIXELS:
+                raise ValueError("Span exceeds 65535 pixels")
+
+        self._spans = [(offset, bytes(rgb)) for offset, rgb in spans]
+
+    @staticmethod
+    def _as_dict(leds: Iterable[tuple[int, int, int, int]]) -> dict:
+        return {
+            int(led[0]): tuple(max(0, min(255, int(c))) for c in led[1:4])
+            for led in leds
+        }
+
+    @classmethod
+    def _span(cls, first: int, last: int, colors: dict) -> tuple[int, bytes]:
+        rgb = bytearray()
+        for index in range(first, last + 1):
+            rgb += bytes(colors.get(index, (0, 0, 0)))
+
+        return first, bytes(rgb)
+
+    @classmethod
+    def _spans(cls, indices: list[int], colors: dict) -> list[tuple[int, bytes]]:
+        # Runs are only joined across LEDs that are set in colors; the
+        # controller marks every pixel a span covers as set.
+        spans = []
+        first = last = indices[0]
+
+        for index in indices[1:]:
+            gap = range(last + 1, index)
+            if len(gap) > PixelFrame._MAX_GAP or any(i not in colors for i in gap):
+                spans.append(cls._span(first, last, colors))
+                first = index
+            last = index
+
+        spans.append(cls._span(first, last, colors))
+        return spans
+
+    @classmethod
+    def from_leds(cls, leds: Iterable[tuple[int, int, int, int]]) -> "PixelFrame":
+        """
+        Build a frame that sets exactly the given LEDs.
+
+        Args:
+            leds (Iterable[tuple]): (index, r, g, b) tuples, as stored in
+                Arduino.single_led
+
+        Returns:
+            PixelFrame: One span per run of consecutive LEDs; LEDs in between
+            are not part of the frame
+        """
+        colors = cls._as_dict(leds)
+        if not colors:
+            return cls()
+
+        return cls(cls._spans(sorted(colors), colors))
+
+    @classmethod
+    def delta(
+        cls,
+        previous: Iterable[tuple[int, int, int, int]],
+        current: Iterable[tuple[int, int, int, int]],
+    ) -> "PixelFrame | None":
+        """
+        Build a frame with only the LEDs that differ between two settings.
+
+        Changed runs that are only a set, unchanged LED apart are merged into
+        one span. A span can only set LEDs: the controller marks every pixel
+        it covers as set, even a black one, so LEDs switched off since
+        previous need a full frame with "clear".
+
+        Returns:
+            PixelFrame | None: Frame to send without "clear", with no pixels
+            if nothing changed; None if an LED of previous is missing from
+            current
+        """
+        before = cls._as_dict(previous)
+        after = cls._as_dict(current)
+
+        if before.keys() - after.keys():
+            return None
+
+        changed = sorted(index for index in after if before.get(index) != after[index])
+        if not changed:
+            return cls()
+
+        return cls(cls._spans(changed, after))
+
+    @classmethod
+    def decode(cls, data: bytes) -> "PixelFrame":
+        if len(data) < PixelFrame.HEADER.size:
+            raise ValueError("Frame shorter than its header")
+
+        spans = []
+        position = 0
+
+        while position < len(data):
+            if len(data) - position < PixelFrame.HEADER.size:
+                raise ValueError("Frame ends inside a span header")
+
+            offset, count = PixelFrame.HEADER.unpack_from(data, position)
+            position += PixelFrame.HEADER.size
+            rgb = data[position : position + 3 * count]
+
+            if len(rgb) != 3 * count:
+                raise ValueError(
+                    f"Span announces {count} pixels but carries {len(rgb) / 3:g}"
+                )
+
+            spans.append((offset, rgb))
+            position += 3 * count
+
+        return cls(spans)
+
+    def encode(self) -> bytes:
+        return b"".join(
+            PixelFrame.HEADER.pack(offset, len(rgb) // 3) + rgb
+            for offset, rgb in self._spans
+        )
+
+    def command(self, clear: bool = True) -> str:
+        return f"{PixelFrame.PATH}?clear=1" if clear else PixelFrame.PATH
+
+    def to_leds(self) -> list[tuple[int, int, int, int]]:
+        return [
+            (offset + i, rgb[3 * i], rgb[3 * i + 1], rgb[3 * i + 2])
+            for offset, rgb in self._spans
+            for i in range(len(rgb) // 3)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(rgb) for _, rgb in self._spans) // 3
+
+    @property
+    def spans(self) -> list[tuple[int, bytes]]:
+        return list(self._spans)
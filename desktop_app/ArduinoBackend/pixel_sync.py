@@ -0,0 +1,131 @@
+import threading
+from typing import Callable
+
+from ArduinoBackend.command_dispatcher import (
+    CommandDispatcher,
+    shared_command_dispatcher,
+)
+from ArduinoBackend.liveness_checker import shared_liveness_checker
+from ArduinoBackend.pixel_frame import PixelFrame
+from ArduinoBackend.status_cache import StatusCache
+
+
+class PixelSync:
+    """
+    Sends single LED settings as deltas against what a device acknowledged.
+
+    The frame is built on the dispatcher's worker right before it is sent,
+    so it is always relative to the last setting the device confirmed. Only
+    changed pixels go out, unless a full frame is smaller or an LED was
+    switched off. Any other command sent to the device (ledOn, animations,
+    ...), a failed frame or the device dropping offline makes its state
+    unknown again, and the next setting is sent as a full frame.
+    """
+
+    def __init__(
+        self,
+        dispatcher: CommandDispatcher | None = None,
+        status_cache: StatusCache | None = None,
+    ) -> None:
+        self._dispatcher = dispatcher or shared_command_dispatcher()
+        self._lock = threading.Lock()
+        self._acknowledged: dict[str, tuple] = {}
+        self._in_flight: dict[str, tuple] = {}
+
+        self._dispatcher.subscribe(self._on_command)
+        if status_cache is not None:
+            status_cache.subscribe(self._on_status)
+
+    def send(
+        self,
+        device,
+        leds,
+        on_result: Callable[[str, object, str, str], None] | None = None,
+    ) -> None:
+        """
+        Queue a single LED setting for a device.
+
+        Args:
+            device (Arduino): Target device
+            leds (Iterable[tuple]): (index, r, g, b) of every LED that should
+                be lit; all others are switched off
+            on_result (Callable, optional): See CommandDispatcher.send
+        """
+        leds = tuple(tuple(led) for led in leds)
+
+        self._dispatcher.send(
+            device,
+            PixelFrame.PATH,
+            on_result=on_result,
+            prepare=lambda: self._prepare(device, leds),
+        )
+
+    def _prepare(self, device, leds: tuple) -> tuple[str, bytes]:
+        full = PixelFrame.from_leds(leds)
+        command, body = full.command(), full.encode()
+
+        with self._lock:
+            acknowledged = self._acknowledged.get(device.mac_address)
+            self._in_flight[device.mac_address] = leds
+
+        delta = None if acknowledged is None else PixelFrame.delta(acknowledged, leds)
+
+        if delta is not None:
+            delta_body = delta.encode()
+
+            if len(delta_body) < len(body):
+                command, body = delta.command(clear=False), delta_body
+
+        return command, body
+
+    def _on_command(self, outcome: str, device, command: str, detail: str) -> None:
+        key = device.mac_address
+
+        with self._lock:
+            leds = self._in_flight.pop(key, None)
+
+            sent_frame = (
+                outcome == CommandDispatcher.SENT
+                and command.split("?")[0] == PixelFrame.PATH
+            )
+
+            if sent_frame and leds is not None:
+                self._acknowledged[key] = leds
+            else:
+                self._acknowledged.pop(key, None)
+
+    def _on_status(
+        self, mac_address: str, ip_address: str, online: bool, previous: bool | None
+    ) -> None:
+        # A device that went away may have rebooted with a blank strip.
+        if not online or previous is False:
+            with self._lock:
+                self._acknowledged.pop(mac_address, None)
+
+    def acknowledged(self, device) -> tuple | None:
+        """The setting the device last confirmed, or None if unknown."""
+        with self._lock:
+            return self._acknowledged.get(device.mac_address)
+
+    def forget(self, device=None) -> None:
+        with self._lock:
+            if device is None:
+                self._acknowledged.clear()
+            else:
+                self._acknowledged.pop(device.mac_address, None)
+
+
+_shared_sync = None
+_shared_lock = threading.Lock()
+
+
+def shared_pixel_sync() -> PixelSync:
+    global _shared_sync
+
+    with _shared_lock:
+        if _shared_sync is None:
+            _shared_sync = PixelSync(
+                status_cache=shared_liveness_checker().status_cache
+            )
+
+        return _shared_sync
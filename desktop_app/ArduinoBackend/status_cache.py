@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Callable
+
+
+class StatusCache:
+    """Last known liveness per MAC address, with check and last-seen timestamps."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        self._listeners: list[Callable[[str, str, bool, bool | None], None]] = []
+
+    def subscribe(
+        self, listener: Callable[[str, str, bool, bool | None], None]
+    ) -> None:
+        """
+        Call a listener whenever a device's status changes.
+
+        Args:
+            listener (Callable): Called with (mac_address, ip_address, online,
+                previous) where previous is None for a device seen the first
+                time, from the thread that recorded the result
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(
+        self, listener: Callable[[str, str, bool, bool | None], None]
+    ) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def record(self, mac_address: str, ip_address: str, online: bool) -> bool:
+        """
+        Store a liveness result.
+
+        Returns:
+            bool: True if the device's status changed
+        """
+        with self._lock:
+            entry = self._entries.get(mac_address)
+            changed = entry is None or entry["online"] != online
+
+            self._entries[mac_address] = {
+                "online": online,
+                "ip_address": ip_address,
+                "checked_at": time.monotonic(),
+                "last_seen": (time.time() if online else entry and entry["last_seen"]),
+            }
+
+        if changed:
+            previous = None if entry is None else entry["online"]
+            for listener in list(self._listeners):
+                listener(mac_address, ip_address, online, previous)
+
+        return changed
+
+    def fresh(self, mac_address: str, ip_address: str, max_age: float) -> bool | None:
+        """
+        Returns:
+            bool | None: The cached status, or None if it is missing, older
+            than max_age seconds or was taken at another address
+        """
+        with self._lock:
+            entry = self._entries.get(mac_address)
+
+        if entry is None or entry["ip_address"] != ip_address:
+            return None
+
+        if time.monotonic() - entry["checked_at"] > max_age:
+            return None
+
+        return entry["online"]
+
+    def status(self, mac_address: str) -> bool | None:
+        with self._lock:
+            entry = self._entries.get(mac_address)
+
+        return None if entry is None else entry["online"]
+
+    def last_seen(self, mac_address: str) -> float | None:
+        """Wall-clock time the device last answered, or None if never."""
+        with self._lock:
+            entry = self._entries.get(mac_address)
+
+        return None if entry is None else entry["last_seen"]
+
+    def invalidate(self, mac_address: str | None = None) -> None:
+        with self._lock:
+            if mac_address is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(mac_address, None)
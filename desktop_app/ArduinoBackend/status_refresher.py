@@ -0,0 +1,69 @@
+import threading
+from typing import Callable
+
+from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.liveness_checker import LivenessChecker
+
+
+class StatusRefresher:
+    def __init__(
+        self,
+        liveness_checker: LivenessChecker,
+        get_devices: Callable[[], list[Arduino]],
+        interval: float = 5.0,
+        on_change: Callable[[list[Arduino]], None] | None = None,
+    ) -> None:
+        self._liveness_checker = liveness_checker
+        self._get_devices = get_devices
+        self._interval = interval
+        self._on_change = on_change
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="status-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        # The first check runs right away; until then the window shows the
+        # status saved by the previous session.
+        while True:
+            try:
+                self.refresh_now()
+            except Exception as e:
+                print(f"Status refresh failure: {e}")
+
+            if self._stopped.wait(self._interval):
+                return
+
+    def refresh_now(self) -> list[Arduino]:
+        """
+        Check every device once and report the ones whose status changed.
+
+        Returns:
+            list: Devices whose status changed
+        """
+        devices = list(self._get_devices())
+        before = {device.mac_address: device.status for device in devices}
+
+        # Results younger than half an interval came from scans or explicit
+        # checks and are still good enough.
+        self._liveness_checker.check_all(devices, max_age=self._interval / 2)
+
+        changed = [
+            device for device in devices if before[device.mac_address] != device.status
+        ]
+
+        if changed and self._on_change is not None:
+            self._on_change(changed)
+
+        return changed
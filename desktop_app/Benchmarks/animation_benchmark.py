@@ -0,0 +1,64 @@
+"""
+Measure how fast the animation engine produces frames, without any window.
+
+Runs every effect for a while at each strip length and prints the frames
+per second it computes; a frame is a (LEDs, 3) uint8 array, as drawn by the
+preview and sent to devices. With --cached the engine plays periodic effects
+from a FrameCache, and the cache's hit and miss counts are printed at the end.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.animation_benchmark --leds 60 300 1000
+    python -m Benchmarks.animation_benchmark --cached
+"""
+
+import argparse
+import time
+
+from ArduinoBackend.animation_engine import EFFECTS, AnimationEngine, EffectSettings
+from ArduinoBackend.frame_cache import FrameCache
+
+
+def run(effect: str, leds: int, duration: float, cache: FrameCache | None) -> float:
+    engine = AnimationEngine(
+        effect, leds, EffectSettings((255, 120, 40)), seed=1, cache=cache
+    )
+    frames = 0
+
+    # A cycle is cached after one period has been played live and built in
+    # the background; only playback is measured.
+    warm_up = time.perf_counter() + 10
+    while cache is not None and not engine.is_cached:
+        if time.perf_counter() > warm_up:
+            break
+        engine.next_frame()
+
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            engine.next_frame()
+        frames += 100
+
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leds", type=int, nargs="+", default=[60, 300, 1000])
+    parser.add_argument("--duration", type=float, default=0.5, help="seconds")
+    parser.add_argument("--cached", action="store_true")
+    args = parser.parse_args()
+
+    cache = FrameCache() if args.cached else None
+
+    print(f"{'effect':>10} " + " ".join(f"{leds:>10} LEDs" for leds in args.leds))
+    for effect in EFFECTS:
+        rates = [run(effect, leds, args.duration, cache) for leds in args.leds]
+        print(f"{effect:>10} " + " ".join(f"{rate:>10.0f} fps" for rate in rates))
+
+    if cache is not None:
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare bare requests calls with the pooled DeviceClient.
+
+Starts fake ESP listeners on loopback aliases and fetches /mac from each of
+them a number of times, once with a fresh requests.get per call (a new TCP
+connection every time) and once through DeviceClient, which keeps one
+connection per device alive. Prints the latency percentiles of both.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.client_benchmark --devices 10 --requests 200
+"""
+
+import argparse
+import time
+import requests
+
+from ArduinoBackend.device_client import DeviceClient
+from ArduinoBackend.latency_stats import LatencyStats
+from Benchmarks.scan_benchmark import start_listeners
+
+
+def run_bare(hosts: list[str], count: int) -> dict:
+    stats = LatencyStats(window=count * len(hosts))
+
+    for _ in range(count):
+        for host in hosts:
+            start = time.perf_counter()
+            requests.get(f"http://{host}/mac", timeout=(0.5, 2.0))
+            stats.add(time.perf_counter() - start)
+
+    return stats.summary()
+
+
+def run_pooled(hosts: list[str], count: int) -> dict:
+    client = DeviceClient(latency_window=count * len(hosts))
+
+    try:
+        for _ in range(count):
+            for host in hosts:
+                client.get(host, "/mac")
+
+        return client.latency.summary()
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--network", default="127.0.0.0/24")
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=200, help="per device")
+    args = parser.parse_args()
+
+    servers = start_listeners(args.network, args.devices, args.port)
+    hosts = [f"{server.server_address[0]}:{args.port}" for server in servers]
+
+    try:
+        results = {
+            "bare": run_bare(hosts, args.requests),
+            "pooled": run_pooled(hosts, args.requests),
+        }
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    for label, summary in results.items():
+        print(
+            f"{label:>6}: {summary['count']:>6} requests  "
+            f"p50 {summary['p50_ms']:7.2f} ms  "
+            f"p90 {summary['p90_ms']:7.2f} ms  "
+            f"p99 {summary['p99_ms']:7.2f} ms  "
+            f"max {summary['max_ms']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compare the binary /frame endpoint with the old singleLED tuple string.
+
+Sends the same random strip in both formats to a virtual controller for a
+range of strip lengths, checks that its strip ended up with the same
+pixels, and prints the request size and the median round-trip time of both.
+The last column is a delta frame that changes a single LED afterwards.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.frame_benchmark --leds 60 300 1000 3000
+"""
+
+import argparse
+import random
+import statistics
+import time
+import requests
+
+from ArduinoBackend.device_client import DeviceClient
+from ArduinoBackend.pixel_frame import PixelFrame
+from TestBench.virtual_esp import VirtualESPFleet
+
+
+def random_leds(count: int) -> tuple:
+    return tuple(
+        (index, random.randrange(256), random.randrange(256), random.randrange(256))
+        for index in range(count)
+    )
+
+
+def strip_bytes(leds) -> bytes:
+    return bytes(c for led in leds for c in led[1:])
+
+
+def legacy_command(leds: tuple) -> str:
+    return f"singleLED?singleLED={leds}"
+
+
+def time_requests(send, rounds: int) -> float | None:
+    timings = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = send()
+        timings.append(time.perf_counter() - start)
+
+        if response.status_code not in DeviceClient.SUCCESS_CODES:
+            return None
+
+    return statistics.median(timings)
+
+
+def run(counts: list[int], rounds: int, address: str, port: int) -> list[dict]:
+    host = f"{address}:{port}"
+    results = []
+
+    for count in counts:
+        # A fresh client per server: a kept-alive connection would still be
+        # served by the previous server's handler thread.
+        client = DeviceClient()
+        fleet = VirtualESPFleet.on_ports(1, address, port, num_leds=count)
+        fleet.start()
+        device = fleet.devices[0]
+        leds = random_leds(count)
+
+        try:
+            legacy = legacy_command(leds)
+            legacy_url = requests.Request("POST", f"http://{host}/{legacy}").prepare()
+            legacy_s = time_requests(lambda: client.post(host, legacy), rounds)
+            legacy_ok = legacy_s is not None and device.strip == strip_bytes(leds)
+
+            frame = PixelFrame.from_leds(leds)
+            body = frame.encode()
+            binary_s = time_requests(
+                lambda: client.post(
+                    host,
+                    frame.command(),
+                    data=body,
+                    headers={"Content-Type": PixelFrame.CONTENT_TYPE},
+                ),
+                rounds,
+            )
+            binary_ok = binary_s is not None and device.strip == strip_bytes(leds)
+
+            edited = list(leds)
+            index = count // 2
+            edited[index] = (index, 255 - leds[index][1], 0, 0)
+            delta = PixelFrame.delta(leds, edited)
+            delta_body = delta.encode()
+            delta_s = time_requests(
+                lambda: client.post(
+                    host,
+                    delta.command(clear=False),
+                    data=delta_body,
+                    headers={"Content-Type": PixelFrame.CONTENT_TYPE},
+                ),
+                rounds,
+            )
+            delta_ok = delta_s is not None and device.strip == strip_bytes(edited)
+        finally:
+            client.close()
+            fleet.stop()
+
+        results.append(
+            {
+                "leds": count,
+                "legacy_bytes": len(legacy_url.url),
+                "legacy_ms": legacy_s * 1000 if legacy_ok else None,
+                "binary_bytes": len(body),
+                "binary_ms": binary_s * 1000 if binary_ok else None,
+                "delta_bytes": len(delta_body),
+                "delta_ms": delta_s * 1000 if delta_ok else None,
+            }
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leds", type=int, nargs="+", default=[60, 300, 1000, 3000])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    def ms(value: float | None) -> str:
+        return f"{'failed':>11}" if value is None else f"{value:8.2f} ms"
+
+    print(f"{'LEDs':>6} {'singleLED':>22} {'frame':>22} {'1-LED delta':>22}")
+    for result in run(args.leds, args.rounds, args.address, args.port):
+        print(
+            f"{result['leds']:>6} "
+            f"{result['legacy_bytes']:>8} B {ms(result['legacy_ms'])} "
+            f"{result['binary_bytes']:>8} B {ms(result['binary_ms'])} "
+            f"{result['delta_bytes']:>8} B {ms(result['delta_ms'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
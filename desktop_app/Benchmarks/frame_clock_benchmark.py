@@ -0,0 +1,67 @@
+"""
+Compare FrameClock pacing with rescheduling a fixed delay after each frame.
+
+Simulates drawing work of a given length per frame and runs both schedulers
+for the same time. Rescheduling after the work makes the real period delay
+plus work, so the animation falls behind the wall clock; FrameClock keeps
+the frame numbers on time and skips frames when the work does not fit.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.frame_clock_benchmark --fps 30 --work-ms 5 20 40
+"""
+
+import argparse
+import time
+
+from ArduinoBackend.frame_clock import FrameClock
+
+
+def rescheduled(period: float, work: float, duration: float) -> int:
+    frames = 0
+    end = time.perf_counter() + duration
+
+    while time.perf_counter() < end:
+        time.sleep(work)
+        frames += 1
+        time.sleep(period)
+
+    return frames
+
+
+def clocked(period: float, work: float, duration: float) -> tuple[int, int]:
+    shown = []
+    clock = FrameClock(
+        period, lambda frame, skipped: (shown.append(frame), time.sleep(work))
+    )
+    end = time.perf_counter() + duration
+
+    while time.perf_counter() < end:
+        time.sleep(min(clock.tick(), max(0.0, end - time.perf_counter())))
+
+    return len(shown), shown[-1] + 1 if shown else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--work-ms", type=float, nargs="+", default=[5, 20, 40])
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds")
+    args = parser.parse_args()
+
+    period = 1 / args.fps
+    expected = int(args.duration * args.fps)
+    print(f"{args.fps:g} fps for {args.duration:g} s: {expected} frames due")
+
+    for work_ms in args.work_ms:
+        work = work_ms / 1000
+        after = rescheduled(period, work, args.duration)
+        shown, reached = clocked(period, work, args.duration)
+        print(
+            f"work {work_ms:>5.1f} ms: rescheduled reached frame {after:>4}, "
+            f"clock reached frame {reached:>4} ({shown} drawn, "
+            f"{reached - shown} skipped)"
+        )
+
+
+if __name__ == "__main__":
+    main()
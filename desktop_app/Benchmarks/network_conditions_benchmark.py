@@ -0,0 +1,124 @@
+"""
+Measure scans, liveness checks and commands under simulated Wi-Fi conditions.
+
+Starts a fleet of virtual controllers on loopback aliases and, for each
+network profile, reports how many devices a scan finds and how long it takes,
+how many live devices a liveness check wrongly reports offline, and the
+command throughput, failures and latency through the CommandDispatcher.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.network_conditions_benchmark --profiles ideal wifi congested
+"""
+
+import argparse
+import threading
+import time
+
+from ArduinoBackend.command_dispatcher import CommandDispatcher
+from ArduinoBackend.device_client import DeviceClient
+from ArduinoBackend.liveness_checker import LivenessChecker
+from ArduinoBackend.network_scanner import NetworkScanner
+from ArduinoBackend.status_cache import StatusCache
+from TestBench.network_conditions import NetworkConditions
+from TestBench.virtual_esp import VirtualESPFleet
+
+
+def send_rounds(dispatcher: CommandDispatcher, devices: list, rounds: int) -> dict:
+    """Send one command per device and round, waiting for each round."""
+    outcomes = {}
+    lock = threading.Lock()
+
+    for number in range(rounds):
+        done = threading.Event()
+        pending = [len(devices)]
+
+        def on_result(outcome, device, command, detail) -> None:
+            with lock:
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+                pending[0] -= 1
+                if pending[0] == 0:
+                    done.set()
+
+        command = f"ledOn?r={number % 256}&g=0&b=0"
+        for device in devices:
+            dispatcher.send(device, command, on_result=on_result)
+        done.wait()
+
+    return outcomes
+
+
+def run(profile: str, network: str, port: int, devices: int, rounds: int, seed: int):
+    fleet = VirtualESPFleet.on_aliases(
+        devices, network, port, conditions=NetworkConditions.profile(profile, seed)
+    )
+    fleet.start()
+
+    try:
+        start = time.perf_counter()
+        found = NetworkScanner().scan_network(network, port)
+        scan_seconds = time.perf_counter() - start
+
+        client = DeviceClient()
+        arduinos = fleet.arduinos()
+
+        checker = LivenessChecker(status_cache=StatusCache(), device_client=client)
+        start = time.perf_counter()
+        online = checker.check_all(arduinos, max_age=0)
+        check_seconds = time.perf_counter() - start
+        client.latency.reset()
+
+        dispatcher = CommandDispatcher(client)
+        start = time.perf_counter()
+        outcomes = send_rounds(dispatcher, arduinos, rounds)
+        command_seconds = time.perf_counter() - start
+        dispatcher.close()
+        client.close()
+    finally:
+        fleet.stop()
+
+    latency = client.latency.summary()
+    return {
+        "profile": profile,
+        "found": len(found),
+        "scan_s": scan_seconds,
+        "false_offline": sum(not status for status in online.values()),
+        "check_s": check_seconds,
+        "commands_per_s": devices * rounds / command_seconds,
+        "failed": outcomes.get(CommandDispatcher.FAILED, 0),
+        "p50_ms": latency["p50_ms"],
+        "p99_ms": latency["p99_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=NetworkConditions.PROFILES,
+        default=list(NetworkConditions.PROFILES),
+    )
+    parser.add_argument("--network", default="127.0.0.0/24")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        print(f"{profile}: {NetworkConditions.profile(profile)}")
+        result = run(
+            profile, args.network, args.port, args.devices, args.rounds, args.seed
+        )
+        print(
+            f"  scan found {result['found']}/{args.devices} in "
+            f"{result['scan_s']:.2f} s, liveness check {result['check_s']:.2f} s "
+            f"with {result['false_offline']} falsely offline\n"
+            f"  commands {result['commands_per_s']:.0f}/s, "
+            f"{result['failed']} failed, p50 {result['p50_ms']:.1f} ms, "
+            f"p99 {result['p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure how many frames per second the animation preview can draw.
+
+Opens a window with an LEDDisplay and pushes frames of a moving rainbow in
+which every LED changes, as fast as Tk draws them, for each strip length.
+Strips longer than the window holds are drawn grouped, several LEDs per
+oval. Needs a display.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.preview_benchmark --leds 60 300 1000 5000
+"""
+
+import argparse
+import colorsys
+import time
+
+import customtkinter as ctk
+
+from GUI.AnimationTab.led_display import LEDDisplay
+
+
+def rainbow(leds: int, frames: int) -> list[list[tuple[int, int, int]]]:
+    return [
+        [
+            tuple(
+                int(c * 255)
+                for c in colorsys.hsv_to_rgb((i / leds + number / frames) % 1, 1, 1)
+            )
+            for i in range(leds)
+        ]
+        for number in range(frames)
+    ]
+
+
+def run(window: ctk.CTk, leds: int, frames: int) -> tuple[float, int]:
+    display = LEDDisplay(window, led_count=leds)
+    display.pack(fill="both", expand=True)
+    window.update()
+
+    # Rendered up front so only drawing is measured.
+    sequence = rainbow(leds, frames)
+
+    start = time.perf_counter()
+    for frame in sequence:
+        display.set_frame(frame)
+        window.update_idletasks()
+    elapsed = time.perf_counter() - start
+
+    group = display.leds_per_oval
+    display.destroy()
+    return frames / elapsed, group
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leds", type=int, nargs="+", default=[60, 300, 1000, 5000])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    window = ctk.CTk()
+    window.geometry("900x300")
+
+    for leds in args.leds:
+        fps, group = run(window, leds, args.frames)
+        print(
+            f"{leds:>5} LEDs ({group} per oval): {fps:8.1f} fps "
+            f"{'ok' if fps >= 60 else 'below 60'}"
+        )
+
+    window.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Compare the asyncio and thread-pool scan engines of NetworkScanner.
+
+Starts a handful of fake ESP listeners on loopback aliases (127.0.0.x, which
+Linux routes to lo without any setup) and sweeps the surrounding range with
+both engines. Closed loopback ports answer with an instant RST, so a number of
+"silent" hosts are added as well: listeners with a full backlog drop the SYN
+and make the probe wait for its timeout, like a sleeping host on Wi-Fi.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.scan_benchmark --network 127.0.0.0/22 --devices 20
+"""
+
+import argparse
+import ipaddress
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ArduinoBackend.network_scanner import NetworkScanner
+
+
+class _MacHandler(BaseHTTPRequestHandler):
+    # Keep-alive like the firmware, so clients can reuse their connection.
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle and
+    # delayed ACKs hold the body back ~40 ms on a reused connection.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        if self.path != "/mac":
+            self.send_error(404)
+            return
+
+        body = self.server.mac_address.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def start_listeners(network: str, count: int, port: int) -> list:
+    servers = []
+
+    for index, ip in enumerate(ipaddress.IPv4Network(network).hosts()):
+        if index >= count:
+            break
+
+        server = ThreadingHTTPServer((str(ip), port), _MacHandler)
+        server.mac_address = f"AA:BB:CC:00:{index >> 8:02X}:{index & 0xFF:02X}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    return servers
+
+
+def start_silent_hosts(network: str, skip: int, count: int, port: int) -> list:
+    sockets = []
+
+    for index, ip in enumerate(ipaddress.IPv4Network(network).hosts()):
+        if index < skip:
+            continue
+        if index >= skip + count:
+            break
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((str(ip), port))
+        listener.listen(0)
+
+        # Fill the accept queue so every further SYN is dropped.
+        filler = socket.create_connection((str(ip), port))
+        sockets.extend((listener, filler))
+
+    return sockets
+
+
+def run(
+    network: str,
+    devices: int,
+    silent: int,
+    port: int,
+    timeout: float,
+    rounds: int,
+    single_connection: bool = True,
+) -> dict:
+    servers = start_listeners(network, devices, port)
+    silent_sockets = start_silent_hosts(network, devices, silent, port)
+    results = {}
+
+    try:
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(
+                timeout=timeout,
+                max_workers=100,
+                engine=engine,
+                single_connection=single_connection,
+            )
+            timings = []
+
+            for _ in range(rounds):
+                start = time.perf_counter()
+                found = scanner.scan_network(network, port)
+                timings.append(time.perf_counter() - start)
+
+            results[engine] = {
+                "found": len(found),
+                "best_s": min(timings),
+                "mean_s": sum(timings) / len(timings),
+            }
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+        for sock in silent_sockets:
+            sock.close()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--network", default="127.0.0.0/24")
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--silent", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--timeout", type=float, default=0.3)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--two-step",
+        action="store_true",
+        help="close after the port check and fetch /mac on a second connection",
+    )
+    args = parser.parse_args()
+
+    results = run(
+        args.network,
+        args.devices,
+        args.silent,
+        args.port,
+        args.timeout,
+        args.rounds,
+        single_connection=not args.two_step,
+    )
+
+    print()
+    for engine, result in results.items():
+        print(
+            f"{engine:>8}: found {result['found']:>4}  "
+            f"best {result['best_s'] * 1000:8.1f} ms  "
+            f"mean {result['mean_s'] * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure the time from start to the first painted window.
+
+Writes an arduino.json with a number of saved controllers at TEST-NET
+addresses (192.0.2.0/24, guaranteed not to answer) into a temporary directory
+and starts the app from there. Startup must not wait on any of them: the
+window has to be painted within the budget no matter how many saved devices
+are offline.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.startup_benchmark --devices 50
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from ArduinoBackend.arduino_manager import ArduinoManager
+
+
+def write_saved_devices(directory: str, count: int) -> None:
+    devices = [
+        {
+            "name": f"Offline {i}",
+            "ip_address": f"192.0.2.{i % 254 + 1}",
+            "mac_address": f"02:00:00:00:{i // 256:02X}:{i % 256:02X}",
+            "status": True,
+            "last_command": "ledOn?r=50&g=50&b=50",
+            "single_led": [],
+        }
+        for i in range(count)
+    ]
+
+    with open(os.path.join(directory, "arduino.json"), "w", encoding="utf-8") as f:
+        json.dump(devices, f, ensure_ascii=False, indent=4)
+
+
+def time_manager() -> float:
+    start = time.perf_counter()
+    manager = ArduinoManager()
+    elapsed = time.perf_counter() - start
+
+    manager.close()
+    return elapsed
+
+
+def time_first_paint() -> float:
+    # Imported here so the manager part also runs where Tk has no display.
+    from GUI.window import NewWindow
+
+    start = time.perf_counter()
+    window = NewWindow("LED-Controller", 1100, 800)
+    window.update()
+    elapsed = time.perf_counter() - start
+
+    window._on_close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds")
+    parser.add_argument(
+        "--no-gui", action="store_true", help="only time ArduinoManager()"
+    )
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_saved_devices(directory, args.devices)
+        os.chdir(directory)
+
+        try:
+            results = {"ArduinoManager()": time_manager()}
+            if not args.no_gui:
+                results["first paint"] = time_first_paint()
+        finally:
+            os.chdir(cwd)
+
+    failed = False
+    for label, elapsed in results.items():
+        ok = elapsed <= args.budget
+        failed = failed or not ok
+        print(
+            f"{label:>17}: {elapsed * 1000:8.1f} ms  "
+            f"{'ok' if ok else 'over budget'} ({args.budget * 1000:.0f} ms)"
+        )
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
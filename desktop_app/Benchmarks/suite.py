@@ -0,0 +1,318 @@
+"""
+Run the benchmark suite and write the results as JSON for comparison.
+
+Covers network scans at several worker counts and timeouts; at 10/100/1000
+saved devices the end-to-end ArduinoManager.load_and_upate_from_file and,
+on their own, DeviceRegistry.merge of a scan result, journalling a field
+update for every device and _save_to_file; and end-to-end command latency
+through the CommandDispatcher. All devices are virtual controllers on
+loopback aliases (TestBench.virtual_esp), so runs are repeatable.
+
+With --compare, every timing is checked against an earlier result file and
+the run fails if one got slower by more than the tolerance, if fewer
+devices were found or online, or if more commands failed.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.suite --output results.json
+    python -m Benchmarks.suite --output new.json --compare results.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+from ArduinoBackend.arduino_manager import ArduinoManager
+from ArduinoBackend.command_dispatcher import CommandDispatcher
+from ArduinoBackend.device_client import DeviceClient
+from ArduinoBackend.device_registry import DeviceRegistry
+from ArduinoBackend.latency_stats import LatencyStats
+from ArduinoBackend.network_scanner import NetworkScanner
+from ArduinoBackend.pixel_sync import PixelSync
+from TestBench.virtual_esp import VirtualESPFleet
+
+# Metrics ending in one of these are timings: lower is better.
+TIMING_SUFFIXES = ("_s", "_ms")
+# Device counts: a run that finds fewer devices is worse, however fast.
+COUNT_METRICS = ("found", "online")
+# Any increase is worse.
+FAILURE_METRICS = ("failures",)
+
+
+def _median_time(function, repeat: int, setup=None) -> float:
+    """
+    Args:
+        function (Callable): The work to time; gets setup's result if given
+        repeat (int): Runs to take the median of
+        setup (Callable, optional): Untimed preparation before every run
+    """
+    timings = []
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def bench_scan(network: str, port: int, devices: int, repeat: int) -> dict:
+    fleet = VirtualESPFleet.on_aliases(devices, network, port)
+    fleet.start()
+    results = {}
+
+    try:
+        for engine, workers, timeout in (
+            ("asyncio", 100, 0.3),
+            ("asyncio", 100, 0.5),
+            ("threads", 25, 0.3),
+            ("threads", 100, 0.3),
+            ("threads", 100, 0.5),
+        ):
+            scanner = NetworkScanner(
+                timeout=timeout, max_workers=workers, engine=engine
+            )
+            found = []
+            seconds = _median_time(
+                lambda: found.append(len(scanner.scan_network(network, port))),
+                repeat,
+            )
+            results[f"scan/{engine}/workers={workers}/timeout={timeout}"] = {
+                "seconds_s": seconds,
+                "found": min(found),
+                "expected": devices,
+            }
+    finally:
+        fleet.stop()
+
+    return results
+
+
+def bench_manager(network: str, port: int, sizes: list[int], repeat: int) -> dict:
+    results = {}
+    cwd = os.getcwd()
+
+    for size in sizes:
+        fleet = VirtualESPFleet.on_aliases(size, network, port)
+        fleet.start()
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                fleet.write_arduino_json("arduino.json")
+                manager = ArduinoManager(network=network, port=port)
+
+                # End to end, including discovery, probes and the sweep.
+                load = _median_time(manager.load_and_upate_from_file, repeat)
+
+                # The merge alone: every stored device answers again, as
+                # fresh records the way a scan returns them.
+                merge = _median_time(
+                    lambda registry: registry.merge(fleet.arduinos()),
+                    max(repeat, 5),
+                    setup=lambda: DeviceRegistry(fleet.arduinos()),
+                )
+
+                # The store update alone: one journalled rename per device.
+                rename = _median_time(
+                    lambda: [
+                        manager.update_arduino(arduino, f"{arduino.name}!", "name")
+                        for arduino in manager.data
+                    ],
+                    max(repeat, 5),
+                )
+
+                save = _median_time(manager._save_to_file, max(repeat, 5))
+
+                results[f"manager/load_and_update/devices={size}"] = {
+                    "seconds_s": load,
+                    "online": sum(arduino.status for arduino in manager.data),
+                    "expected": size,
+                }
+                results[f"manager/merge/devices={size}"] = {
+                    "seconds_ms": merge * 1000,
+                }
+                results[f"manager/store_update/devices={size}"] = {
+                    "seconds_ms": rename * 1000,
+                }
+                results[f"manager/save_to_file/devices={size}"] = {
+                    "seconds_ms": save * 1000,
+                    "bytes": os.path.getsize("arduino.json"),
+                }
+
+                manager.close()
+        finally:
+            os.chdir(cwd)
+            fleet.stop()
+
+    return results
+
+
+def _round_trips(send, devices: list, count: int) -> dict:
+    """Send one command at a time and time it until its result arrives."""
+    stats = LatencyStats(window=count)
+    done = threading.Event()
+    outcomes = []
+
+    def on_result(outcome, device, command, detail) -> None:
+        outcomes.append(outcome)
+        done.set()
+
+    for number in range(count):
+        done.clear()
+        start = time.perf_counter()
+        send(devices[number % len(devices)], number, on_result)
+        done.wait()
+
+        if outcomes[-1] == CommandDispatcher.SENT:
+            stats.add(time.perf_counter() - start)
+        else:
+            stats.add_failure()
+
+    return stats.summary()
+
+
+def bench_commands(network: str, port: int, devices: int, count: int) -> dict:
+    fleet = VirtualESPFleet.on_aliases(devices, network, port)
+    fleet.start()
+    client = DeviceClient(latency_window=count)
+    dispatcher = CommandDispatcher(client)
+    sync = PixelSync(dispatcher)
+    arduinos = fleet.arduinos()
+
+    try:
+        return {
+            "commands/ledOn": _round_trips(
+                lambda device, number, on_result: dispatcher.send(
+                    device, f"ledOn?r={number % 256}&g=0&b=0", on_result=on_result
+                ),
+                arduinos,
+                count,
+            ),
+            "commands/frame": _round_trips(
+                lambda device, number, on_result: sync.send(
+                    device, [(number % 60, 255, 0, 0)], on_result
+                ),
+                arduinos,
+                count,
+            ),
+        }
+    finally:
+        dispatcher.close()
+        client.close()
+        fleet.stop()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns:
+        list: One line per timing that got slower than the tolerance allows,
+        per device count that dropped and per failure count that rose
+    """
+    regressions = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+            if before is None or value is None:
+                continue
+
+            if metric in COUNT_METRICS and value < before:
+                regressions.append(f"{name} {metric}: {before} -> {value}")
+            elif metric in FAILURE_METRICS and value > before:
+                regressions.append(f"{name} {metric}: {before} -> {value}")
+            elif (
+                metric.endswith(TIMING_SUFFIXES)
+                and before
+                and value > before * (1 + tolerance)
+            ):
+                regressions.append(
+                    f"{name} {metric}: {before:.4g} -> {value:.4g} "
+                    f"(+{value / before - 1:.0%})"
+                )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--network", default="127.0.8.0/22")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--scan-devices", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier result file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    results.update(bench_scan(args.network, args.port, args.scan_devices, args.repeat))
+    results.update(bench_manager(args.network, args.port, args.sizes, args.repeat))
+    results.update(bench_commands(args.network, args.port, 10, args.commands))
+
+    for name, metrics in results.items():
+        print(
+            f"{name:>48}: "
+            + "  ".join(
+                (
+                    f"{metric}={value:.4g}"
+                    if isinstance(value, float)
+                    else f"{metric}={value}"
+                )
+                for metric, value in metrics.items()
+            )
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "meta": {
+                    "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "commit": _git_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                },
+                "results": results,
+            },
+            f,
+            indent=4,
+        )
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}")
+
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
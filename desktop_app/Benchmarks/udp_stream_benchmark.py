@@ -0,0 +1,82 @@
+"""
+Measure realtime UDP frame streaming against the stand-in receiver.
+
+Streams a moving rainbow at the requested frame rate for a few seconds and
+prints the delivered fps, frame interval jitter and loss as seen by the
+receiver, for each strip length.
+
+Run from the desktop_app directory:
+    python -m Benchmarks.udp_stream_benchmark --fps 30 60 --leds 60 300 1000
+"""
+
+import argparse
+import colorsys
+
+from ArduinoBackend.frame_streamer import FrameStreamer
+from TestBench.udp_frame_receiver import UDPFrameReceiver
+
+
+def rainbow(leds: int):
+    def frame(number: int) -> bytes:
+        rgb = bytearray()
+        for index in range(leds):
+            hue = (index / leds + number / 120) % 1.0
+            rgb += bytes(int(c * 255) for c in colorsys.hsv_to_rgb(hue, 1.0, 1.0))
+        return bytes(rgb)
+
+    return frame
+
+
+def run(fps_values: list[float], leds_values: list[int], duration: float, port: int):
+    results = []
+
+    for leds in leds_values:
+        # Frames are rendered up front so the measurement is the transport.
+        render = rainbow(leds)
+        frames = [render(number) for number in range(120)]
+
+        for fps in fps_values:
+            receiver = UDPFrameReceiver("127.0.0.1", port, leds)
+            receiver.start()
+            streamer = FrameStreamer("127.0.0.1", port, fps=fps)
+
+            try:
+                streamer.run(lambda number: frames[number % len(frames)], duration)
+            finally:
+                streamer.close()
+                receiver.stop()
+
+            stats = receiver.stats()
+            stats.update(
+                leds=leds,
+                target_fps=fps,
+                packets_per_frame=len(streamer.packets(frames[0], 0)),
+                skipped=streamer.frames_skipped,
+            )
+            results.append(stats)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fps", type=float, nargs="+", default=[30, 60])
+    parser.add_argument("--leds", type=int, nargs="+", default=[60, 300, 1000])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=FrameStreamer.PORT)
+    args = parser.parse_args()
+
+    for result in run(args.fps, args.leds, args.duration, args.port):
+        print(
+            f"{result['leds']:>5} LEDs @ {result['target_fps']:>3.0f} fps: "
+            f"{result['packets_per_frame']} pkt/frame  "
+            f"delivered {result['fps']:6.2f} fps  "
+            f"jitter {result['jitter_ms']:5.2f} ms "
+            f"(max {result['max_deviation_ms']:5.2f})  "
+            f"lost {result['lost']} ({result['loss']:.1%})  "
+            f"late {result['late']}  skipped {result['skipped']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,36 @@
-import random
+import threading
+
 import customtkinter as ctk
 
+from ArduinoBackend.animation_engine import AnimationEngine, EffectSettings
+from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.device_info import shared_device_info_cache
+from ArduinoBackend.frame_cache import shared_frame_cache
+from ArduinoBackend.frame_clock import FrameClock
 from GUI.AnimationTab.animation_canvas import AnimationCanvas
 from GUI.AnimationTab.animation_display import AnimationDisplay
 from GUI.ColorTab.color_tab import ColorTab
+from GUI.Menus.options_menu import OptionsMenu
 
 
 class AnimationTab(ctk.CTkFrame):
     _PADX = 10
     _PADY = 10
-
-    def __init__(self, master, color_tab: ColorTab, *args, **kwargs) -> None:
+    # NUM_LEDS of the firmware, shown while no device is selected.
+    _DEFAULT_LED_COUNT = 60
+
+    def __init__(
+        self,
+        master,
+        color_tab: ColorTab,
+        options_menu: OptionsMenu | None = None,
+        *args,
+        **kwargs,
+    ) -> None:
         super().__init__(master=master, *args, **kwargs)
         self._color_tab = color_tab
+        self._options_menu = options_menu
+        self._size_request = 0
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure((0, 1), weight=1)
@@ -40,294 +58,116 @@ class AnimationTab(ctk.CTkFrame):
         self._rgb = self._color_tab.color_picker_rgb.rgb
         self._delay = self.animation_display.animation_delay_slider_value
 
-    def _convert_rgb_to_hex(self, rgb) -> str:
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-
-    def _rainbow(self) -> None:
-        self._animation = "rainbow"
-        self.create_command()
-        colors = [
-            (255, 0, 0),  # Red
-            (255, 127, 0),  # Orange
-            (255, 255, 0),  # Yellow
-            (0, 255, 0),  # Green
-            (0, 0, 255),  # Blue
-            (75, 0, 130),  # Indigo
-            (139, 0, 255),  # Violet
-        ]
-        index = 0
-
-        def animation() -> None:
-            nonlocal index
-            if not self._led_display._is_animation_running:
-                return
-
-            brightness = self._animation_display.brightness_slider_value
-
-            for i, led in enumerate(self._led_display.leds):
-                color_idx = (index + i) % len(colors)
-                r = max(0, min(int(colors[color_idx][0] * brightness / 255), 255))
-                g = max(0, min(int(colors[color_idx][1] * brightness / 255), 255))
-                b = max(0, min(int(colors[color_idx][2] * brightness / 255), 255))
-
-                hex_color = self._convert_rgb_to_hex((r, g, b))
-                led.configure(fg_color=hex_color)
-
-            index = (index + 1) % len(colors)
-            if self._led_display.winfo_exists():
-                self._led_display.set_animation_task(
-                    self.after(
-                        int(self._animation_display.animation_delay_slider_value),
-                        animation,
-                    )
-                )
-
-        self._led_display.start_animation(animation_function=animation)
+    def update_led_count(self) -> None:
+        """Size the preview like the strip of the selected device."""
+        # Same as the LED tab: cached counts apply right away, others are
+        # fetched off the Tk thread and answers for an old selection dropped.
+        self._size_request += 1
+        request = self._size_request
+        arduino = self._get_selected_arduino()
+
+        if arduino is None:
+            self._set_led_count(request, AnimationTab._DEFAULT_LED_COUNT)
+            return
+
+        info = shared_device_info_cache().cached(arduino)
+        if info is not None:
+            self._set_led_count(request, info["leds"])
+            return
+
+        threading.Thread(
+            target=lambda: self.after(
+                0, self._set_led_count, request, self._request_led_count(arduino)
+            ),
+            daemon=True,
+        ).start()
+
+    def _set_led_count(self, request: int, led_count: int) -> None:
+        if request != self._size_request or not self.winfo_exists():
+            return
+        if led_count == self._led_display.led_count:
+            return
+
+        self._led_display.set_led_count(led_count)
+
+        # A running preview starts over at the new length.
+        if self._animation is not None and self._led_display.is_animation_running:
+            self._run_effect(self._animation)
+
+    def _get_selected_arduino(self) -> Arduino | None:
+        if self._options_menu is None:
+            return None
+        if not self._options_menu.get() in self._options_menu.device_map:
+            return None
+
+        return self._options_menu.device_map[self._options_menu.get()]
+
+    def _request_led_count(self, arduino: Arduino) -> int:
+        info = shared_device_info_cache().get(arduino)
+
+        return AnimationTab._DEFAULT_LED_COUNT if info is None else info["leds"]
+
+    def _effect_settings(self) -> EffectSettings:
+        return EffectSettings(
+            self._color_tab.color_picker_rgb.rgb,
+            self._animation_display.brightness_slider_value,
+        )
 
-    def _pulsing_light(self) -> None:
-        self._animation = "pulse"
+    def _run_effect(self, effect: str) -> None:
+        self._animation = effect
         self.create_command()
 
-        base_r, base_g, base_b = self._color_tab.color_picker_rgb.rgb
-        max_brightness = self._animation_display.brightness_slider_value
-
-        min_brightness = 50
-        step = 20
-
-        if max_brightness < min_brightness:
-            max_brightness = min_brightness
-
-        up_levels = list(range(min_brightness, int(max_brightness), step))
-        down_levels = list(range(int(max_brightness), min_brightness, -step))
-
-        if not up_levels:
-            up_levels = [min_brightness]
-        if not down_levels or down_levels == up_levels:
-            down_levels = []
-
-        brightness_levels = up_levels + down_levels
-
-        color_values = []
-        for brightness in brightness_levels:
-            # Scale RGB values according to their base values and current brightness
-            r = min(255, int(base_r * brightness / 255))
-            g = min(255, int(base_g * brightness / 255))
-            b = min(255, int(base_b * brightness / 255))
-            color_values.append(self._convert_rgb_to_hex((r, g, b)))
+        engine = AnimationEngine(
+            effect,
+            self._led_display.led_count,
+            self._effect_settings(),
+            self._animation_display.animation_delay_slider_value,
+            cache=shared_frame_cache(),
+        )
 
-        if not color_values:
-            color_values = [self._convert_rgb_to_hex((0, 0, 0))]
+        def show_frame(frame: int, skipped: int) -> None:
+            # Picked up live, like the sliders' effect on the device.
+            engine.settings.rgb = self._color_tab.color_picker_rgb.rgb
+            engine.settings.brightness = self._animation_display.brightness_slider_value
+            engine.delay_ms = self._animation_display.animation_delay_slider_value
+            engine.skip(skipped)
+            self._led_display.set_frame(engine.next_hex_frame())
 
-        index = 0
+        clock = FrameClock(engine.delay_ms / 1000, show_frame)
 
         def animation() -> None:
-            nonlocal index
-
-            if not self._led_display._is_animation_running:
+            if not self._led_display.is_animation_running:
                 return
 
-            if color_values and index < len(color_values):
-                current_color = color_values[index]
-                for led in self._led_display.leds:
-                    if led.winfo_exists():
-                        led.configure(fg_color=current_color)
-
-            index = (index + 1) % len(color_values)
+            clock.period = self._animation_display.animation_delay_slider_value / 1000
+            wait = clock.tick()
 
+            # One after() handle drives the clock; it wakes up for the next
+            # frame on the wall clock rather than a delay after this one.
             if self._led_display.winfo_exists():
                 self._led_display.set_animation_task(
-                    self.after(
-                        int(self._animation_display.animation_delay_slider_value),
-                        animation,
-                    )
+                    self.after(max(1, round(wait * 1000)), animation)
                 )
 
         self._led_display.start_animation(animation)
 
-    def _chaising_light(self) -> None:
-        self._animation = "chasing"
-        self.create_command()
-        index = 0
-
-        def animation() -> None:
-            nonlocal index
-            if not self._led_display._is_animation_running:
-                return
-
-            self._led_display._reset_LEDs()
-            if self._led_display.leds[index].winfo_exists():
-                self._led_display.leds[index].configure(
-                    fg_color=self._convert_rgb_to_hex(
-                        self._color_tab.color_picker_rgb.rgb
-                    )
-                )
+    def _rainbow(self) -> None:
+        self._run_effect("rainbow")
 
-            index = (index + 1) % len(self._led_display.leds)
-            if self._led_display.winfo_exists():
-                self._led_display.set_animation_task(
-                    self.after(
-                        int(self._animation_display.animation_delay_slider_value),
-                        animation,
-                    )
-                )
+    def _pulsing_light(self) -> None:
+        self._run_effect("pulse")
 
-        self._led_display.start_animation(animation)
+    def _chaising_light(self) -> None:
+        self._run_effect("chasing")
 
     def _strobe(self) -> None:
-        self._animation = "strobe"
-        self.create_command()
-        colors = [
-            self._convert_rgb_to_hex(self._color_tab.color_picker_rgb.rgb),
-            "#000000",
-        ]
-        index = 0
-
-        def animation() -> None:
-            nonlocal index
-
-            if not self._led_display._is_animation_running:
-                return
-
-            self._led_display._reset_LEDs()
-
-            colors[0] = self._convert_rgb_to_hex(self._color_tab.color_picker_rgb.rgb)
-
-            for led in self._led_display.leds:
-                if led.winfo_exists():
-                    led.configure(fg_color=colors[index])
-
-            index = 1 - index
-
-            if self._led_display.winfo_exists():
-                self._led_display.set_animation_task(
-                    self.after(
-                        int(self._animation_display.animation_delay_slider_value),
-                        animation,
-                    )
-                )
-
-        self._led_display.start_animation(animation)
+        self._run_effect("strobe")
 
     def _raindrop(self) -> None:
-        self._animation = "raindrop"
-        self.create_command()
-
-        def animation() -> None:
-            if not self._led_display._is_animation_running:
-                return
-
-            self._led_display._reset_LEDs()
-            led = random.choice(self._led_display.leds)
-            if led.winfo_exists():
-                led.configure(
-                    fg_color=self._convert_rgb_to_hex(
-                        self._color_tab.color_picker_rgb.rgb
-                    )
-                )
-
-            if self.winfo_exists():
-                self.after(
-                    int(self._animation_display.animation_delay_slider_value) + 200,
-                    lambda led=led: (
-                        led.configure(fg_color="black") if led.winfo_exists() else None
-                    ),
-                )
-            if self._led_display.winfo_exists():
-                self._led_display.set_animation_task(
-                    self.after(random.randint(100, 500), animation)
-                )
-
-        self._led_display.start_animation(animation)
+        self._run_effect("raindrop")
 
     def _fireplace(self) -> None:
-        self._animation = "fireplace"
-        self.create_command()
-
-        def animate() -> None:
-            if not self._led_display._is_animation_running or not self.winfo_exists():
-                return
-
-            try:
-                num_active_leds = max(1, int(len(self._led_display.leds) * 0.3))
-
-                if not hasattr(self._led_display, "leds") or not self._led_display.leds:
-                    return
-
-                valid_leds = [
-                    led
-                    for led in self._led_display.leds
-                    if hasattr(led, "winfo_exists")
-                    and led.winfo_exists()
-                    and led.winfo_ismapped()
-                ]
-
-                if not valid_leds:
-                    return
-
-                active_leds = random.sample(
-                    valid_leds, min(num_active_leds, len(valid_leds))
-                )
-
-                base_color = self._color_tab.color_picker_rgb.rgb
-                base_time = max(1, self._animation_display.animation_delay_slider_value)
-                colors = self._generate_similar_colors(base_color, 8)
-
-                for led in active_leds:
-                    if (
-                        hasattr(led, "winfo_exists")
-                        and led.winfo_exists()
-                        and led.winfo_ismapped()
-                    ):
-                        led.configure(fg_color=random.choice(colors))
-
-                        base_time = max(
-                            1, self._animation_display.animation_delay_slider_value
-                        )
-                        min_time = max(1, int(base_time * 0.5))
-                        max_time = max(min_time + 1, int(base_time * 1.2))
-
-                        flicker_time = random.randint(min_time, max_time)
-
-                        r, g, b = base_color
-                        dimmed_color = self._convert_rgb_to_hex(
-                            (max(0, r // 3), max(0, g // 3), max(0, b // 3))
-                        )
-
-                        def safe_flicker(target_led=led, color=dimmed_color) -> None:
-                            if (
-                                hasattr(self, "winfo_exists")
-                                and self.winfo_exists()
-                                and hasattr(target_led, "winfo_exists")
-                                and target_led.winfo_exists()
-                            ):
-                                try:
-                                    target_led.configure(
-                                        fg_color=random.choice([color, "black"])
-                                    )
-                                except Exception:
-                                    pass
-
-                        if hasattr(self, "winfo_exists") and self.winfo_exists():
-                            self.after(flicker_time, safe_flicker)
-
-                next_frame_time = random.randint(30, max(31, int(base_time * 0.8)))
-
-                if (
-                    hasattr(self._led_display, "winfo_exists")
-                    and self._led_display.winfo_exists()
-                ):
-                    try:
-                        animation_task = self.after(next_frame_time, animate)
-                        self._led_display.set_animation_task(animation_task)
-                    except Exception:
-                        pass
-
-            except Exception as e:
-                print(f"Animation error: {e}")
-                if hasattr(self._led_display, "_is_animation_running"):
-                    self._led_display._is_animation_running = False
-
-        self._led_display.start_animation(animate)
+        self._run_effect("fireplace")
 
     def cleanup_animations(self) -> None:
         """Safely clean up any running animations before destroying widgets"""
@@ -345,22 +185,6 @@ class AnimationTab(ctk.CTkFrame):
                 except Exception:
                     pass
 
-    def _generate_similar_colors(self, base_color: tuple, num_colors: int = 4) -> None:
-        """Generate similar colors for effects"""
-        r, g, b = base_color
-        colors = [self._convert_rgb_to_hex(base_color)]
-
-        step = 255 // num_colors
-
-        for i in range(-num_colors // 2, num_colors // 2 + 1):
-            new_r = max(0, min(255, r + i * step))
-            new_g = max(0, min(255, g + i * step))
-            new_b = max(0, min(255, b + i * step))
-
-            colors.append(self._convert_rgb_to_hex((new_r, new_g, new_b)))
-
-        return colors
-
     def create_command(self) -> None:
         if self._animation is None:
             return ""
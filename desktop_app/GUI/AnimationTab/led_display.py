@@ -1,50 +1,236 @@
-from typing import Callable
+import math
+import tkinter as tk
+from typing import Callable, Iterable
 import customtkinter as ctk
+import numpy as np
 
 
 class LEDDisplay(ctk.CTkFrame):
-    def __init__(self, master, *args, **kwargs) -> None:
+    """
+    Preview strip drawn as ovals on a single canvas.
+
+    Animations hand over whole frames with set_frame(); only LEDs whose color
+    changed are touched, and all of them in one Tcl call, so a frame costs one
+    round trip into Tk instead of one CTkFrame redraw per LED.
+
+    When the strip has more LEDs than fit on the canvas, every oval stands
+    for a group of neighbouring LEDs and shows the brightest of them, so a
+    single lit LED (chasing, raindrop) stays visible.
+    """
+
+    _OFF = "#000000"
+    _BORDER = "black"
+    _MAX_DIAMETER = 35
+    _MIN_CELL = 6
+    _GAP = 4
+
+    def __init__(self, master, led_count: int = 60, *args, **kwargs) -> None:
         super().__init__(master, *args, **kwargs)
-        self._leds = []
         self._is_animation_running = False
         self._animation_task = None
+        self._led_count = 0
+        self._group = 1
+        self._frame = None
+        self._items: list[int] = []
+        self._colors: list[str] = []
 
         self.grid_rowconfigure(0, weight=1)
-        self.grid_columnconfigure(
-            (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
-            weight=1,
+        self.grid_columnconfigure(0, weight=1)
+
+        self._canvas = tk.Canvas(
+            self,
+            background=self._apply_appearance_mode(self.cget("fg_color")),
+            highlightthickness=0,
+            height=LEDDisplay._MAX_DIAMETER + 2 * LEDDisplay._GAP,
         )
+        self._canvas.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
+        self._canvas.bind("<Configure>", lambda event: self._layout())
+
+        self.set_led_count(led_count)
+
+    def set_led_count(self, led_count: int) -> None:
+        """Show a strip with a different number of LEDs, all off."""
+        self._led_count = max(0, led_count)
+        self._frame = None
+        self._layout(rebuild=True)
+
+    def _canvas_size(self) -> tuple[int, int]:
+        width = self._canvas.winfo_width()
+        height = self._canvas.winfo_height()
+
+        # Not mapped yet; plan with the size the canvas asks for.
+        if width <= 1 or height <= 1:
+            width = self._canvas.winfo_reqwidth()
+            height = self._canvas.winfo_reqheight()
+
+        return max(1, width), max(1, height)
+
+    def _layout(self, rebuild: bool = False) -> None:
+        width, height = self._canvas_size()
+
+        capacity = max(
+            1, (width // LEDDisplay._MIN_CELL) * (height // LEDDisplay._MIN_CELL)
+        )
+        group = max(1, math.ceil(self._led_count / capacity))
+
+        if rebuild or group != self._group:
+            self._group = group
+            self._canvas.delete("led")
+            self._items = [
+                self._canvas.create_oval(
+                    0,
+                    0,
+                    0,
+                    0,
+                    fill=LEDDisplay._OFF,
+                    outline=LEDDisplay._BORDER,
+                    tags="led",
+                )
+                for _ in range(math.ceil(self._led_count / group))
+            ]
+            self._colors = [LEDDisplay._OFF] * len(self._items)
+
+            if self._frame is not None:
+                self.set_frame(self._frame)
+
+        count = len(self._items)
+        if count == 0:
+            return
+
+        # As many columns as keep the LEDs round and large enough to fill
+        # the canvas, but never bigger than the old frame LEDs.
+        columns = max(1, min(count, math.ceil(math.sqrt(count * width / height))))
+        rows = math.ceil(count / columns)
+        cell = min(width / columns, height / rows, LEDDisplay._MAX_DIAMETER + 6)
+        diameter = max(2, cell - LEDDisplay._GAP)
+        left = (width - columns * cell) / 2
+        top = (height - rows * cell) / 2
+        outline = 0 if diameter < 12 else max(1, int(diameter / 9))
+
+        for index, item in enumerate(self._items):
+            row, column = divmod(index, columns)
+            x = left + column * cell + (cell - diameter) / 2
+            y = top + row * cell + (cell - diameter) / 2
+            self._canvas.coords(item, x, y, x + diameter, y + diameter)
+            self._canvas.itemconfigure(item, width=outline)
+
+    @staticmethod
+    def _to_hex(color) -> str:
+        if isinstance(color, str):
+            return color
+
+        r, g, b = color
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def _aggregate(self, colors) -> list[str]:
+        if isinstance(colors, np.ndarray):
+            frame = colors[: self._led_count].astype(np.uint8)
+        else:
+            packed = np.array(
+                [
+                    (
+                        int(color[1:], 16)
+                        if isinstance(color, str)
+                        else (color[0] << 16) | (color[1] << 8) | color[2]
+                    )
+                    for color in list(colors)[: self._led_count]
+                ],
+                dtype=np.uint32,
+            ).reshape(-1, 1)
+            frame = ((packed >> np.array([16, 8, 0], np.uint32)) & 255).astype(np.uint8)
 
-        for i in range(10):
-            led = ctk.CTkFrame(
-                self,
-                border_color="black",
-                fg_color="black",
-                border_width=4,
-                width=35,
-                height=35,
-                corner_radius=30,
-            )
-            led.grid(row=0, column=i)
-            self._leds.append(led)
+        padding = len(self._items) * self._group - len(frame)
+        if padding:
+            frame = np.vstack([frame, np.zeros((padding, 3), dtype=np.uint8)])
+
+        groups = frame.reshape(len(self._items), self._group, 3)
+        brightest = groups.sum(axis=2, dtype=np.uint16).argmax(axis=1)
+        shown = groups[np.arange(len(self._items)), brightest].astype(np.uint32)
+
+        packed = shown @ np.array([1 << 16, 1 << 8, 1], np.uint32)
+        return [f"#{color:06x}" for color in packed.tolist()]
+
+    def set_frame(self, colors: Iterable) -> None:
+        """
+        Show a whole frame at once.
+
+        Args:
+            colors (Iterable): One color per LED, as "#rrggbb" or (r, g, b),
+                or an AnimationEngine frame; a shorter frame leaves the
+                remaining LEDs as they are, or off when LEDs are grouped
+        """
+        # Kept for redrawing after a resize, so an iterator must not be used
+        # up by the drawing below.
+        if not isinstance(colors, np.ndarray):
+            colors = list(colors)
+        self._frame = colors
+
+        if self._group > 1:
+            colors = self._aggregate(colors)
+        elif isinstance(colors, np.ndarray):
+            colors = colors.tolist()
+
+        canvas = str(self._canvas)
+        script = []
+
+        for index, color in enumerate(colors):
+            if index >= len(self._items):
+                break
+
+            color = self._to_hex(color)
+            if color == self._colors[index]:
+                continue
+
+            self._colors[index] = color
+            script.append(f"{canvas} itemconfigure {self._items[index]} -fill {color}")
+
+        if script:
+            self._canvas.tk.eval("\n".join(script))
+
+    def set_led(self, index: int, color) -> None:
+        if not 0 <= index < self._led_count:
+            return
+
+        # With grouped LEDs this sets the whole oval the LED belongs to.
+        index //= self._group
+
+        color = self._to_hex(color)
+        if color != self._colors[index]:
+            self._colors[index] = color
+            self._canvas.itemconfigure(self._items[index], fill=color)
+
+    def fill(self, color) -> None:
+        self.set_frame([color] * self._led_count)
+
+    def clear(self) -> None:
+        self.fill(LEDDisplay._OFF)
 
     def start_animation(self, animation_function: Callable) -> None:
         self._is_animation_running = False
 
         if self._animation_task:
             self.after_cancel(self._animation_task)
-        self._reset_LEDs()
+        self.clear()
         self._is_animation_running = True
         animation_function()
 
-    def _reset_LEDs(self) -> None:
-        for led in self._leds:
-            if led.winfo_exists() and led.winfo_ismapped():
-                led.configure(True, fg_color="black")
+    @property
+    def led_count(self) -> int:
+        return self._led_count
+
+    @property
+    def leds_per_oval(self) -> int:
+        """How many LEDs one oval stands for; 1 unless the strip is grouped."""
+        return self._group
+
+    @property
+    def colors(self) -> list[str]:
+        """The color every oval currently shows, as "#rrggbb"."""
+        return list(self._colors)
 
     @property
-    def leds(self) -> list:
-        return self._leds
+    def is_animation_running(self) -> bool:
+        return self._is_animation_running
 
     def set_animation_task(self, value) -> None:
         self._animation_task = value
@@ -1,19 +1,26 @@
 import customtkinter as ctk
 
+from ArduinoBackend.command_throttle import CommandThrottle
 from GUI.CSButton.cs_button import CSButton
+from GUI.Menus.options_menu import OptionsMenu
 
 
 class ColorPickerRGB(ctk.CTkFrame):
     _FONT = ("Inter", 16, "bold")
     _PADX = 10
+    _LIVE_RATE = 30.0  # updates per second while dragging in live mode
 
-    def __init__(self, master, *args, **kwargs) -> None:
+    def __init__(
+        self, master, options_menu: OptionsMenu | None = None, *args, **kwargs
+    ) -> None:
         super().__init__(
             master=master, border_color="black", border_width=4, *args, **kwargs
         )
         self.grid_rowconfigure((0, 1), weight=1)
         self.grid_columnconfigure(0, weight=1)
         self._master = master
+        self._options_menu = options_menu
+        self._live_throttle = None
 
         self._slider_frame = ctk.CTkFrame(
             self,
@@ -198,6 +205,19 @@ class ColorPickerRGB(ctk.CTkFrame):
             row=4, column=2, padx=ColorPickerRGB._PADX, pady=10, sticky="w"
         )
 
+        # Live mode needs to know the selected device, so it is only offered
+        # where the picker was given the options menu.
+        if self._options_menu is not None:
+            self._live_switch = ctk.CTkSwitch(
+                self._slider_frame,
+                text="Live",
+                font=ColorPickerRGB._FONT,
+                command=self._toggle_live,
+            )
+            self._live_switch.grid(
+                row=5, column=0, padx=ColorPickerRGB._PADX, pady=10, columnspan=3
+            )
+
         self._set_rgb()
         self._update_entry_text(self._rgb)
 
@@ -309,6 +329,29 @@ class ColorPickerRGB(ctk.CTkFrame):
 
     def update_command(self, rgb: tuple[int, int, int]) -> None:
         self._master.command = f"ledOn?r={rgb[0]}&g={rgb[1]}&b={rgb[2]}"
+        self._stream(self._master.command)
+
+    def _toggle_live(self) -> None:
+        if self._live_switch.get():
+            if self._live_throttle is None:
+                self._live_throttle = CommandThrottle(ColorPickerRGB._LIVE_RATE)
+
+            self._stream(self._master.command)
+
+    def _stream(self, command: str) -> None:
+        if self._live_throttle is None or not self._live_switch.get():
+            return
+
+        # The animation tab drives this picker's brightness while it is hidden.
+        if not self.winfo_ismapped():
+            return
+
+        if not self._options_menu.get() in self._options_menu.device_map:
+            return
+
+        # Only the newest color per interval goes out, from a worker thread.
+        arduino = self._options_menu.device_map[self._options_menu.get()]
+        self._live_throttle.push(arduino, command)
 
     @property
     def rgb(self) -> tuple[int, int, int]:
@@ -2,16 +2,19 @@ import customtkinter as ctk
 
 from GUI.ColorTab.color_picker_rgb import ColorPickerRGB
 from GUI.ColorTab.color_picker_hex import ColorPickerHex
+from GUI.Menus.options_menu import OptionsMenu
 
 
 class ColorTab(ctk.CTkFrame):
-    def __init__(self, master, *args, **kwargs) -> None:
+    def __init__(
+        self, master, options_menu: OptionsMenu | None = None, *args, **kwargs
+    ) -> None:
         super().__init__(master=master, *args, **kwargs)
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure((0, 1), weight=1)
 
-        self._color_picker_rgb = ColorPickerRGB(self)
+        self._color_picker_rgb = ColorPickerRGB(self, options_menu)
         self._color_picker_rgb.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
 
         self._color_picker_hex = ColorPickerHex(self)
@@ -54,143 +54,170 @@ class DeviceTab(ctk.CTkFrame):
         self.bind("<MouseWheel>", self._on_mousewheel)
         self._content_frame.bind("<Configure>", self._on_frame_configure)
 
-        self._scan_button = CSButton(self, "scan", self.update_with_load)
+        # Opening the tab only refreshes; the button also sweeps the hosts
+        # that did not answer discovery.
+        self._scan_button = CSButton(
+            self, "scan", lambda: self.update_with_load(full_sweep=True)
+        )
         self._scan_button.grid(row=1, sticky="ew", padx=10, pady=10)
 
-    def update_with_load(self) -> None:
-        self._canvas_frame.grid_forget()
-        self._loading_frame.grid(row=0, sticky="nsew", padx=10, pady=10)
-        self._loading_frame.start_process()
+        self.arduino_manager.start_status_refresher(
+            on_change=lambda changed: self.after(0, self._on_status_change)
+        )
 
-    def add_content(self) -> None:
+    def _on_status_change(self) -> None:
+        if self._loading_frame.is_loading:
+            return
+
+        self.add_content()
+        self._options_menu.update_options()
+
+    def update_with_load(self, full_sweep: bool = False) -> None:
+        if self._loading_frame.is_loading:
+            return
+
+        # Devices are added one by one while the scan runs, so the list stays
+        # visible and the progress takes the place of the scan button.
+        self.clear_content()
+        self.grid_canvas_frame()
+        self._scan_button.grid_forget()
+        self._loading_frame.grid(row=1, sticky="ew", padx=10, pady=10)
+        self._loading_frame.start_process(full_sweep)
+
+    def scan_completed(self) -> None:
+        self._loading_frame.grid_forget()
+        self._scan_button.grid(row=1, sticky="ew", padx=10, pady=10)
+        self.add_content()
+
+    def clear_content(self) -> None:
         for widget in self._content_frame.winfo_children():
             if widget.winfo_exists():
                 widget.destroy()
 
+    def add_content(self) -> None:
+        self.clear_content()
+
         for arduino in self._options_menu.arduino_manager.data:
-            arduino_dict = arduino.to_dict()
-
-            arduino_frame = ctk.CTkFrame(
-                self._content_frame,
-                fg_color="gray18",
-                corner_radius=15,
-                height=200,
-                border_color="black",
-                border_width=4,
-            )
-            arduino_frame.grid_rowconfigure(0, weight=1, minsize=200)
-            arduino_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
-            arduino_frame.pack(
-                fill="x", expand=True, padx=DeviceTab._PADX, pady=DeviceTab._PADY
-            )
-
-            name_frame = ctk.CTkFrame(
-                arduino_frame, fg_color=arduino_frame.cget("fg_color")
-            )
-            name_frame.grid_rowconfigure(0, weight=1)
-            name_frame.grid_columnconfigure((0, 1), weight=1)
-            name_frame.grid(
-                row=0,
-                column=0,
-                sticky="nsew",
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
-
-            name_label = ctk.CTkLabel(
-                name_frame,
-                text=arduino_dict["name"],
-                font=("Inter", 20, "bold"),
-            )
-            name_label.grid(row=0, column=0, padx=DeviceTab._PADX, pady=DeviceTab._PADY)
-
-            edit_button = CSButton(
-                name_frame,
-                text="rename",
-                command=lambda arduino=arduino, label=name_label: self._edit_name(
-                    arduino, label
-                ),
-            )
-            edit_button.grid(
-                row=0, column=1, padx=DeviceTab._PADX, pady=DeviceTab._PADY
-            )
-
-            ip_frame = ctk.CTkFrame(
-                arduino_frame, fg_color=arduino_frame.cget("fg_color")
-            )
-            ip_frame.grid(
-                row=0,
-                column=1,
-                sticky="nsew",
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
-
-            ip_label = ctk.CTkLabel(
-                ip_frame, text=arduino_dict["ip_address"], font=("Inter", 20, "bold")
-            )
-            ip_label.pack(
-                fill="both", expand=True, padx=DeviceTab._PADX, pady=DeviceTab._PADY
-            )
-
-            mac_frame = ctk.CTkFrame(
-                arduino_frame, fg_color=arduino_frame.cget("fg_color")
-            )
-            mac_frame.grid(
-                row=0,
-                column=2,
-                sticky="nsew",
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
-
-            mac_label = ctk.CTkLabel(
-                mac_frame,
-                text=arduino_dict["mac_address"],
-                font=("Inter", 20, "bold"),
-            )
-            mac_label.pack(fill="both", expand=True)
-
-            status_frame = ctk.CTkFrame(
-                arduino_frame, fg_color=arduino_frame.cget("fg_color")
-            )
-            status_frame.grid_rowconfigure(0, weight=1)
-            status_frame.grid_columnconfigure((0, 1), weight=1)
-            status_frame.grid(
-                row=0,
-                column=3,
-                sticky="nsew",
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
-
-            status_label = ctk.CTkLabel(
-                status_frame,
-                text="Online" if arduino_dict["status"] else "Offline",
-                font=("Inter", 20, "bold"),
-            )
-            status_label.grid(
-                row=0,
-                column=0,
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
-
-            status_display = ctk.CTkFrame(
-                status_frame,
-                fg_color="green" if arduino_dict["status"] else "red",
-                corner_radius=15,
-                border_color="black",
-                border_width=4,
-                width=50,
-                height=50,
-            )
-            status_display.grid(
-                row=0,
-                column=1,
-                padx=DeviceTab._PADX,
-                pady=DeviceTab._PADY,
-            )
+            self.add_device(arduino)
+
+    def add_device(self, arduino: Arduino) -> None:
+        arduino_dict = arduino.to_dict()
+
+        arduino_frame = ctk.CTkFrame(
+            self._content_frame,
+            fg_color="gray18",
+            corner_radius=15,
+            height=200,
+            border_color="black",
+            border_width=4,
+        )
+        arduino_frame.grid_rowconfigure(0, weight=1, minsize=200)
+        arduino_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
+        arduino_frame.pack(
+            fill="x", expand=True, padx=DeviceTab._PADX, pady=DeviceTab._PADY
+        )
+
+        name_frame = ctk.CTkFrame(
+            arduino_frame, fg_color=arduino_frame.cget("fg_color")
+        )
+        name_frame.grid_rowconfigure(0, weight=1)
+        name_frame.grid_columnconfigure((0, 1), weight=1)
+        name_frame.grid(
+            row=0,
+            column=0,
+            sticky="nsew",
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
+
+        name_label = ctk.CTkLabel(
+            name_frame,
+            text=arduino_dict["name"],
+            font=("Inter", 20, "bold"),
+        )
+        name_label.grid(row=0, column=0, padx=DeviceTab._PADX, pady=DeviceTab._PADY)
+
+        edit_button = CSButton(
+            name_frame,
+            text="rename",
+            command=lambda arduino=arduino, label=name_label: self._edit_name(
+                arduino, label
+            ),
+        )
+        edit_button.grid(row=0, column=1, padx=DeviceTab._PADX, pady=DeviceTab._PADY)
+
+        ip_frame = ctk.CTkFrame(arduino_frame, fg_color=arduino_frame.cget("fg_color"))
+        ip_frame.grid(
+            row=0,
+            column=1,
+            sticky="nsew",
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
+
+        ip_label = ctk.CTkLabel(
+            ip_frame, text=arduino_dict["ip_address"], font=("Inter", 20, "bold")
+        )
+        ip_label.pack(
+            fill="both", expand=True, padx=DeviceTab._PADX, pady=DeviceTab._PADY
+        )
+
+        mac_frame = ctk.CTkFrame(arduino_frame, fg_color=arduino_frame.cget("fg_color"))
+        mac_frame.grid(
+            row=0,
+            column=2,
+            sticky="nsew",
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
+
+        mac_label = ctk.CTkLabel(
+            mac_frame,
+            text=arduino_dict["mac_address"],
+            font=("Inter", 20, "bold"),
+        )
+        mac_label.pack(fill="both", expand=True)
+
+        status_frame = ctk.CTkFrame(
+            arduino_frame, fg_color=arduino_frame.cget("fg_color")
+        )
+        status_frame.grid_rowconfigure(0, weight=1)
+        status_frame.grid_columnconfigure((0, 1), weight=1)
+        status_frame.grid(
+            row=0,
+            column=3,
+            sticky="nsew",
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
+
+        status_label = ctk.CTkLabel(
+            status_frame,
+            text="Online" if arduino_dict["status"] else "Offline",
+            font=("Inter", 20, "bold"),
+        )
+        status_label.grid(
+            row=0,
+            column=0,
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
+
+        status_display = ctk.CTkFrame(
+            status_frame,
+            fg_color="green" if arduino_dict["status"] else "red",
+            corner_radius=15,
+            border_color="black",
+            border_width=4,
+            width=50,
+            height=50,
+        )
+        status_display.grid(
+            row=0,
+            column=1,
+            padx=DeviceTab._PADX,
+            pady=DeviceTab._PADY,
+        )
 
     def _on_frame_configure(self, event) -> None:
         self._canvas.configure(scrollregion=self._canvas.bbox("all"))
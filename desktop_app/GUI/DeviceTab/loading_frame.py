@@ -1,6 +1,6 @@
 import customtkinter as ctk
 import threading
-from ArduinoBackend.arduino_manager import ArduinoManager
+from ArduinoBackend.arduino import Arduino
 
 
 class LoadingFrame(ctk.CTkFrame):
@@ -32,7 +32,7 @@ class LoadingFrame(ctk.CTkFrame):
             height=60,
             bg_color="gray20",
             text="Scan process!",
-            font=("Inter", 30, "bold"),
+            font=("Inter", 20, "bold"),
         )
         self._headline.grid(row=0, column=0, sticky="nsew")
 
@@ -61,73 +61,68 @@ class LoadingFrame(ctk.CTkFrame):
         self.canvas.update_idletasks()
 
         self.is_loading = False
-        self.animation_id = None
         self.process_thread = None
 
         self.bar = None
-        self.bar_x = 0
-        self.bar_width = 60
-        self.bar_speed = 20
+        self._found = []
 
         self._content_frame.pack(fill="both", expand=True)
 
-    def start_process(self) -> None:
+    def start_process(self, full_sweep: bool = False) -> None:
         if self.is_loading:
             return
 
         self.is_loading = True
+        self._found = []
 
         self.canvas.delete("all")
-        self._setup_bar_animation()
+        self._setup_bar()
+        self._headline.configure(text="Scan process!")
 
-        self.process_thread = threading.Thread(target=self._background_process)
+        self.process_thread = threading.Thread(
+            target=self._background_process, args=(full_sweep,)
+        )
         self.process_thread.daemon = True
         self.process_thread.start()
 
-        self._update_animation()
-
-    def _background_process(self) -> None:
+    def _background_process(self, full_sweep: bool) -> None:
+        # Scanner callbacks arrive on this thread; hand them to the Tk loop.
         try:
-            self._arduino_manager.load_and_upate_from_file()
-            self._data = self._arduino_manager.data
-            self._top_menu_bar.options_menu.update_options()
+            self._arduino_manager.load_and_upate_from_file(
+                on_device=lambda arduino: self.after(0, self._device_found, arduino),
+                on_progress=lambda *progress: self.after(
+                    0, self._update_progress, *progress
+                ),
+                full_sweep=full_sweep,
+            )
             self.after(0, self._process_completed)
         except Exception as e:
             print(f"Fail 1: {e}")
             self._master.after(0, self._process_completed)
 
-    def _process_completed(self) -> None:
-        self.is_loading = False
-
-        if self.animation_id:
-            self.after_cancel(self.animation_id)
-            self.animation_id = None
-
-        self.grid_forget()
-        self._master.add_content()
-        self._master.grid_canvas_frame()
-
-    def _setup_bar_animation(self) -> None:
-        self.bar_x = 0
-        self.bar = self.canvas.create_rectangle(
-            0, 10, self.bar_width, 30, fill="#1f6aa5", width=0
-        )
+    def _device_found(self, arduino: Arduino) -> None:
+        self._found.append(arduino)
+        self._master.add_device(arduino)
+        self._top_menu_bar.options_menu.update_options(self._found)
 
-    def _update_animation(self) -> None:
+    def _update_progress(
+        self, probed: int, total: int, hosts_per_second: float
+    ) -> None:
         if not self.is_loading:
             return
 
-        try:
-            self._update_bar_animation()
-            if self.winfo_exists():
-                self.animation_id = self.after(30, self._update_animation)
-        except Exception as e:
-            print("Animation error:", e)
+        self._headline.configure(
+            text=f"{probed}/{total} hosts ({total - probed} left) · "
+            f"{len(self._found)} found · {hosts_per_second:.0f} hosts/s"
+        )
 
-    def _update_bar_animation(self) -> None:
         width = self.canvas.winfo_width() or 400
-        self.bar_x += self.bar_speed
-        if self.bar_x > width:
-            self.bar_x = -self.bar_width
+        self.canvas.coords(self.bar, 0, 10, width * probed / max(total, 1), 30)
+
+    def _process_completed(self) -> None:
+        self.is_loading = False
+        self._top_menu_bar.options_menu.update_options()
+        self._master.scan_completed()
 
-        self.canvas.coords(self.bar, self.bar_x, 10, self.bar_x + self.bar_width, 30)
+    def _setup_bar(self) -> None:
+        self.bar = self.canvas.create_rectangle(0, 10, 0, 30, fill="#1f6aa5", width=0)
@@ -1,8 +1,13 @@
-import requests
 import customtkinter as ctk
 
 from ArduinoBackend.arduino import Arduino
 from ArduinoBackend.arduino_manager import ArduinoManager
+from ArduinoBackend.command_dispatcher import (
+    CommandDispatcher,
+    shared_command_dispatcher,
+)
+from ArduinoBackend.pixel_frame import PixelFrame
+from ArduinoBackend.pixel_sync import shared_pixel_sync
 
 from GUI.CSButton.cs_button import CSButton
 from GUI.Menus.options_menu import OptionsMenu
@@ -53,7 +58,7 @@ class BotMenuBar(ctk.CTkFrame):
         if arduino is None:
             return
 
-        self._request(f"http://{arduino.ip_address}/{arduino.last_command}")
+        self._request(arduino, arduino.last_command)
 
     def _led_off(self) -> None:
         arduino = self._get_arduino()
@@ -61,7 +66,7 @@ class BotMenuBar(ctk.CTkFrame):
         if arduino is None:
             return
 
-        self._request(f"http://{arduino.ip_address}/ledOff")
+        self._request(arduino, "ledOff")
 
     def _post(self) -> None:
         arduino = self._get_arduino()
@@ -70,15 +75,13 @@ class BotMenuBar(ctk.CTkFrame):
             return
 
         if not hasattr(self._master.top_menu_bar.active_tab, "command"):
-            self._request(f"http://{arduino.ip_address}/{arduino.last_command}")
+            self._request(arduino, arduino.last_command)
             return
 
-        url: str = (
-            f"http://{arduino.ip_address}/{self._master.top_menu_bar.active_tab.command}"
-        )
+        command: str = self._master.top_menu_bar.active_tab.command
 
-        if url.replace(f"http://{arduino.ip_address}/", "") == "":
-            self._request(f"http://{arduino.ip_address}/{arduino.last_command}")
+        if command == "":
+            self._request(arduino, arduino.last_command)
             return
 
         if hasattr(
@@ -88,31 +91,38 @@ class BotMenuBar(ctk.CTkFrame):
                 arduino
             )
 
-        self._save_last_command(arduino, url)
-        self._request(url)
+        self._save_last_command(arduino, command)
+        self._request(arduino, command)
 
     def _save_last_command(self, arduino: Arduino, new_command) -> None:
         if not self._options_menu.get() in self._options_menu.device_map:
             return
 
-        arduino.last_command = new_command.replace(f"http://{arduino.ip_address}/", "")
+        arduino.last_command = new_command
 
         self._options_menu.arduino_manager.update_arduino(
             arduino, arduino.last_command, "last_command"
         )
 
-    def _request(self, url: str) -> None:
-        print(url)
+    def _request(self, arduino: Arduino, command: str) -> None:
+        print(f"http://{arduino.ip_address}/{command}")
+        on_result = lambda *result: self.after(0, self._on_result, *result)
 
-        try:
-            response = requests.post(url)
+        # The frame is built from the device's saved single LED setting and
+        # only carries what changed since the device last confirmed one.
+        if command.split("?")[0] == PixelFrame.PATH:
+            shared_pixel_sync().send(arduino, arduino.single_led, on_result)
+            return
 
-            if response.status_code in (200, 201, 202, 203, 204):
-                return
+        # Sent from a worker thread; a command still waiting for the same
+        # device is replaced, so rapid clicks never queue up stale requests.
+        shared_command_dispatcher().send(arduino, command, on_result=on_result)
 
-            print(f"FAIL: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"connection failure: {e}")
+    def _on_result(
+        self, outcome: str, arduino: Arduino, command: str, detail: str
+    ) -> None:
+        if outcome == CommandDispatcher.FAILED:
+            print(f"{arduino.name}: {detail}")
 
     @property
     def options_menu(self) -> OptionsMenu:
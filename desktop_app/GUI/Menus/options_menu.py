@@ -1,6 +1,7 @@
 from cgitb import text
 import customtkinter as ctk
 
+from ArduinoBackend.arduino import Arduino
 from ArduinoBackend.arduino_manager import ArduinoManager
 
 
@@ -44,11 +45,14 @@ class OptionsMenu(ctk.CTkOptionMenu):
             **kwargs,
         )
 
-    def _build_device_map(self) -> dict:
+    def _build_device_map(self, devices: list[Arduino] | None = None) -> dict:
         device_map = {}
         name_counts = {}
 
-        for device in self._arduino_manger.data:
+        if devices is None:
+            devices = self._arduino_manger.data
+
+        for device in devices:
             if device.status:
                 name = device.name
 
@@ -72,11 +76,16 @@ class OptionsMenu(ctk.CTkOptionMenu):
         self._device_map = device_map
         return device_map
 
-    def update_options(self) -> None:
-        self._device_map = self._build_device_map()
+    def update_options(self, devices: list[Arduino] | None = None) -> None:
+        current_value = self.get()
+        self._device_map = self._build_device_map(devices)
         _options = list(self._device_map.keys())
         _default_value = _options[0] if _options else "No devices"
 
+        # Keep the selection while the list grows during a scan.
+        if current_value in self._device_map:
+            _default_value = current_value
+
         self.configure(
             values=_options,
             variable=ctk.StringVar(value=_default_value),
@@ -34,8 +34,10 @@ class TopMenuBar(ctk.CTkFrame):
         self.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
         self._device_tab = DeviceTab(master=self._tab, top_menu_bar=self)
-        self._color_tab = ColorTab(master=self._tab)
-        self._animation_tab = AnimationTab(master=self._tab, color_tab=self._color_tab)
+        self._color_tab = ColorTab(master=self._tab, options_menu=self._options_menu)
+        self._animation_tab = AnimationTab(
+            master=self._tab, color_tab=self._color_tab, options_menu=self._options_menu
+        )
         self._single_led_controll_tab = SingleLEDControllTab(
             master=self._tab, top_menu_bar=self
         )
@@ -67,6 +69,7 @@ class TopMenuBar(ctk.CTkFrame):
         if isinstance(tab, AnimationTab):
             tab.animation_display.update_color_display()
             tab.create_command()
+            tab.update_led_count()
 
         if isinstance(tab, DeviceTab):
             tab.update_with_load()
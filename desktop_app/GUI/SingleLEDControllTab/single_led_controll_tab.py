@@ -1,7 +1,7 @@
-import ast
 import customtkinter as ctk
 
 from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.pixel_frame import PixelFrame
 from GUI.ColorTab.color_picker_rgb import ColorPickerRGB
 from GUI.SingleLEDControllTab.single_led_display import SingleLEDDisplay
 
@@ -16,6 +16,7 @@ class SingleLEDControllTab(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure((0, 1), weight=1)
         self._command = ""
+        self._single_led = ()
 
         self._color_picker_rgb = ColorPickerRGB(self)
         self._color_picker_rgb.grid(
@@ -72,15 +73,15 @@ class SingleLEDControllTab(ctk.CTkFrame):
         values = list(value.values())
         ziped_list = tuple((x, *y) for x, y in zip(keys, values))
 
-        self._command = f"singleLED?singleLED={ziped_list}"
+        # Sent as a binary frame built from the saved setting, see PixelSync.
+        self._single_led = ziped_list
+        self._command = PixelFrame.PATH
 
     def _save_arduino_single_led_setting(self, arduino: Arduino) -> None:
         if not self._options_menu.get() in self._options_menu.device_map:
             return
 
-        arduino.single_led = ast.literal_eval(
-            self._command.replace("singleLED?singleLED=", "")
-        )
+        arduino.single_led = self._single_led
 
         self._options_menu.arduino_manager.update_arduino(
             arduino, arduino.single_led, "_single_led"
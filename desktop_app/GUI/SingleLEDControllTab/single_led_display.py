@@ -1,8 +1,8 @@
-import requests
+import threading
 import customtkinter as ctk
 
-from ArduinoBackend import arduino
 from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.device_info import shared_device_info_cache
 from GUI.ColorTab.color_picker_rgb import ColorPickerRGB
 from GUI.Menus.options_menu import OptionsMenu
 from GUI.SingleLEDControllTab.led import LED
@@ -27,6 +27,11 @@ class SingleLEDDisplay(ctk.CTkFrame):
         self._color_picker_rgb = color_picker_rgb
         self._elements_per_row = 7
         self._led_dict = {}
+        self._led_count = 0
+        self._LEDS = []
+        self._led = None
+        self._key = 0
+        self._draw_request = 0
 
         self._canvas = ctk.CTkCanvas(
             self, highlightthickness=0, bg=self.cget("fg_color")
@@ -48,8 +53,6 @@ class SingleLEDDisplay(ctk.CTkFrame):
             (0, 0), window=self._content_frame, anchor="nw"
         )
 
-        self.draw_leds()
-
         self._canvas.bind("<Configure>", self._on_canvas_configure)
         self._canvas.bind("<MouseWheel>", self._on_mousewheel)
         self._content_frame.bind("<MouseWheel>", self._on_mousewheel)
@@ -67,7 +70,34 @@ class SingleLEDDisplay(ctk.CTkFrame):
         return "break"
 
     def draw_leds(self) -> None:
-        self._led_count = self._request_led_count()
+        # A device seen before is drawn from the cache right away. Otherwise
+        # the LED count has to come from the device, so it is fetched off the
+        # Tk thread; answers for an earlier selection are dropped.
+        self._draw_request += 1
+        request = self._draw_request
+        arduino = self._get_selected_arduino()
+
+        if arduino is None:
+            self._draw_leds(request, 0)
+            return
+
+        info = shared_device_info_cache().cached(arduino)
+        if info is not None:
+            self._draw_leds(request, info["leds"])
+            return
+
+        threading.Thread(
+            target=lambda: self.after(
+                0, self._draw_leds, request, self._request_led_count(arduino)
+            ),
+            daemon=True,
+        ).start()
+
+    def _draw_leds(self, request: int, led_count: int) -> None:
+        if request != self._draw_request or not self.winfo_exists():
+            return
+
+        self._led_count = led_count
         self._LEDS = []
 
         if self._content_frame.winfo_children():
@@ -132,26 +162,17 @@ class SingleLEDDisplay(ctk.CTkFrame):
             self._led.brightness,
         )
 
-    def _request_led_count(self) -> None:
+    def _get_selected_arduino(self) -> Arduino | None:
         if not self._options_menu.get() in self._options_menu.device_map:
-            return 0
-
-        arduino: Arduino = self._options_menu.device_map[self._options_menu.get()]
-
-        if not arduino():
-            return 0
+            return None
 
-        try:
-            response = requests.get(f"http://{arduino.ip_address}/num")
+        return self._options_menu.device_map[self._options_menu.get()]
 
-            if response.status_code in (200, 204):
-                return int(response.text)
+    def _request_led_count(self, arduino: Arduino) -> int:
+        # One GET /info, which also tells whether the device is reachable.
+        info = shared_device_info_cache().get(arduino)
 
-            print(f"FAIL: {response.status_code}")
-            return 0
-        except requests.exceptions.RequestException as e:
-            print(f"Connection failure: {e}")
-            return 0
+        return 0 if info is None else info["leds"]
 
     def update_dict(self, led: ctk.CTkFrame, key: int) -> None:
         self._led_dict[key] = self._color_picker_rgb.rgb
@@ -1,5 +1,7 @@
 import customtkinter as ctk
 
+from ArduinoBackend.command_dispatcher import shared_command_dispatcher
+
 from GUI.Menus.top_menu_bar import TopMenuBar
 from GUI.Menus.bot_menu_bar import BotMenuBar
 
@@ -14,6 +16,7 @@ class NewWindow(ctk.CTk):
         self.title(title)
         self.geometry(f"{width}x{height}")
         self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self.grid_rowconfigure((0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10), weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -43,6 +46,11 @@ class NewWindow(ctk.CTk):
             row=0, column=0, sticky="nsew", padx=NewWindow._PADX, pady=NewWindow._PADY
         )
 
+    def _on_close(self) -> None:
+        shared_command_dispatcher().close()
+        self._bot_menu_bar.options_menu.arduino_manager.close()
+        self.destroy()
+
     def _on_change(self, value) -> None:
         self._top_menu_bar.single_led_controller_tab.single_led_display.draw_leds()
 
@@ -0,0 +1,163 @@
+"""
+Simulated Wi-Fi conditions for the virtual controllers.
+
+A NetworkConditions describes one device's link: base latency plus random
+jitter on every reply, a bandwidth cap that requests and replies share, and
+the chance that a request is lost (the device never answers) or its
+connection is reset. Used by TestBench.virtual_esp to benchmark scans,
+timeouts and command throughput under realistic conditions.
+
+Run from the desktop_app directory to print the built-in profiles:
+    python -m TestBench.network_conditions
+"""
+
+import argparse
+import random
+import threading
+import time
+
+
+class NetworkConditions:
+    DROP = "drop"
+    RESET = "reset"
+
+    # "wifi" is a typical home network: 5-80 ms per reply, occasional loss.
+    PROFILES = {
+        "ideal": {},
+        "wifi": {
+            "latency_ms": 5,
+            "jitter_ms": 75,
+            "bandwidth_kbps": 4000,
+            "drop_rate": 0.01,
+            "reset_rate": 0.002,
+        },
+        "congested": {
+            "latency_ms": 20,
+            "jitter_ms": 180,
+            "bandwidth_kbps": 500,
+            "drop_rate": 0.05,
+            "reset_rate": 0.01,
+        },
+    }
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        bandwidth_kbps: float | None = None,
+        drop_rate: float = 0.0,
+        reset_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            latency_ms (float, optional): Delay added to every reply
+            jitter_ms (float, optional): Random extra delay, uniform between 0
+                and this value
+            bandwidth_kbps (float, optional): Link capacity in kilobit/s, or
+                None for no cap
+            drop_rate (float, optional): Share of requests that are never
+                answered
+            reset_rate (float, optional): Share of requests whose connection
+                is reset instead of answered
+            seed (int, optional): Seed for repeatable runs
+        """
+        if drop_rate + reset_rate > 1:
+            raise ValueError("drop_rate and reset_rate add up to more than 1")
+
+        self._latency = latency_ms / 1000
+        self._jitter = jitter_ms / 1000
+        self._bandwidth = None if bandwidth_kbps is None else bandwidth_kbps * 1000
+        self._drop_rate = drop_rate
+        self._reset_rate = reset_rate
+        self._seed = seed
+        self._random = random.Random(seed)
+
+        # The link is busy until this time; transfers queue behind it.
+        self._lock = threading.Lock()
+        self._busy_until = 0.0
+
+    @classmethod
+    def profile(cls, name: str, seed: int | None = None) -> "NetworkConditions":
+        if name not in cls.PROFILES:
+            raise ValueError(f"Unknown network profile: {name}")
+
+        return cls(**cls.PROFILES[name], seed=seed)
+
+    def copy(self, index: int = 0) -> "NetworkConditions":
+        """
+        The same conditions on a separate link, e.g. for another device.
+
+        Args:
+            index (int, optional): Mixed into the seed so devices do not drop
+                the same requests
+
+        Returns:
+            NetworkConditions: A copy with its own bandwidth and random state
+        """
+        return NetworkConditions(
+            latency_ms=self._latency * 1000,
+            jitter_ms=self._jitter * 1000,
+            bandwidth_kbps=None if self._bandwidth is None else self._bandwidth / 1000,
+            drop_rate=self._drop_rate,
+            reset_rate=self._reset_rate,
+            seed=None if self._seed is None else self._seed * 1_000_003 + index,
+        )
+
+    def fate(self) -> str | None:
+        """
+        Returns:
+            str | None: DROP or RESET for a request that does not get
+            through, None for one that does
+        """
+        with self._lock:
+            roll = self._random.random()
+
+        if roll < self._drop_rate:
+            return NetworkConditions.DROP
+        if roll < self._drop_rate + self._reset_rate:
+            return NetworkConditions.RESET
+        return None
+
+    def delay(self, size: int = 0) -> None:
+        """
+        Wait as long as a reply takes on this link.
+
+        Args:
+            size (int, optional): Bytes moved over the link for the request
+                and its reply; they wait for earlier transfers to finish
+        """
+        with self._lock:
+            wait = self._latency + self._random.uniform(0, self._jitter)
+
+            if self._bandwidth and size:
+                now = time.monotonic()
+                start = max(now, self._busy_until)
+                self._busy_until = start + size * 8 / self._bandwidth
+                wait += self._busy_until - now
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def __str__(self) -> str:
+        bandwidth = (
+            "unlimited"
+            if self._bandwidth is None
+            else f"{self._bandwidth / 1000:g} kbit/s"
+        )
+        return (
+            f"{self._latency * 1000:g}+{self._jitter * 1000:g} ms, {bandwidth}, "
+            f"{self._drop_rate:.1%} dropped, {self._reset_rate:.1%} reset"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.parse_args()
+
+    for name in NetworkConditions.PROFILES:
+        print(f"{name:>10}: {NetworkConditions.profile(name)}")
+
+
+if __name__ == "__main__":
+    main()
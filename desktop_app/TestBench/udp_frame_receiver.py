@@ -0,0 +1,169 @@
+"""
+Stand-in for the firmware's realtime UDP listener.
+
+Receives FrameStreamer packets the way the controller does: frames are shown
+when their last packet arrives and packets of frames older than the last one
+shown are dropped. Keeps the strip and measures delivered fps, frame interval
+jitter and loss, so realtime streaming can be benchmarked without hardware.
+
+Run from the desktop_app directory:
+    python -m TestBench.udp_frame_receiver --leds 300
+"""
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+
+from ArduinoBackend.frame_streamer import FrameStreamer
+from ArduinoBackend.pixel_frame import PixelFrame
+
+
+class UDPFrameReceiver:
+    def __init__(
+        self, address: str = "127.0.0.1", port: int = FrameStreamer.PORT, leds=60
+    ) -> None:
+        self._address = (address, port)
+        self._strip = bytearray(3 * leds)
+        self._lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shown_at: list[float] = []
+            self._first_sequence = None
+            self._last_sequence = None
+            self._packets_seen: dict[int, set] = {}
+            self._late = 0
+            self._incomplete = 0
+
+    def start(self) -> None:
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._socket.bind(self._address)
+        self._socket.settimeout(0.2)
+        self._stopped.clear()
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._socket is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._socket.close()
+        self._socket = None
+
+    def _serve(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                packet = self._socket.recv(FrameStreamer.MAX_PACKET)
+            except socket.timeout:
+                continue
+
+            self._handle(packet, time.perf_counter())
+
+    def _handle(self, packet: bytes, received_at: float) -> None:
+        if len(packet) < FrameStreamer.HEADER.size:
+            return
+
+        magic, version, index, count, sequence = FrameStreamer.HEADER.unpack_from(
+            packet
+        )
+        if magic != FrameStreamer.MAGIC or version != FrameStreamer.VERSION:
+            return
+
+        with self._lock:
+            if self._last_sequence is not None and sequence < self._last_sequence:
+                self._late += 1
+                return
+
+            if self._first_sequence is None:
+                self._first_sequence = sequence
+
+            for offset, rgb in PixelFrame.decode(
+                packet[FrameStreamer.HEADER.size :]
+            ).spans:
+                start = 3 * offset
+                self._strip[start : start + len(rgb)] = rgb[
+                    : max(0, len(self._strip) - start)
+                ]
+
+            seen = self._packets_seen.setdefault(sequence, set())
+            seen.add(index)
+
+            if index + 1 < count:
+                return
+
+            # The controller shows the frame on its last packet; one that
+            # lost an earlier packet shows partly stale pixels.
+            if len(seen) < count:
+                self._incomplete += 1
+
+            self._shown_at.append(received_at)
+            self._last_sequence = sequence
+            self._packets_seen = {}
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Shown frames, fps, interval jitter (standard deviation and
+            worst deviation from the mean, in ms), lost, incomplete and late
+            frames and the loss ratio
+        """
+        with self._lock:
+            shown_at = list(self._shown_at)
+            first, last = self._first_sequence, self._last_sequence
+            late, incomplete = self._late, self._incomplete
+
+        shown = len(shown_at)
+        expected = 0 if last is None else last - first + 1
+        intervals = [b - a for a, b in zip(shown_at, shown_at[1:])]
+        mean = statistics.fmean(intervals) if intervals else 0
+
+        return {
+            "shown": shown,
+            "fps": 1 / mean if mean else 0.0,
+            "jitter_ms": statistics.pstdev(intervals) * 1000 if intervals else 0.0,
+            "max_deviation_ms": (
+                max(abs(i - mean) for i in intervals) * 1000 if intervals else 0.0
+            ),
+            "lost": expected - shown,
+            "incomplete": incomplete,
+            "late": late,
+            "loss": (expected - shown) / expected if expected else 0.0,
+        }
+
+    @property
+    def strip(self) -> bytes:
+        with self._lock:
+            return bytes(self._strip)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=FrameStreamer.PORT)
+    parser.add_argument("--leds", type=int, default=60)
+    args = parser.parse_args()
+
+    receiver = UDPFrameReceiver(args.address, args.port, args.leds)
+    receiver.start()
+    print(f"Receiving frames on udp/{args.port}, Ctrl+C for statistics")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        receiver.stop()
+        print(receiver.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Stand-in for the firmware's UDP discovery responder.
+
+Answers NetworkScanner.discover beacons on behalf of a number of simulated
+devices, so discovery can be tried without hardware. Every reply is sent from
+the device's own loopback alias (127.0.0.x), which makes the scanner see them
+as separate hosts.
+
+Run from the desktop_app directory:
+    python -m TestBench.udp_responder --devices 5
+and discover with:
+    NetworkScanner(discovery="udp").scan_network("127.0.0.0/24")
+"""
+
+import argparse
+import json
+import socket
+import threading
+
+from ArduinoBackend.network_scanner import NetworkScanner
+
+
+class UDPResponder:
+    def __init__(
+        self,
+        devices: list[dict],
+        port: int = NetworkScanner.DISCOVERY_PORT,
+        bind_address: str = "",
+    ) -> None:
+        self._devices = devices
+        self._port = port
+        self._bind_address = bind_address
+        self._socket = None
+        self._reply_sockets = {}
+        self._thread = None
+        self._stopped = threading.Event()
+        self._beacons = 0
+
+    def start(self) -> None:
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self._bind_address, self._port))
+        self._socket.settimeout(0.2)
+        self._stopped.clear()
+
+        for device in self._devices:
+            reply_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            reply_socket.bind((device["ip"], 0))
+            self._reply_sockets[device["ip"]] = reply_socket
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._socket is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._socket.close()
+
+        for reply_socket in self._reply_sockets.values():
+            reply_socket.close()
+
+        self._socket = None
+        self._reply_sockets = {}
+
+    def _serve(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                data, address = self._socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+
+            if data.strip() != NetworkScanner.DISCOVERY_BEACON:
+                continue
+
+            self._beacons += 1
+
+            for device in self._devices:
+                self._reply_sockets[device["ip"]].sendto(self._reply(device), address)
+
+    def _reply(self, device: dict) -> bytes:
+        reply = {
+            "mac": device["mac"],
+            "leds": device.get("leds", 60),
+            "version": device.get("version", "1.1.0"),
+        }
+
+        if device.get("port", 80) != 80:
+            reply["port"] = device["port"]
+
+        return json.dumps(reply).encode()
+
+    @property
+    def beacons(self) -> int:
+        return self._beacons
+
+
+def simulated_devices(count: int, http_port: int = 80, first_ip: int = 2) -> list:
+    return [
+        {
+            "ip": f"127.0.0.{first_ip + index}",
+            "mac": f"AA:BB:CC:DD:{index >> 8:02X}:{index & 0xFF:02X}",
+            "port": http_port,
+        }
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=5)
+    parser.add_argument("--http-port", type=int, default=80)
+    parser.add_argument("--port", type=int, default=NetworkScanner.DISCOVERY_PORT)
+    args = parser.parse_args()
+
+    responder = UDPResponder(
+        simulated_devices(args.devices, args.http_port), port=args.port
+    )
+    responder.start()
+    print(f"Answering discovery beacons on udp/{args.port}, Ctrl+C to stop")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        responder.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,700 @@
+"""
+Virtual ESP8266 LED controllers for local testing and load generation.
+
+Implements the HTTP API of esp_firmware/src/main.cpp with the same routes,
+status codes and texts: POST /ledOn, /ledOff, /singleLED, /frame and the
+animation endpoints, GET /mac, /num and /info. Every device keeps the firmware's
+state (color, delay, on/off, per-LED data, running animation) and a pixel
+buffer of what the strip would show; animations are advanced lazily from the
+clock whenever the strip is looked at, so hundreds of idle devices cost
+nothing.
+
+A fleet runs either on loopback aliases (127.0.x.y, one address per device,
+which is what NetworkScanner sweeps) or on consecutive ports of one address.
+It can also answer UDP discovery beacons for all of its devices.
+
+Run from the desktop_app directory:
+    python -m TestBench.virtual_esp --devices 200 --network 127.0.0.0/24
+and point the app or a benchmark at it, e.g.:
+    ArduinoManager(network="127.0.0.0/24", port=8080)
+"""
+
+import argparse
+import ipaddress
+import json
+import random
+import re
+import socket
+import socketserver
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ArduinoBackend.arduino import Arduino
+from ArduinoBackend.pixel_frame import PixelFrame
+from TestBench.network_conditions import NetworkConditions
+from TestBench.udp_responder import UDPResponder
+
+
+class VirtualESP:
+    """Firmware state of one controller, with the firmware's handlers."""
+
+    ANIMATIONS = ("rainbow", "pulse", "chasing", "strobe", "raindrop", "fireplace")
+    FIRMWARE_VERSION = "1.3.0"
+
+    _STROBE_ON_MS = 50
+    _STROBE_OFF_MS = 150
+
+    def __init__(self, mac_address: str, num_leds: int = 60) -> None:
+        self._lock = threading.Lock()
+        self._mac_address = mac_address
+        self._num_leds = num_leds
+
+        self._r, self._g, self._b = 255, 0, 0
+        self._delay_time = 10
+        self._is_on = False
+        self._pixel_data = [None] * num_leds
+        self._buffer = bytearray(3 * num_leds)
+        self._shown = bytes(3 * num_leds)
+
+        self._animation = None
+        self._last_update = self._millis()
+        self._hue = 0
+        self._step = 0
+        self._increasing = True
+        self._position = 0
+        self._strobe_started = 0
+        self._drops = [0] * num_leds
+
+    @staticmethod
+    def _millis() -> int:
+        return int(time.monotonic() * 1000)
+
+    @staticmethod
+    def _to_int(text: str) -> int:
+        # String::toInt(), i.e. atol(): leading number or 0.
+        match = re.match(r"\s*[-+]?\d+", text)
+        return int(match.group()) if match else 0
+
+    def _set_pixel(self, index: int, rgb: tuple[int, int, int]) -> None:
+        if 0 <= index < self._num_leds:
+            self._buffer[3 * index : 3 * index + 3] = bytes(rgb)
+
+    def _clear(self) -> None:
+        self._buffer = bytearray(3 * self._num_leds)
+
+    def _set_all(self, rgb: tuple[int, int, int]) -> None:
+        self._buffer = bytearray(bytes(rgb) * self._num_leds)
+        self._show()
+
+    def _show(self) -> None:
+        self._shown = bytes(self._buffer)
+
+    def _stop_animation(self) -> None:
+        # The strip keeps whatever the animation showed last.
+        self._advance()
+        self._animation = None
+
+    def _extract_arguments(self, query: dict) -> bool:
+        if not all(key in query for key in ("r", "g", "b")):
+            return False
+
+        self._r, self._g, self._b = (
+            max(0, min(255, self._to_int(query[key][0]))) for key in ("r", "g", "b")
+        )
+
+        if "delay" in query:
+            self._delay_time = max(1, min(1000, self._to_int(query["delay"][0])))
+
+        return True
+
+    def led_on(self, query: dict) -> tuple[int, str]:
+        with self._lock:
+            if not self._extract_arguments(query):
+                return 400, "Missing arguments: r, g, b required"
+
+            self._stop_animation()
+            self._is_on = True
+            self._pixel_data = [None] * self._num_leds
+            self._set_all((self._r, self._g, self._b))
+            return 204, ""
+
+    def led_off(self) -> tuple[int, str]:
+        with self._lock:
+            self._stop_animation()
+            self._is_on = False
+            self._pixel_data = [None] * self._num_leds
+            self._clear()
+            self._show()
+            return 204, ""
+
+    def single_led(self, query: dict) -> tuple[int, str]:
+        if "singleLED" not in query:
+            return 400, "Missing parameter: singleLED"
+
+        # Same walk over "((i, r, g, b), ...)" as the firmware: a value is
+        # only read when the comma after it is there, b takes the rest.
+        tuples = query["singleLED"][0][1:-1]
+
+        with self._lock:
+            self._stop_animation()
+            self._pixel_data = [None] * self._num_leds
+            self._clear()
+
+            for inner in re.findall(r"\(([^)]*)\)", tuples):
+                parts = inner.split(",", 3)
+                values = [self._to_int(part) for part in parts[:-1]]
+                if len(parts) == 4:
+                    values.append(self._to_int(parts[3]))
+                index, r, g, b = (values + [0, 0, 0, 0])[:4]
+
+                index = max(0, min(self._num_leds - 1, index))
+                rgb = tuple(max(0, min(255, value)) for value in (r, g, b))
+                self._pixel_data[index] = rgb
+                self._set_pixel(index, rgb)
+
+            self._is_on = True
+            self._show()
+            return 200, "single LEDs updated"
+
+    def frame(self, body: bytes, clear: bool) -> tuple[int, str]:
+        with self._lock:
+            # Staged like the firmware's streaming parser and only applied
+            # once the whole body checks out.
+            header = PixelFrame.HEADER.size
+            position, spans = 0, 0
+            staged = {}
+
+            while position < len(body):
+                if len(body) - position < header:
+                    return 400, "Frame length does not match its header"
+
+                offset, count = PixelFrame.HEADER.unpack_from(body, position)
+                position += header
+                spans += 1
+                rgb = body[position : position + 3 * count]
+                position += len(rgb)
+
+                if len(rgb) != 3 * count:
+                    return 400, "Frame length does not match its header"
+
+                for i in range(count):
+                    if offset + i < self._num_leds:
+                        staged[offset + i] = tuple(rgb[3 * i : 3 * i + 3])
+
+            if spans == 0:
+                return 400, "Frame shorter than its header"
+
+            self._stop_animation()
+
+            if clear:
+                self._pixel_data = [None] * self._num_leds
+                self._clear()
+
+            for index, color in staged.items():
+                self._pixel_data[index] = color
+                self._set_pixel(index, color)
+
+            self._is_on = True
+            self._show()
+            return 204, ""
+
+    def start_animation(self, name: str, query: dict) -> tuple[int, str]:
+        with self._lock:
+            if not self._extract_arguments(query):
+                return 400, "Missing arguments: r, g, b required"
+
+            if name == "strobe":
+                self._strobe_started = self._millis()
+            elif name == "pulse":
+                self._step = 0
+                self._increasing = True
+
+            if self._animation is None:
+                # The loop runs the first step right away.
+                self._last_update = self._millis() - self._delay_time - 1
+
+            self._pixel_data = [None] * self._num_leds
+            self._is_on = True
+            self._animation = name
+            return 200, "Animation started!"
+
+    def _advance(self) -> None:
+        """Catch the running animation up with the clock."""
+        if self._animation is None:
+            return
+
+        now = self._millis()
+
+        if self._animation == "strobe":
+            cycle = VirtualESP._STROBE_ON_MS + VirtualESP._STROBE_OFF_MS
+            phase = (now - self._strobe_started) % cycle
+            if phase >= VirtualESP._STROBE_OFF_MS:
+                self._set_all((self._r, self._g, self._b))
+            else:
+                self._clear()
+                self._show()
+            return
+
+        steps = (now - self._last_update) // (self._delay_time + 1)
+        if steps <= 0:
+            return
+
+        self._last_update = now
+        getattr(self, f"_{self._animation}")(steps)
+
+    @staticmethod
+    def _color_hsv(hue: int, value: int) -> tuple[int, int, int]:
+        # Adafruit_NeoPixel::ColorHSV at full saturation
+        hue = (hue * 1530 + 32768) // 65536
+        if hue < 510:
+            rgb = (255, hue, 0) if hue < 255 else (510 - hue, 255, 0)
+        elif hue < 1020:
+            rgb = (0, 255, hue - 510) if hue < 765 else (0, 1020 - hue, 255)
+        elif hue < 1530:
+            rgb = (hue - 1020, 0, 255) if hue < 1275 else (255, 0, 1530 - hue)
+        else:
+            rgb = (255, 0, 0)
+
+        return tuple(c * (value + 1) >> 8 for c in rgb)
+
+    def _rainbow(self, steps: int) -> None:
+        value = int(0.2126 * self._r + 0.7152 * self._g + 0.0722 * self._b)
+        self._hue = (self._hue + 256 * (steps - 1)) & 0xFFFF
+
+        for i in range(self._num_leds):
+            hue = (self._hue + i * 65536 // self._num_leds) & 0xFFFF
+            self._set_pixel(i, self._color_hsv(hue, value))
+
+        self._show()
+        self._hue = (self._hue + 256) & 0xFFFF
+
+    def _pulse(self, steps: int) -> None:
+        # The level walks 0..255..0 in steps of 5, a period of 102 steps.
+        for _ in range((steps - 1) % 102 + 1):
+            level = self._step
+            self._step += 5 if self._increasing else -5
+            if self._step >= 255 or self._step <= 0:
+                self._increasing = not self._increasing
+
+        self._set_all(
+            (self._r * level // 255, self._g * level // 255, self._b * level // 255)
+        )
+
+    def _chasing(self, steps: int) -> None:
+        self._position = (self._position + steps - 1) % self._num_leds
+        self._clear()
+        self._set_pixel(self._position, (self._r, self._g, self._b))
+        self._show()
+        self._position = (self._position + 1) % self._num_leds
+
+    def _raindrop(self, steps: int) -> None:
+        # A drop lasts at most 7 steps, so older steps no longer matter.
+        for _ in range(min(steps, 8)):
+            self._clear()
+            for i in range(self._num_leds):
+                if random.randrange(100) < 5:
+                    self._drops[i] = random.randrange(3, 8)
+                if self._drops[i] > 0:
+                    self._set_pixel(i, (self._r, self._g, self._b))
+                    self._drops[i] -= 1
+
+        self._show()
+
+    def _fireplace(self, steps: int) -> None:
+        colors = [(self._r, self._g, self._b)]
+        for i in range(1, 5):
+            brightness = 0.3 + 0.7 * i / 4
+            colors.append(
+                tuple(
+                    max(0, min(255, int(c * brightness)))
+                    for c in (self._r, self._g, self._b)
+                )
+            )
+
+        last = max(1, self._num_leds - 1)
+        for i in range(self._num_leds):
+            position = 10 - i * 10 // last
+            if random.randrange(10) < position:
+                self._set_pixel(i, colors[random.randrange(2, 5)])
+            else:
+                self._set_pixel(i, colors[random.randrange(0, 2)])
+
+        self._show()
+
+    @property
+    def mac_address(self) -> str:
+        return self._mac_address
+
+    @property
+    def num_leds(self) -> int:
+        return self._num_leds
+
+    @property
+    def strip(self) -> bytes:
+        """What the LEDs show right now, three bytes per LED."""
+        with self._lock:
+            self._advance()
+            return self._shown
+
+    def info(self) -> dict:
+        """The reply to GET /info."""
+        with self._lock:
+            if self._animation is not None:
+                mode = self._animation
+            elif not self._is_on:
+                mode = "off"
+            elif any(rgb is not None for rgb in self._pixel_data):
+                mode = "single"
+            else:
+                mode = "color"
+
+            return {
+                "mac": self._mac_address,
+                "leds": self._num_leds,
+                "version": VirtualESP.FIRMWARE_VERSION,
+                "mode": mode,
+                "color": [self._r, self._g, self._b],
+                "delay": self._delay_time,
+            }
+
+    @property
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "is_on": self._is_on,
+                "color": (self._r, self._g, self._b),
+                "delay": self._delay_time,
+                "animation": self._animation,
+                "single_led": {
+                    index: rgb
+                    for index, rgb in enumerate(self._pixel_data)
+                    if rgb is not None
+                },
+            }
+
+
+class _VirtualESPHandler(BaseHTTPRequestHandler):
+    # ESP8266WebServer with keepAlive(true)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = ""
+    sys_version = ""
+
+    # Rough size of request and reply headers, for the bandwidth cap.
+    _HEADER_BYTES = 200
+
+    def do_GET(self) -> None:
+        device: VirtualESP = self.server.device
+        path = urlsplit(self.path).path
+
+        if not self._gets_through():
+            return
+
+        if path == "/mac":
+            self._reply(200, device.mac_address)
+        elif path == "/num":
+            self._reply(200, str(device.num_leds))
+        elif path == "/info":
+            self._reply(
+                200,
+                json.dumps(device.info(), separators=(",", ":")),
+                "application/json",
+            )
+        else:
+            self._reply(404, "404 - Request not found")
+
+    def do_POST(self) -> None:
+        device: VirtualESP = self.server.device
+        url = urlsplit(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        name = url.path.lstrip("/")
+
+        if not self._gets_through(len(body)):
+            return
+
+        if name == "ledOn":
+            self._reply(*device.led_on(query))
+        elif name == "ledOff":
+            self._reply(*device.led_off())
+        elif name == "singleLED":
+            self._reply(*device.single_led(query))
+        elif name == PixelFrame.PATH:
+            self._reply(*device.frame(body, "clear" in query))
+        elif name in VirtualESP.ANIMATIONS:
+            self._reply(*device.start_animation(name, query))
+        else:
+            self._reply(404, "404 - Request not found")
+
+    def _gets_through(self, request_size: int = 0) -> bool:
+        """Apply the device's network conditions to the current request."""
+        self._request_size = request_size
+        conditions: NetworkConditions | None = self.server.conditions
+        fate = conditions.fate() if conditions is not None else None
+
+        if fate == NetworkConditions.RESET:
+            self.connection.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+            self.connection.close()
+            self.close_connection = True
+            return False
+
+        if fate == NetworkConditions.DROP:
+            # Lost on the way: nothing comes back until the client gives up.
+            self.close_connection = True
+            self.connection.settimeout(60)
+            try:
+                while self.connection.recv(4096):
+                    pass
+            except OSError:
+                pass
+            return False
+
+        return True
+
+    def _reply(
+        self, status: int, text: str = "", content_type: str = "text/plain"
+    ) -> None:
+        body = text.encode()
+
+        if self.server.conditions is not None:
+            size = self._request_size + len(body) + len(self.requestline)
+            self.server.conditions.delay(size + self._HEADER_BYTES)
+
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _VirtualESPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    conditions: NetworkConditions | None = None
+
+    def server_bind(self) -> None:
+        # HTTPServer.server_bind() resolves the host name, which takes
+        # seconds per server without a resolver for the loopback aliases.
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = self.server_address[:2]
+
+
+class VirtualESPFleet:
+    """Many virtual controllers, each behind its own HTTP server."""
+
+    def __init__(
+        self,
+        addresses: list[tuple[str, int]],
+        num_leds: int = 60,
+        conditions: NetworkConditions | None = None,
+    ) -> None:
+        """
+        Args:
+            addresses (list[tuple]): (ip, port) of every device
+            num_leds (int, optional): Strip length of every device
+            conditions (NetworkConditions, optional): Network conditions
+                every device sees, each on its own link
+        """
+        self._servers = []
+        self._devices = []
+        self._conditions = []
+        self._responder = None
+
+        for index, (ip, port) in enumerate(addresses):
+            device = VirtualESP(
+                f"AA:BB:CC:{index >> 16 & 0xFF:02X}:{index >> 8 & 0xFF:02X}:"
+                f"{index & 0xFF:02X}",
+                num_leds,
+            )
+            self._devices.append((ip, port, device))
+            self._conditions.append(
+                None if conditions is None else conditions.copy(index)
+            )
+
+    @classmethod
+    def on_aliases(
+        cls,
+        count: int,
+        network: str = "127.0.0.0/24",
+        port: int = 8080,
+        num_leds: int = 60,
+        conditions: NetworkConditions | None = None,
+    ) -> "VirtualESPFleet":
+        """One device per loopback alias, all on the same port."""
+        hosts = ipaddress.IPv4Network(network).hosts()
+        addresses = [(str(next(hosts)), port) for _ in range(count)]
+        return cls(addresses, num_leds, conditions)
+
+    @classmethod
+    def on_ports(
+        cls,
+        count: int,
+        address: str = "127.0.0.1",
+        first_port: int = 9000,
+        num_leds: int = 60,
+        conditions: NetworkConditions | None = None,
+    ) -> "VirtualESPFleet":
+        """All devices on one address, on consecutive ports."""
+        addresses = [(address, first_port + index) for index in range(count)]
+        return cls(addresses, num_leds, conditions)
+
+    def start(self, discovery: bool = False) -> None:
+        """
+        Args:
+            discovery (bool, optional): Also answer UDP discovery beacons for
+                every device, as the firmware does
+        """
+        for (ip, port, device), conditions in zip(self._devices, self._conditions):
+            server = _VirtualESPServer((ip, port), _VirtualESPHandler)
+            server.device = device
+            server.conditions = conditions
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+
+        if discovery:
+            self._responder = UDPResponder(
+                [
+                    {
+                        "ip": ip,
+                        "mac": device.mac_address,
+                        "port": port,
+                        "leds": device.num_leds,
+                        "version": VirtualESP.FIRMWARE_VERSION,
+                    }
+                    for ip, port, device in self._devices
+                ]
+            )
+            self._responder.start()
+
+    def set_conditions(
+        self, conditions: NetworkConditions | None, address: str | None = None
+    ) -> None:
+        """
+        Change network conditions, also while the fleet is running.
+
+        Args:
+            conditions (NetworkConditions | None): New conditions, None for a
+                perfect network
+            address (str, optional): Only this device ("ip" or "ip:port");
+                all devices if omitted
+        """
+        for index, (ip, port, _) in enumerate(self._devices):
+            if address is not None and address not in (ip, f"{ip}:{port}"):
+                continue
+
+            device_conditions = None if conditions is None else conditions.copy(index)
+            self._conditions[index] = device_conditions
+            if self._servers:
+                self._servers[index].conditions = device_conditions
+
+    def stop(self) -> None:
+        # shutdown() waits up to a poll interval per server; do all at once.
+        stoppers = [
+            threading.Thread(target=server.shutdown) for server in self._servers
+        ]
+        for stopper in stoppers:
+            stopper.start()
+        for stopper in stoppers:
+            stopper.join()
+
+        for server in self._servers:
+            server.server_close()
+        self._servers = []
+
+        if self._responder is not None:
+            self._responder.stop()
+            self._responder = None
+
+    def arduinos(self) -> list[Arduino]:
+        """Arduino records for the devices, e.g. for ArduinoManager or a registry."""
+        return [
+            Arduino(
+                name=f"Virtual {index}",
+                ip_address=ip if port == 80 else f"{ip}:{port}",
+                mac_address=device.mac_address,
+                status=True,
+            )
+            for index, (ip, port, device) in enumerate(self._devices)
+        ]
+
+    def write_arduino_json(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(
+                [arduino.to_dict() for arduino in self.arduinos()],
+                f,
+                ensure_ascii=False,
+                indent=4,
+            )
+
+    def device(self, address: str) -> VirtualESP | None:
+        for ip, port, device in self._devices:
+            if address in (ip, f"{ip}:{port}"):
+                return device
+        return None
+
+    @property
+    def devices(self) -> list[VirtualESP]:
+        return [device for _, _, device in self._devices]
+
+    @property
+    def addresses(self) -> list[str]:
+        return [f"{ip}:{port}" for ip, port, _ in self._devices]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--network", default="127.0.0.0/24")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--ports-from",
+        type=int,
+        help="run all devices on 127.0.0.1 from this port on instead of aliases",
+    )
+    parser.add_argument("--leds", type=int, default=60)
+    parser.add_argument("--discovery", action="store_true")
+    parser.add_argument(
+        "--conditions",
+        choices=NetworkConditions.PROFILES,
+        help="simulate this network instead of a perfect one",
+    )
+    parser.add_argument("--write-json", help="write an arduino.json for the app")
+    args = parser.parse_args()
+
+    if args.ports_from is not None:
+        fleet = VirtualESPFleet.on_ports(
+            args.devices, first_port=args.ports_from, num_leds=args.leds
+        )
+    else:
+        fleet = VirtualESPFleet.on_aliases(
+            args.devices, args.network, args.port, args.leds
+        )
+
+    if args.conditions:
+        fleet.set_conditions(NetworkConditions.profile(args.conditions))
+
+    fleet.start(discovery=args.discovery)
+    if args.write_json:
+        fleet.write_arduino_json(args.write_json)
+
+    print(
+        f"{args.devices} virtual controllers from {fleet.addresses[0]} "
+        f"to {fleet.addresses[-1]}, Ctrl+C to stop"
+    )
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fleet.stop()
+
+
+if __name__ == "__main__":
+    main()
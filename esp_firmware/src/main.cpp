@@ -1,6 +1,7 @@
 #include <Arduino.h>
 #include <ESP8266WebServer.h>
 #include <ESP8266WiFi.h>
+#include <WiFiUdp.h>
 #include <Adafruit_NeoPixel.h>
 
 /**
@@ -20,6 +21,24 @@ const char* password = "";  // Wi-Fi Password
 #define LED_PIN 2       // Pin connected to LED strip
 #define NUM_LEDS 60     // Number of LEDs in the strip
 
+// Discovery Configuration
+#define FIRMWARE_VERSION "1.3.0"
+#define DISCOVERY_PORT 4210                       // UDP port for discovery beacons
+#define DISCOVERY_BEACON "LEDCTRL_DISCOVER"       // Beacon sent by the desktop app
+
+// Realtime streaming: UDP packets with a 10 byte header ('L', 'R', version,
+// packet index, packet count, reserved, sequence uint32 LE) followed by frame
+// spans as for POST /frame. The last packet of a frame shows it.
+#define REALTIME_PORT 4211
+#define REALTIME_VERSION 1
+#define REALTIME_HEADER_SIZE 10
+#define REALTIME_MAX_PACKET 1472
+#define REALTIME_TIMEOUT_MS 2000                   // back to normal without packets
+
+// Binary frame for POST /frame: one or more spans of offset (uint16 LE),
+// count (uint16 LE), then count pixels of 3 bytes (r, g, b)
+#define FRAME_HEADER_SIZE 4
+
 // Structure for individual LED data
 struct LEDPixelData {
   bool isSet;     // LED has individual setting
@@ -42,6 +61,31 @@ enum AnimationType {
 };
 
 ESP8266WebServer server(80);
+WiFiUDP discoveryUdp;
+WiFiUDP realtimeUdp;
+
+// Realtime streaming state
+uint8_t realtimePacket[REALTIME_MAX_PACKET];
+bool realtimeActive = false;
+bool realtimeHasSequence = false;
+uint32_t realtimeSequence = 0;
+uint32_t realtimeLastPacket = 0;
+
+// Parser state of the frame currently being received. Pixels are staged
+// here and only applied once the whole body turned out to be valid.
+struct {
+  uint8_t header[FRAME_HEADER_SIZE];
+  size_t headerFill;
+  uint16_t offset;
+  uint16_t count;
+  uint16_t pixel;
+  uint8_t rgb[3];
+  uint8_t rgbFill;
+  uint16_t spans;
+  bool clear;
+  bool touched[NUM_LEDS];
+  uint8_t staged[NUM_LEDS][3];
+} frameState;
 
 Adafruit_NeoPixel strip(NUM_LEDS, LED_PIN, NEO_GRB + NEO_KHZ800);
 
@@ -77,7 +121,13 @@ struct {
 
 void setupWiFi();
 void setupServer();
+void setupDiscovery();
+void handleDiscovery();
+void setupRealtime();
+void handleRealtime();
 void setupLEDs();
+void frameUpload();
+void frameReceived();
 bool extractArguments();
 void stopAnimation();
 void setAllLeds(uint32_t color);
@@ -200,6 +250,106 @@ void singleLED() {
   }
 }
 
+/**
+ * @brief Feeds one byte of a binary frame into the parser.
+ * A frame is a sequence of spans, each a header followed by its pixels.
+ * @param value The received byte.
+ */
+void feedFrameByte(uint8_t value) {
+  if (frameState.headerFill < FRAME_HEADER_SIZE) {
+    frameState.header[frameState.headerFill++] = value;
+
+    if (frameState.headerFill == FRAME_HEADER_SIZE) {
+      frameState.offset = frameState.header[0] | (frameState.header[1] << 8);
+      frameState.count = frameState.header[2] | (frameState.header[3] << 8);
+      frameState.pixel = 0;
+      frameState.spans++;
+
+      // An empty span is complete right away
+      if (frameState.count == 0) frameState.headerFill = 0;
+    }
+    return;
+  }
+
+  frameState.rgb[frameState.rgbFill++] = value;
+  if (frameState.rgbFill < 3) return;
+
+  frameState.rgbFill = 0;
+  uint32_t index = (uint32_t)frameState.offset + frameState.pixel++;
+
+  if (index < NUM_LEDS) {
+    frameState.touched[index] = true;
+    memcpy(frameState.staged[index], frameState.rgb, 3);
+  }
+
+  // Span complete, the next byte starts another header
+  if (frameState.pixel == frameState.count) frameState.headerFill = 0;
+}
+
+/**
+ * @brief Streams the body of POST /frame into the staging buffer chunk by
+ * chunk, so no copy of the whole body is ever held in RAM.
+ */
+void frameUpload() {
+  HTTPRaw& raw = server.raw();
+
+  if (raw.status == RAW_START) {
+    frameState.headerFill = 0;
+    frameState.count = 0;
+    frameState.pixel = 0;
+    frameState.rgbFill = 0;
+    frameState.spans = 0;
+    frameState.clear = server.hasArg("clear");
+    memset(frameState.touched, 0, sizeof(frameState.touched));
+  } else if (raw.status == RAW_WRITE) {
+    for (size_t i = 0; i < raw.currentSize; i++) {
+      feedFrameByte(raw.buf[i]);
+    }
+  }
+}
+
+/**
+ * @brief Applies and shows a received binary frame once its whole body has
+ * been checked; a malformed body leaves the strip as it was.
+ */
+void frameReceived() {
+  if (frameState.spans == 0) {
+    server.send(400, "text/plain", "Frame shorter than its header");
+    return;
+  }
+
+  // Anything but a clean span boundary means the body was cut short
+  if (frameState.headerFill != 0 || frameState.rgbFill != 0) {
+    server.send(400, "text/plain", "Frame length does not match its header");
+    return;
+  }
+
+  stopAnimation();
+
+  if (frameState.clear) {
+    for (int i = 0; i < NUM_LEDS; i++) {
+      pixelData[i].isSet = false;
+    }
+    strip.clear();
+  }
+
+  // Only pixels the body covered; the rest keep their state
+  for (int i = 0; i < NUM_LEDS; i++) {
+    if (!frameState.touched[i]) continue;
+
+    const uint8_t* rgb = frameState.staged[i];
+    pixelData[i].isSet = true;
+    pixelData[i].r = rgb[0];
+    pixelData[i].g = rgb[1];
+    pixelData[i].b = rgb[2];
+    strip.setPixelColor(i, strip.Color(rgb[0], rgb[1], rgb[2]));
+  }
+
+  isOn = true;
+  strip.show();
+  server.send(204);
+}
+
 /**
  * @brief Turns the LEDs off.
  */
@@ -231,6 +381,40 @@ void getLEDs() {
   server.send(200, "text/plain", String(NUM_LEDS));
 }
 
+/**
+ * @brief Returns the current mode: "realtime", an animation name, "off",
+ * "single" when individual LEDs are set, or "color".
+ */
+const char* currentMode() {
+  static const char* animationNames[] = {
+    "rainbow", "pulse", "chasing", "strobe", "raindrop", "fireplace"
+  };
+
+  if (realtimeActive) return "realtime";
+  if (animationRunning && currentAnimation != NONE) return animationNames[currentAnimation];
+  if (!isOn) return "off";
+
+  for (int i = 0; i < NUM_LEDS; i++) {
+    if (pixelData[i].isSet) return "single";
+  }
+  return "color";
+}
+
+/**
+ * @brief Returns MAC, LED count, firmware version and current mode as JSON,
+ * so the desktop app learns everything about a device in one round trip.
+ */
+void getInfo() {
+  char reply[192];
+  snprintf(reply, sizeof(reply),
+           "{\"mac\":\"%s\",\"leds\":%d,\"version\":\"%s\",\"mode\":\"%s\","
+           "\"color\":[%d,%d,%d],\"delay\":%lu}",
+           WiFi.macAddress().c_str(), NUM_LEDS, FIRMWARE_VERSION, currentMode(),
+           r, g, b, delayTime);
+
+  server.send(200, "application/json", reply);
+}
+
 /**
  * @brief Handles unknown web requests.
  */
@@ -469,6 +653,148 @@ void setupWiFi() {
   Serial.println(WiFi.macAddress());
 }
 
+/**
+ * @brief Start listening for discovery beacons
+ */
+void setupDiscovery() {
+  discoveryUdp.begin(DISCOVERY_PORT);
+  Serial.printf("Discovery listening on udp/%d\n", DISCOVERY_PORT);
+}
+
+/**
+ * @brief Answers a discovery beacon with MAC, LED count and firmware version.
+ *
+ * The reply goes straight back to the sender, so the desktop app finds every
+ * controller with a single broadcast instead of sweeping port 80.
+ */
+void handleDiscovery() {
+  int packetSize = discoveryUdp.parsePacket();
+  if (packetSize <= 0) return;
+
+  char beacon[32];
+  int length = discoveryUdp.read(beacon, sizeof(beacon) - 1);
+  beacon[length > 0 ? length : 0] = '\0';
+
+  if (strcmp(beacon, DISCOVERY_BEACON) != 0) return;
+
+  char reply[96];
+  snprintf(reply, sizeof(reply), "{\"mac\":\"%s\",\"leds\":%d,\"version\":\"%s\"}",
+           WiFi.macAddress().c_str(), NUM_LEDS, FIRMWARE_VERSION);
+
+  discoveryUdp.beginPacket(discoveryUdp.remoteIP(), discoveryUdp.remotePort());
+  discoveryUdp.write(reply);
+  discoveryUdp.endPacket();
+}
+
+/**
+ * @brief Start listening for realtime frames
+ */
+void setupRealtime() {
+  realtimeUdp.begin(REALTIME_PORT);
+  Serial.printf("Realtime listening on udp/%d\n", REALTIME_PORT);
+}
+
+/**
+ * @brief Writes the spans of a realtime packet straight into the strip buffer.
+ * @param data First byte after the packet header.
+ * @param length Number of bytes after the packet header.
+ */
+void applyRealtimeSpans(const uint8_t* data, int length) {
+  int position = 0;
+
+  while (length - position >= FRAME_HEADER_SIZE) {
+    uint16_t offset = data[position] | (data[position + 1] << 8);
+    uint16_t count = data[position + 2] | (data[position + 3] << 8);
+    position += FRAME_HEADER_SIZE;
+
+    for (uint16_t i = 0; i < count && length - position >= 3; i++, position += 3) {
+      uint32_t index = (uint32_t)offset + i;
+      if (index < NUM_LEDS) {
+        strip.setPixelColor(index, strip.Color(data[position], data[position + 1], data[position + 2]));
+      }
+    }
+  }
+}
+
+/**
+ * @brief Shows the static state again once realtime streaming has stopped.
+ * A running animation repaints the strip on its own.
+ */
+void restoreAfterRealtime() {
+  if (animationRunning) return;
+
+  if (!isOn) {
+    strip.clear();
+    strip.show();
+    return;
+  }
+
+  bool anySet = false;
+  for (int i = 0; i < NUM_LEDS; i++) {
+    anySet = anySet || pixelData[i].isSet;
+  }
+
+  if (!anySet) {
+    setAllLeds(strip.Color(r, g, b));
+    return;
+  }
+
+  strip.clear();
+  for (int i = 0; i < NUM_LEDS; i++) {
+    if (pixelData[i].isSet) {
+      strip.setPixelColor(i, strip.Color(pixelData[i].r, pixelData[i].g, pixelData[i].b));
+    }
+  }
+  strip.show();
+}
+
+/**
+ * @brief Applies pending realtime packets and leaves realtime mode after a
+ * quiet period.
+ *
+ * While packets arrive the animation loop is paused and every complete frame
+ * is shown as soon as its last packet is in. Packets of frames older than the
+ * last one shown are late and dropped.
+ */
+void handleRealtime() {
+  while (realtimeUdp.parsePacket() > 0) {
+    int length = realtimeUdp.read(realtimePacket, sizeof(realtimePacket));
+
+    if (length < REALTIME_HEADER_SIZE || realtimePacket[0] != 'L' || realtimePacket[1] != 'R' ||
+        realtimePacket[2] != REALTIME_VERSION) {
+      continue;
+    }
+
+    uint8_t packetIndex = realtimePacket[3];
+    uint8_t packetCount = realtimePacket[4];
+    uint32_t sequence = realtimePacket[6] | (realtimePacket[7] << 8) |
+                        ((uint32_t)realtimePacket[8] << 16) | ((uint32_t)realtimePacket[9] << 24);
+
+    if (realtimeHasSequence && (int32_t)(sequence - realtimeSequence) < 0) continue;
+
+    if (!realtimeActive) {
+      Serial.println("Realtime mode on.");
+      realtimeActive = true;
+    }
+    realtimeLastPacket = millis();
+
+    applyRealtimeSpans(realtimePacket + REALTIME_HEADER_SIZE, length - REALTIME_HEADER_SIZE);
+
+    if (packetIndex + 1 >= packetCount) {
+      strip.show();
+      realtimeSequence = sequence;
+      realtimeHasSequence = true;
+    }
+  }
+
+  if (realtimeActive && millis() - realtimeLastPacket > REALTIME_TIMEOUT_MS) {
+    Serial.println("Realtime mode off.");
+    realtimeActive = false;
+    realtimeHasSequence = false;
+    restoreAfterRealtime();
+  }
+}
+
 /**
  * @brief Set up web server routes
  */
@@ -477,9 +803,11 @@ void setupServer() {
     if (extractArguments()) ledOn(); 
   });
   server.on("/singleLED", HTTP_POST, singleLED);
+  server.on("/frame", HTTP_POST, frameReceived, frameUpload);
   server.on("/ledOff", HTTP_POST, ledOff);
   server.on("/mac", HTTP_GET, getMac);
   server.on("/num", HTTP_GET, getLEDs);
+  server.on("/info", HTTP_GET, getInfo);
 
   // Animation endpoints
   server.on("/rainbow", HTTP_POST, []() { 
@@ -502,6 +830,8 @@ void setupServer() {
   });
   
   server.onNotFound(notFound);
+  // Let the desktop app reuse its connection instead of a handshake per request
+  server.keepAlive(true);
   server.begin();
   Serial.println("Server started.");
 }
@@ -512,6 +842,8 @@ void setup() {
 
   setupWiFi();
   setupServer();
+  setupDiscovery();
+  setupRealtime();
   
   for (int i = 0; i < NUM_LEDS; i++) {
     pixelData[i].isSet = false;
@@ -523,8 +855,10 @@ void setup() {
 
 void loop() {
   server.handleClient();
+  handleDiscovery();
+  handleRealtime();
 
-  if (animationRunning) {
+  if (animationRunning && !realtimeActive) {
     runAnimation();
   }
 }
\ No newline at end of file